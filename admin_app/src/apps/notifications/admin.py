@@ -1,10 +1,14 @@
+import redis
 from django.contrib import admin, messages
 from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
 from django.urls import path
 from django.utils.html import format_html
 from unfold.admin import ModelAdmin, TabularInline
 
-from .models import APIKey, Bot
+from utils.redis_utils import clear_suppressions, get_suppressions
+
+from .models import APIKey, Attachment, Bot, DeliveryLog, MessageTemplate
 
 
 class APIKeyInline(TabularInline):
@@ -111,9 +115,11 @@ class BotAdmin(ModelAdmin):
     inlines = [APIKeyInline]
 
     def bot_actions(self, obj):
-        """Добавляет кнопку для генерации нового API-ключа."""
+        """Добавляет кнопки генерации API-ключа и списка подавленных чатов."""
         return format_html(
-            '<a class="button" href="generate_key/{}/">Сгенерировать API-ключ</a>',
+            '<a class="button" href="generate_key/{}/">Сгенерировать API-ключ</a> '
+            '<a class="button" href="suppressions/{}/">Подавленные чаты</a>',
+            obj.id,
             obj.id,
         )
 
@@ -123,6 +129,10 @@ class BotAdmin(ModelAdmin):
         """Добавляет кастомные URL в админку."""
         custom_urls = [
             path("generate_key/<str:bot_id>/", self.generate_key),
+            path(
+                "suppressions/<str:bot_id>/",
+                self.admin_site.admin_view(self.suppressions),
+            ),
         ]
         return custom_urls + super().get_urls()
 
@@ -137,3 +147,75 @@ class BotAdmin(ModelAdmin):
         return redirect(
             request.META.get("HTTP_REFERER", "/admin/notifications/bot/"),
         )
+
+    def suppressions(self, request, bot_id):
+        """Список подавленных чатов бота и снятие подавления.
+
+        Чаты подавляет sender, когда Telegram отвечает, что бот
+        заблокирован или чат недоступен; уведомления в них не
+        принимаются, пока запись не истечет или не будет удалена.
+        """
+        bot = get_object_or_404(Bot, id=bot_id)
+        try:
+            if request.method == "POST":
+                chat_ids = (
+                    None
+                    if "clear_all" in request.POST
+                    else request.POST.getlist("chat_id")
+                )
+                removed = clear_suppressions(bot.id, chat_ids)
+                messages.success(request, f"Подавление снято: {removed}.")
+                return redirect(request.path)
+            rows = get_suppressions(bot.id)
+        except redis.RedisError:
+            messages.error(request, "Redis недоступен.")
+            rows = []
+
+        return TemplateResponse(
+            request,
+            "admin/notifications/bot/suppressions.html",
+            {
+                **self.admin_site.each_context(request),
+                "opts": self.model._meta,  # noqa: SLF001
+                "title": f"Подавленные чаты: {bot.name}",
+                "bot": bot,
+                "rows": rows,
+            },
+        )
+
+
+@admin.register(MessageTemplate)
+class MessageTemplateAdmin(ModelAdmin):
+    list_display = ("name", "bot", "format", "updated_at")
+    list_filter = ("bot",)
+    search_fields = ("name", "text")
+    readonly_fields = ("id", "created_at", "updated_at")
+
+
+@admin.register(Attachment)
+class AttachmentAdmin(ModelAdmin):
+    list_display = ("name", "bot", "kind", "created_at")
+    list_filter = ("bot", "kind")
+    search_fields = ("name",)
+    readonly_fields = ("id", "sha256", "created_at")
+
+
+@admin.register(DeliveryLog)
+class DeliveryLogAdmin(ModelAdmin):
+    """Просмотр архива доставки (записи пишет только sender)."""
+
+    list_display = ("created_at", "bot", "target_id", "status", "error_code")
+    list_filter = ("status", "bot")
+    search_fields = ("=message_id", "=target_id")
+    date_hierarchy = "created_at"
+    # Без COUNT(*) по всему архиву на каждой странице.
+    show_full_result_count = False
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
+
+    def has_delete_permission(self, request, obj=None) -> bool:
+        return False
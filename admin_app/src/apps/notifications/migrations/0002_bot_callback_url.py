@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bot",
+            name="callback_url",
+            field=models.URLField(
+                blank=True,
+                default="",
+                help_text="Сервис отправляет сюда пачки статусов доставки (POST).",
+                verbose_name="URL для результатов доставки",
+            ),
+        ),
+    ]
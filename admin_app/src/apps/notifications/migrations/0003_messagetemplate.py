@@ -0,0 +1,74 @@
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0002_bot_callback_url"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MessageTemplate",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, verbose_name="Название")),
+                (
+                    "text",
+                    models.TextField(
+                        help_text="Переменные подставляются по имени: $name или ${name}.",
+                        verbose_name="Текст",
+                    ),
+                ),
+                (
+                    "format",
+                    models.CharField(
+                        blank=True,
+                        choices=[("Markdown", "Markdown"), ("HTML", "HTML")],
+                        default="",
+                        max_length=16,
+                        verbose_name="Формат",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Дата создания"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Дата обновления"),
+                ),
+                (
+                    "bot",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="templates",
+                        to="notifications.bot",
+                        verbose_name="Бот",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Шаблон сообщения",
+                "verbose_name_plural": "Шаблоны сообщений",
+                "db_table": "message_template",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("bot", "name"),
+                        name="message_template_bot_name_unique",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import utils.file_utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0003_messagetemplate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Attachment",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, verbose_name="Название")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("photo", "Фото"), ("document", "Документ")],
+                        default="document",
+                        max_length=16,
+                        verbose_name="Тип",
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        upload_to=utils.file_utils.generate_unique_filename,
+                        verbose_name="Файл",
+                    ),
+                ),
+                (
+                    "sha256",
+                    models.CharField(
+                        editable=False,
+                        max_length=64,
+                        verbose_name="SHA-256",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Дата создания"),
+                ),
+                (
+                    "bot",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attachments",
+                        to="notifications.bot",
+                        verbose_name="Бот",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Вложение",
+                "verbose_name_plural": "Вложения",
+                "db_table": "attachment",
+            },
+        ),
+    ]
@@ -0,0 +1,102 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Секционированная таблица: первичный ключ включает ключ секционирования.
+# Дневные секции создает sender, строки вне секций попадают в default.
+CREATE_DELIVERY_LOG = """
+CREATE TABLE delivery_log (
+    id bigint GENERATED BY DEFAULT AS IDENTITY,
+    created_at timestamptz NOT NULL,
+    message_id varchar(32) NOT NULL,
+    bot_id uuid NOT NULL,
+    target_id bigint NOT NULL,
+    status varchar(16) NOT NULL,
+    telegram_message_id bigint,
+    error_code integer,
+    error text,
+    latency_ms double precision,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE TABLE delivery_log_default PARTITION OF delivery_log DEFAULT;
+CREATE INDEX delivery_log_message_id ON delivery_log (message_id);
+CREATE INDEX delivery_log_bot_created_at ON delivery_log (bot_id, created_at);
+"""
+
+
+def create_delivery_log(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_DELIVERY_LOG)
+    else:
+        # Для локальной разработки на других СУБД — обычная таблица.
+        schema_editor.create_model(apps.get_model("notifications", "DeliveryLog"))
+
+
+def drop_delivery_log(apps, schema_editor):
+    schema_editor.execute("DROP TABLE IF EXISTS delivery_log CASCADE")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0004_attachment"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeliveryLog",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField(verbose_name="Дата")),
+                (
+                    "message_id",
+                    models.CharField(max_length=32, verbose_name="Id уведомления"),
+                ),
+                ("target_id", models.BigIntegerField(verbose_name="Чат")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("sent", "Отправлено"),
+                            ("failed", "Ошибка"),
+                            ("expired", "Истек срок"),
+                        ],
+                        max_length=16,
+                        verbose_name="Статус",
+                    ),
+                ),
+                (
+                    "telegram_message_id",
+                    models.BigIntegerField(
+                        null=True,
+                        verbose_name="Id сообщения в Telegram",
+                    ),
+                ),
+                (
+                    "error_code",
+                    models.IntegerField(null=True, verbose_name="Код ошибки"),
+                ),
+                ("error", models.TextField(null=True, verbose_name="Ошибка")),
+                (
+                    "latency_ms",
+                    models.FloatField(null=True, verbose_name="Время запроса, мс"),
+                ),
+                (
+                    "bot",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="notifications.bot",
+                        verbose_name="Бот",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Запись архива доставки",
+                "verbose_name_plural": "Архив доставки",
+                "db_table": "delivery_log",
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(create_delivery_log, drop_delivery_log),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0005_deliverylog"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="messagetemplate",
+            name="format",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("Markdown", "Markdown"),
+                    ("MarkdownV2", "MarkdownV2"),
+                    ("HTML", "HTML"),
+                ],
+                default="",
+                max_length=16,
+                verbose_name="Формат",
+            ),
+        ),
+    ]
@@ -1,5 +1,6 @@
 """Модели для приложения уведомлений."""
 
+import hashlib
 import secrets
 import uuid
 
@@ -7,6 +8,8 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils.timezone import now
 
+from utils.file_utils import generate_unique_filename
+
 
 class User(AbstractUser):
     """Пользователь, использующий сервис уведомлений."""
@@ -29,6 +32,12 @@ class Bot(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField("Название", max_length=255, unique=True)
     token = models.CharField("Токен", max_length=255, unique=True)
+    callback_url = models.URLField(
+        "URL для результатов доставки",
+        blank=True,
+        default="",
+        help_text="Сервис отправляет сюда пачки статусов доставки (POST).",
+    )
     owner = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -101,3 +110,138 @@ class APIKey(models.Model):
         """Активирует API-ключ (если был отозван)."""
         self.is_active = True
         self.save()
+
+
+class MessageTemplate(models.Model):
+    """Шаблон сообщения бота с подстановками вида `$name` / `${name}`."""
+
+    class Format(models.TextChoices):
+        MARKDOWN = "Markdown", "Markdown"
+        MARKDOWN_V2 = "MarkdownV2", "MarkdownV2"
+        HTML = "HTML", "HTML"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    bot = models.ForeignKey(
+        Bot,
+        on_delete=models.CASCADE,
+        related_name="templates",
+        verbose_name="Бот",
+    )
+    name = models.CharField("Название", max_length=255)
+    text = models.TextField(
+        "Текст",
+        help_text="Переменные подставляются по имени: $name или ${name}.",
+    )
+    format = models.CharField(
+        "Формат",
+        max_length=16,
+        choices=Format.choices,
+        blank=True,
+        default="",
+    )
+    created_at = models.DateTimeField("Дата создания", auto_now_add=True)
+    updated_at = models.DateTimeField("Дата обновления", auto_now=True)
+
+    class Meta:
+        verbose_name = "Шаблон сообщения"
+        verbose_name_plural = "Шаблоны сообщений"
+        db_table = "message_template"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bot", "name"],
+                name="message_template_bot_name_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.bot.name} - {self.name}"
+
+
+class Attachment(models.Model):
+    """Файл бота для отправки в Telegram (фото или документ).
+
+    Sender загружает файл в Telegram один раз и дальше использует
+    полученный `file_id`, который кэшируется по SHA-256 содержимого.
+    """
+
+    class Kind(models.TextChoices):
+        PHOTO = "photo", "Фото"
+        DOCUMENT = "document", "Документ"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    bot = models.ForeignKey(
+        Bot,
+        on_delete=models.CASCADE,
+        related_name="attachments",
+        verbose_name="Бот",
+    )
+    name = models.CharField("Название", max_length=255)
+    kind = models.CharField(
+        "Тип",
+        max_length=16,
+        choices=Kind.choices,
+        default=Kind.DOCUMENT,
+    )
+    file = models.FileField("Файл", upload_to=generate_unique_filename)
+    sha256 = models.CharField("SHA-256", max_length=64, editable=False)
+    created_at = models.DateTimeField("Дата создания", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Вложение"
+        verbose_name_plural = "Вложения"
+        db_table = "attachment"
+
+    def __str__(self) -> str:
+        return f"{self.bot.name} - {self.name}"
+
+    def save(self, *args, **kwargs):
+        """Пересчитывает хэш содержимого при загрузке нового файла."""
+        if not self.file._committed or not self.sha256:  # noqa: SLF001
+            digest = hashlib.sha256()
+            for chunk in self.file.chunks():
+                digest.update(chunk)
+            self.sha256 = digest.hexdigest()
+        super().save(*args, **kwargs)
+
+
+class DeliveryLog(models.Model):
+    """Архив результатов доставки, который пишет sender (COPY).
+
+    Таблица секционирована по `created_at` на дневные секции и создается
+    миграцией вручную, поэтому Django ею не управляет. Секции создает
+    и удаляет по сроку хранения sender.
+    """
+
+    class Status(models.TextChoices):
+        SENT = "sent", "Отправлено"
+        FAILED = "failed", "Ошибка"
+        EXPIRED = "expired", "Истек срок"
+
+    id = models.BigAutoField(primary_key=True)
+    created_at = models.DateTimeField("Дата")
+    message_id = models.CharField("Id уведомления", max_length=32)
+    bot = models.ForeignKey(
+        Bot,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+        verbose_name="Бот",
+    )
+    target_id = models.BigIntegerField("Чат")
+    status = models.CharField("Статус", max_length=16, choices=Status.choices)
+    telegram_message_id = models.BigIntegerField(
+        "Id сообщения в Telegram",
+        null=True,
+    )
+    error_code = models.IntegerField("Код ошибки", null=True)
+    error = models.TextField("Ошибка", null=True)
+    latency_ms = models.FloatField("Время запроса, мс", null=True)
+
+    class Meta:
+        managed = False
+        verbose_name = "Запись архива доставки"
+        verbose_name_plural = "Архив доставки"
+        db_table = "delivery_log"
+
+    def __str__(self) -> str:
+        return f"{self.message_id} - {self.status}"
@@ -0,0 +1,21 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from utils.redis_utils import publish_bot_change
+
+from .models import Bot
+
+
+@receiver(post_save, sender=Bot)
+def bot_saved(sender, instance, **kwargs):
+    """Оповещает backend об изменении бота после коммита транзакции."""
+    transaction.on_commit(partial(publish_bot_change, instance.id, "saved"))
+
+
+@receiver(post_delete, sender=Bot)
+def bot_deleted(sender, instance, **kwargs):
+    """Оповещает backend об удалении бота после коммита транзакции."""
+    transaction.on_commit(partial(publish_bot_change, instance.id, "deleted"))
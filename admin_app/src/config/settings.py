@@ -82,6 +82,9 @@ DATABASES = {
     },
 }
 
+REDIS_URL = os.environ.get("REDIS_DSN", "redis://redis:6379/0")
+BOT_EVENTS_CHANNEL = "bots:changes"
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -0,0 +1,71 @@
+import json
+import logging
+from functools import cache
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@cache
+def get_redis() -> redis.Redis:
+    """Возвращает общий для процесса клиент Redis."""
+    return redis.Redis.from_url(settings.REDIS_URL, socket_timeout=2)
+
+
+def publish_bot_change(bot_id, action: str) -> None:
+    """Публикует событие изменения бота для кэшей backend-сервисов.
+
+    Ошибка Redis не должна ломать сохранение в админке: кэши
+    backend-сервисов периодически перечитывают ботов из базы.
+    """
+    message = json.dumps({"id": str(bot_id), "action": action})
+    try:
+        get_redis().publish(settings.BOT_EVENTS_CHANNEL, message)
+    except redis.RedisError:
+        logger.exception("Не удалось опубликовать изменение бота %s", bot_id)
+
+
+def suppressed_key(bot_id) -> str:
+    """Ключ подавленных чатов бота (см. backend SuppressionService)."""
+    return f"suppressed:{bot_id}"
+
+
+def get_suppressions(bot_id) -> list[dict]:
+    """Возвращает подавленные чаты бота: id чата, причину и остаток TTL."""
+    client = get_redis()
+    key = suppressed_key(bot_id)
+    rows = client.hgetall(key)
+    if not rows:
+        return []
+    chat_ids = list(rows)
+    ttls = client.httl(key, *chat_ids)
+    return sorted(
+        (
+            {
+                "chat_id": chat_id.decode(),
+                "reason": reason.decode(),
+                "ttl": ttl,
+            }
+            for (chat_id, reason), ttl in zip(rows.items(), ttls, strict=True)
+        ),
+        key=lambda row: row["ttl"],
+        reverse=True,
+    )
+
+
+def clear_suppressions(bot_id, chat_ids=None) -> int:
+    """Снимает подавление с чатов бота (со всех, если chat_ids не заданы).
+
+    :return: Число удаленных записей.
+    """
+    client = get_redis()
+    key = suppressed_key(bot_id)
+    if chat_ids is None:
+        count = client.hlen(key)
+        client.delete(key)
+        return count
+    if not chat_ids:
+        return 0
+    return client.hdel(key, *chat_ids)
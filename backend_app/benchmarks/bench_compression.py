@@ -0,0 +1,126 @@
+"""Экономия памяти и цена CPU сжатия текста уведомлений zstd.
+
+Для типовых сообщений (короткое уведомление, отчет средней длины,
+длинный HTML-отчет) измеряются размер записи очереди Redis
+(`NotifyRedisDto` в JSON) и время сжатия/распаковки одного сообщения
+без сжатия, с zstd и с zstd со словарем, обученным на отдельной выборке
+таких же сообщений.
+
+Запуск из каталога `backend_app`:
+
+    python benchmarks/bench_compression.py --messages 2000 --level 3
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import zstandard
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from infra.compression import MessageCodec  # noqa: E402
+from infra.serialization import dumps  # noqa: E402
+from schemas.notify_schema import NotifyRedisDto  # noqa: E402
+
+NAMES = ("Анна", "Иван", "Мария", "Олег", "Светлана", "Дмитрий")
+TOPICS = ("Продажи", "Склад", "Поддержка", "Маркетинг", "Финансы")
+
+
+def _short(rng: random.Random) -> str:
+    return (
+        f"<b>{rng.choice(NAMES)}</b>, ваш заказ №{rng.randint(1, 10**6)} "
+        f"передан в доставку. Ожидаемая дата: {rng.randint(1, 28)}.10."
+    )
+
+
+def _report(rng: random.Random, rows: int) -> str:
+    lines = [
+        f"• {rng.choice(TOPICS)}: <code>{rng.randint(0, 10**5)}</code> "
+        f"({rng.uniform(-20, 20):+.1f}%), ответственный "
+        f"<i>{rng.choice(NAMES)}</i>"
+        for _ in range(rows)
+    ]
+    return "\n".join(
+        [
+            f"<b>Отчет «{rng.choice(TOPICS)}» за {rng.randint(1, 28)}.10</b>",
+            *lines,
+            '<a href="https://example.com/reports">Подробнее</a>',
+        ],
+    )
+
+
+KINDS = {
+    "short": _short,
+    "report-10": lambda rng: _report(rng, 10),
+    "report-60": lambda rng: _report(rng, 60),
+}
+
+
+def _entry_size(text: str, codec: MessageCodec | None) -> int:
+    dto = NotifyRedisDto(target_id=123456789, message=text, timestamp=0)
+    packed = codec.compress(text) if codec else None
+    if packed is not None:
+        dto.message, dto.message_zstd = None, packed
+    return len(dumps(dto.model_dump(exclude_none=True)))
+
+
+def _timings(texts: list[str], codec: MessageCodec) -> tuple[float, float]:
+    started = time.perf_counter()
+    packed = [codec.compress(text) for text in texts]
+    compress_us = (time.perf_counter() - started) / len(texts) * 1e6
+
+    packed = [item for item in packed if item is not None]
+    started = time.perf_counter()
+    for item in packed:
+        codec.decompress(item)
+    decompress_us = (time.perf_counter() - started) / max(len(packed), 1) * 1e6
+    return compress_us, decompress_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--level", type=int, default=3)
+    parser.add_argument("--dictionary-size", type=int, default=16384)
+    args = parser.parse_args()
+
+    rng = random.Random(42)  # noqa: S311
+    training = [
+        KINDS[kind](rng).encode()
+        for kind in rng.choices(list(KINDS), k=args.messages)
+    ]
+    dictionary = zstandard.train_dictionary(args.dictionary_size, training)
+    # Порог 1 байт: сжимается все, что становится короче.
+    codecs = {
+        "zstd": MessageCodec(threshold=1, level=args.level),
+        "zstd+dict": MessageCodec(
+            threshold=1,
+            level=args.level,
+            dictionary=dictionary.as_bytes(),
+        ),
+    }
+
+    print(  # noqa: T201
+        f"{'payload':<10} {'codec':<10} {'bytes':>7} {'saved':>7} "
+        f"{'compress us':>12} {'decompress us':>14}",
+    )
+    for kind, make in KINDS.items():
+        texts = [make(rng) for _ in range(args.messages)]
+        plain = sum(_entry_size(text, None) for text in texts) / len(texts)
+        print(f"{kind:<10} {'none':<10} {plain:>7.0f}")  # noqa: T201
+        for name, codec in codecs.items():
+            size = sum(_entry_size(text, codec) for text in texts) / len(texts)
+            compress_us, decompress_us = _timings(texts, codec)
+            print(  # noqa: T201
+                f"{kind:<10} {name:<10} {size:>7.0f} "
+                f"{1 - size / plain:>7.1%} "
+                f"{compress_us:>12.1f} {decompress_us:>14.1f}",
+            )
+
+
+if __name__ == "__main__":
+    main()
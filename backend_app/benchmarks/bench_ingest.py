@@ -0,0 +1,148 @@
+"""CPU на одно уведомление на пути приема и разбора в sender.
+
+Сравнивает прежний путь (dict из `NotifyIn.model_dump()`, повторная
+валидация в `NotifyRedisDto`, `model_dump()` и `dumps`; в sender —
+`loads` и валидация dict) с текущим: запись очереди собирается из
+провалидированного `NotifyIn` без промежуточной модели и сериализуется
+pydantic-core, а в sender разбирается и валидируется за один проход.
+Разбор тела запроса (`NotifyIn`), сжатие длинного текста (как в
+`NotifyQueueService`) и ответ API входят в замер приема.
+JSON-бэкенд прежнего пути задается `JSON_BACKEND`.
+
+Запуск из каталога `backend_app`:
+
+    python benchmarks/bench_ingest.py --messages 20000
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from uuid import uuid4
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from infra.compression import message_codec  # noqa: E402
+from infra.serialization import dumps, loads  # noqa: E402
+from schemas.notify_schema import (  # noqa: E402
+    NotifyCreatedOut,
+    NotifyIn,
+    NotifyRedisDto,
+    queue_record_adapter,
+)
+
+BOT_ID = uuid4().hex
+TIMESTAMP = 1_700_000_000.0
+ROUNDS = 5
+# Так FastAPI разбирает тело запроса: json.loads, затем валидация dict.
+notify_in_adapter = TypeAdapter(NotifyIn)
+
+BODIES = {
+    "text": {
+        "target_id": 123456789,
+        "message": "<b>Анна</b>, ваш заказ №123456 передан в доставку.",
+        "format": "HTML",
+    },
+    "template": {
+        "target_id": 123456789,
+        "template_id": "order_shipped",
+        "variables": {"name": "Анна", "order": 123456, "total": 1999.5},
+        "ttl": 3600,
+    },
+    "report": {
+        "target_id": 123456789,
+        "message": "\n".join(
+            f"• Продажи: <code>{i * 137}</code> (+{i % 20}.5%)"
+            for i in range(20)
+        ),
+        "format": "HTML",
+        "attachments": ["chart"],
+    },
+}
+
+
+def ingest_before(body: bytes) -> bytes:
+    notify_in = notify_in_adapter.validate_python(json.loads(body))
+    dto = NotifyRedisDto(
+        **notify_in.model_dump(exclude={"ttl", "expires_at"}),
+        id=uuid4().hex,
+        bot_id=BOT_ID,
+        timestamp=TIMESTAMP,
+        expires_at=notify_in.expiry(TIMESTAMP),
+    )
+    if dto.message and (packed := message_codec.compress(dto.message)):
+        dto.message, dto.message_zstd = None, packed
+    queued = dumps(dto.model_dump(exclude_none=True))
+    json.dumps(NotifyCreatedOut(id=dto.id).model_dump()).encode()
+    return queued
+
+
+def ingest_after(body: bytes) -> bytes:
+    notify_in = notify_in_adapter.validate_python(json.loads(body))
+    message_id = uuid4().hex
+    record = notify_in.to_record(
+        message_id=message_id,
+        bot_id=BOT_ID,
+        timestamp=TIMESTAMP,
+    )
+    if record.get("message") and (
+        packed := message_codec.compress(record["message"])
+    ):
+        del record["message"]
+        record["message_zstd"] = packed
+    queued = queue_record_adapter.dump_json(record)
+    NotifyCreatedOut(id=message_id).model_dump_json().encode()
+    return queued
+
+
+def decode_before(queued: bytes) -> NotifyRedisDto:
+    return NotifyRedisDto.model_validate(loads(queued))
+
+
+def decode_after(queued: bytes) -> NotifyRedisDto:
+    return NotifyRedisDto.model_validate_json(queued)
+
+
+def per_call_us(func: Callable[[bytes], object], arg: bytes, n: int) -> float:
+    """Лучшее из `ROUNDS` измерений: меньше всего зависит от шума."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for _ in range(n):
+            func(arg)
+        best = min(best, time.perf_counter() - started)
+    return best / n * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(  # noqa: T201
+        f"{'message':<10} {'path':<8} {'before µs':>10} {'after µs':>10}",
+    )
+    for kind, payload in BODIES.items():
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        queued = ingest_after(body)
+        assert decode_before(ingest_before(body)).model_dump(
+            exclude={"id"},
+        ) == decode_after(queued).model_dump(exclude={"id"})
+        for path, before, after, arg in (
+            ("ingest", ingest_before, ingest_after, body),
+            ("sender", decode_before, decode_after, queued),
+        ):
+            print(  # noqa: T201
+                f"{kind:<10} {path:<8} "
+                f"{per_call_us(before, arg, args.messages):>10.2f} "
+                f"{per_call_us(after, arg, args.messages):>10.2f}",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Сравнение event loop и JSON-бэкендов на пути ingest и отправки.
+
+Для каждой комбинации `EVENT_LOOP` x `JSON_BACKEND` запускается отдельный
+процесс, который измеряет:
+
+* req/s эндпоинта `POST /notify/` (ASGI-транспорт, Redis и авторизация
+  заменены заглушками);
+* msgs/s обработчика sender (in-memory брокер FastStream, Telegram
+  заменен заглушкой).
+
+`--loop-monitor` включает монитор event loop (`lag` — только замер
+задержки, `timing` — еще и время шагов задач), чтобы оценить его цену.
+
+Запуск из каталога `backend_app`:
+
+    python benchmarks/bench_runtime.py --duration 5 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from itertools import product
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from schemas.bot_schema import BotInfo  # noqa: E402
+from schemas.delivery_schema import (  # noqa: E402
+    DeliveryResult,
+    DeliveryStatus,
+)
+
+BENCH_BOT = BotInfo(id="bench-bot", token="123:token")  # noqa: S106
+
+LOOPS = ("asyncio", "uvloop")
+JSON_BACKENDS = ("json", "orjson")
+LOOP_MONITOR_MODES = {
+    "off": {"LOOP_MONITOR_ENABLED": "false"},
+    "lag": {"LOOP_MONITOR_ENABLED": "true", "LOOP_TASK_TIMING": "false"},
+    "timing": {"LOOP_MONITOR_ENABLED": "true", "LOOP_TASK_TIMING": "true"},
+}
+
+NOTIFY_BODY = {
+    "target_id": 123456789,
+    "message": "<b>Новая публикация</b>\nКраткое описание " * 5,
+    "format": "HTML",
+}
+
+
+class _NullPipeline:
+    def __getattr__(self, _name: str) -> Callable[..., None]:
+        return lambda *_args, **_kwargs: None
+
+    async def execute(self) -> list:
+        return []
+
+
+class _NullRedisConnection:
+    async def hmget(self, _key: str, fields: list) -> list:
+        return [None] * len(fields)
+
+
+class _NullRedis:
+    async def pipeline(self, **_kwargs: object) -> _NullPipeline:
+        return _NullPipeline()
+
+    async def get_client(self) -> _NullRedisConnection:
+        return _NullRedisConnection()
+
+
+class _NullNotificationService:
+    async def send(self, **_kwargs: object) -> DeliveryResult:
+        return DeliveryResult(status=DeliveryStatus.SENT)
+
+
+class _StaticBotRegistry:
+    async def get_or_load(self, _bot_id: str) -> BotInfo:
+        return BENCH_BOT
+
+
+class _NullStatusRecorder:
+    def record(self, *_args: object) -> None:
+        return None
+
+
+async def _bench_ingest(duration: float, concurrency: int) -> float:
+    import httpx
+    from fastapi import FastAPI
+
+    from api import dependencies
+    from api.notify_api import router
+    from api.responses import DefaultResponse
+
+    app = FastAPI(default_response_class=DefaultResponse)
+    app.include_router(router)
+    app.dependency_overrides[dependencies.get_current_bot] = lambda: BENCH_BOT
+    app.dependency_overrides[dependencies.get_redis_client] = _NullRedis
+
+    transport = httpx.ASGITransport(app=app)
+    done = 0
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        nonlocal done
+        while time.perf_counter() < deadline:
+            await client.post("/notify/", json=NOTIFY_BODY)
+            done += 1
+
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://bench",
+    ) as client:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(client_loop(client) for _ in range(concurrency)),
+        )
+        elapsed = time.perf_counter() - started
+
+    return done / elapsed
+
+
+async def _bench_sender(duration: float) -> float:
+    from faststream.rabbit import TestRabbitBroker
+
+    from infra.sender_queues import LEGACY_QUEUE
+    from infra.serialization import dumps
+    from tasks import sender
+
+    sender.Dependencies.notification_service = _NullNotificationService()
+    sender.Dependencies.status_recorder = _NullStatusRecorder()
+    sender.Dependencies.bot_registry = _StaticBotRegistry()
+    payload = dumps(
+        {**NOTIFY_BODY, "bot_id": BENCH_BOT.id, "timestamp": time.time()},
+    )
+
+    done = 0
+    async with TestRabbitBroker(sender.legacy_broker) as broker:
+        started = time.perf_counter()
+        deadline = started + duration
+        while time.perf_counter() < deadline:
+            # TestRabbitBroker не маршрутизирует consistent-hash exchange,
+            # поэтому сообщения идут в очередь без шардирования.
+            await broker.publish(payload, queue=LEGACY_QUEUE)
+            done += 1
+        elapsed = time.perf_counter() - started
+
+    return done / elapsed
+
+
+async def _worker(duration: float, concurrency: int) -> dict[str, float]:
+    import logging
+
+    from infra.loop_monitor import monitor_loop
+
+    logging.disable(logging.CRITICAL)
+    async with monitor_loop():
+        return {
+            "ingest_rps": await _bench_ingest(duration, concurrency),
+            "sender_mps": await _bench_sender(duration),
+        }
+
+
+def _run_worker(args: argparse.Namespace) -> None:
+    from infra.event_loop import run
+
+    result = run(_worker(args.duration, args.concurrency))
+    print(json.dumps(result))  # noqa: T201
+
+
+def _run_combination(
+    loop: str,
+    backend: str,
+    args: argparse.Namespace,
+) -> dict[str, float]:
+    env = {
+        **os.environ,
+        **LOOP_MONITOR_MODES[args.loop_monitor],
+        "EVENT_LOOP": loop,
+        "JSON_BACKEND": backend,
+    }
+    completed = subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            __file__,
+            "--worker",
+            "--duration",
+            str(args.duration),
+            "--concurrency",
+            str(args.concurrency),
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--loop-monitor",
+        choices=LOOP_MONITOR_MODES,
+        default="off",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help=argparse.SUPPRESS,
+    )
+    args = parser.parse_args()
+
+    if args.worker:
+        _run_worker(args)
+        return
+
+    print(f"{'loop':<8} {'json':<7} {'ingest req/s':>13} {'sender msg/s':>13}")  # noqa: T201
+    for loop, backend in product(LOOPS, JSON_BACKENDS):
+        result = _run_combination(loop, backend, args)
+        print(  # noqa: T201
+            f"{loop:<8} {backend:<7} "
+            f"{result['ingest_rps']:>13.0f} {result['sender_mps']:>13.0f}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Время запуска процессов сервиса.
+
+Измеряет время импорта точек входа (API `main`, `tasks.rps`,
+`tasks.sender`) в отдельном интерпретаторе и время запуска процесса-
+воркера sender до готовности к работе: через `spawn` (каждый воркер
+заново импортирует зависимости) и через `forkserver` с предзагрузкой
+(так запускает воркеры `SenderSupervisor`). Внешние сервисы не нужны.
+
+Запуск из каталога `backend_app`:
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+ENTRY_POINTS = ("main", "tasks.rps", "tasks.sender")
+IMPORT_CODE = (
+    "import time; started = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def import_time(module: str) -> float:
+    """Время импорта модуля в новом интерпретаторе, секунды."""
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", IMPORT_CODE.format(module=module)],
+        cwd=SRC_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def _worker(started: multiprocessing.Queue) -> None:
+    import tasks.sender  # noqa: F401
+
+    started.put(time.perf_counter())
+
+
+def worker_start_times(method: str, runs: int) -> list[float]:
+    """Время от `Process.start()` до готовности воркера, секунды.
+
+    `time.perf_counter` в Linux общий для процессов (CLOCK_MONOTONIC).
+    """
+    context = multiprocessing.get_context(method)
+    if method == "forkserver":
+        # forkserver ищет предзагружаемые модули относительно текущего
+        # каталога (как при запуске сервиса из `src`).
+        os.chdir(SRC_DIR)
+        context.set_forkserver_preload(["tasks.supervisor"])
+    result = []
+    for _ in range(runs):
+        started = context.Queue()
+        process = context.Process(target=_worker, args=(started,))
+        begin = time.perf_counter()
+        process.start()
+        result.append(started.get() - begin)
+        process.join()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'import':<14} {'median ms':>10}")  # noqa: T201
+    for module in ENTRY_POINTS:
+        times = [import_time(module) for _ in range(args.runs)]
+        print(  # noqa: T201
+            f"{module:<14} {statistics.median(times) * 1000:>10.0f}",
+        )
+
+    print(f"\n{'worker start':<14} {'first ms':>10} {'next ms':>10}")  # noqa: T201
+    for method in ("spawn", "forkserver"):
+        first, *rest = worker_start_times(method, args.runs + 1)
+        print(  # noqa: T201
+            f"{method:<14} {first * 1000:>10.0f} "
+            f"{statistics.median(rest) * 1000:>10.0f}",
+        )
+
+
+if __name__ == "__main__":
+    main()
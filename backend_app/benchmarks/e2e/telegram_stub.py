@@ -0,0 +1,145 @@
+"""Заглушка Telegram Bot API для нагрузочного тестирования.
+
+Принимает `sendMessage`, добавляет задержку и с заданной вероятностью
+отвечает 429. Текст сообщений бенчмарка имеет вид `bench <seq> <unix_ts>`,
+по нему считается сквозная задержка доставки. Статистика — `GET /stats`.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from itertools import count
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+class DeliveryStats:
+    def __init__(self) -> None:
+        """Инициализирует пустую статистику."""
+        self.reset()
+
+    def reset(self) -> None:
+        """Обнуляет статистику."""
+        self.latencies: dict[int, float] = {}
+        self.throttled = 0
+        self.first_delivery: float | None = None
+        self.last_delivery: float | None = None
+
+    def record(self, text: str) -> None:
+        """Учитывает доставленное сообщение с текстом `text`."""
+        now = time.time()
+        parts = text.split()
+        if len(parts) == 3 and parts[0] == "bench":  # noqa: PLR2004
+            self.latencies.setdefault(int(parts[1]), now - float(parts[2]))
+        self.first_delivery = self.first_delivery or now
+        self.last_delivery = now
+
+    def as_dict(self) -> dict:
+        """Статистика для ответа `GET /stats`."""
+        return {
+            "delivered": len(self.latencies),
+            "throttled": self.throttled,
+            "first_delivery": self.first_delivery,
+            "last_delivery": self.last_delivery,
+            "latencies": list(self.latencies.values()),
+        }
+
+
+class TelegramStub:
+    def __init__(
+        self,
+        latency_ms: float,
+        jitter_ms: float,
+        rate_429: float,
+    ) -> None:
+        """Инициализирует заглушку.
+
+        :param latency_ms: Средняя задержка ответа в миллисекундах.
+        :param jitter_ms: Разброс задержки в миллисекундах.
+        :param rate_429: Доля ответов `429 Too Many Requests`.
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.stats = DeliveryStats()
+        self.message_ids = count(1)
+
+    async def send_message(self, request: Request) -> JSONResponse:
+        """Отвечает на `sendMessage` после задержки, иногда — 429."""
+        payload = await request.json()
+        jitter = random.uniform(-self.jitter_ms, self.jitter_ms)  # noqa: S311
+        await asyncio.sleep(max(self.latency_ms + jitter, 0) / 1000)
+
+        if random.random() < self.rate_429:  # noqa: S311
+            self.stats.throttled += 1
+            return JSONResponse(
+                {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": "Too Many Requests: retry after 1",
+                    "parameters": {"retry_after": 1},
+                },
+                status_code=429,
+            )
+
+        self.stats.record(payload.get("text", ""))
+        return JSONResponse(
+            {
+                "ok": True,
+                "result": {
+                    "message_id": next(self.message_ids),
+                    "chat": {"id": payload.get("chat_id")},
+                    "date": int(time.time()),
+                },
+            },
+        )
+
+    async def get_stats(self, _request: Request) -> JSONResponse:
+        """Статистика доставки."""
+        return JSONResponse(self.stats.as_dict())
+
+    async def reset_stats(self, _request: Request) -> JSONResponse:
+        """Сбрасывает статистику перед прогоном."""
+        self.stats.reset()
+        return JSONResponse({"ok": True})
+
+
+def create_app(latency_ms: float, jitter_ms: float, rate_429: float):
+    stub = TelegramStub(latency_ms, jitter_ms, rate_429)
+    return Starlette(
+        routes=[
+            Route(
+                "/bot{token}/sendMessage",
+                stub.send_message,
+                methods=["POST"],
+            ),
+            Route("/stats", stub.get_stats),
+            Route("/reset", stub.reset_stats, methods=["POST"]),
+        ],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(args.latency_ms, args.jitter_ms, args.rate_429),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse, Response
+
+from api.dependencies import verify_admin_token
+from core.config import settings
+from infra.metrics import metrics
+from infra.profiling import (
+    ProfileFormat,
+    ProfilerBusyError,
+    ProfilerUnavailableError,
+    dump_tasks,
+    profile,
+)
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+    dependencies=[Depends(verify_admin_token)],
+    include_in_schema=False,
+)
+
+
+@router.get("/profile")
+async def get_profile(
+    seconds: Annotated[
+        float,
+        Query(gt=0, le=settings.profile_max_seconds),
+    ] = 10,
+    output: Annotated[ProfileFormat, Query(alias="format")] = "html",
+) -> Response:
+    """Профилирует процесс API, обработавший запрос, и отдает отчет.
+
+    При нескольких воркерах gunicorn профилируется только один из них.
+    """
+    try:
+        report = await profile(seconds, output, settings.profile_interval)
+    except ProfilerBusyError as e:
+        raise HTTPException(
+            status.HTTP_409_CONFLICT,
+            "Profiling in progress",
+        ) from e
+    except ProfilerUnavailableError as e:
+        raise HTTPException(status.HTTP_501_NOT_IMPLEMENTED, str(e)) from e
+
+    return Response(
+        report.content,
+        media_type=report.media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{report.filename}"'
+            ),
+        },
+    )
+
+
+@router.get("/tasks", response_class=PlainTextResponse)
+async def get_tasks() -> str:
+    """Стеки всех задач asyncio процесса."""
+    return dump_tasks()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> str:
+    """Счетчики и показатели процесса в текстовом формате Prometheus."""
+    return metrics.exposition()
@@ -1,27 +1,76 @@
+import secrets
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, Request
+from fastapi import (
+    Depends,
+    Header,
+    HTTPException,
+    WebSocketException,
+    status,
+)
+from fastapi.requests import HTTPConnection
 from fastapi.security import APIKeyHeader
 
 from application.api_key_service import ApiKeyService
-from application.notification_service import NotificationService
+from application.bot_registry import BotRegistry
+from application.delivery_status_service import DeliveryStatusService
+from application.notify_queue_service import NotifyQueueService
+from application.suppression_service import SuppressionService
+from core.config import settings
 from infra.database.models.api_key import APIKey
+from infra.health import HealthCheck
 from infra.redis_client import RedisClient
+from schemas.bot_schema import BotInfo
 
 header_scheme = APIKeyHeader(name="x-api-key")
 
 
-def get_api_key_service() -> ApiKeyService:
-    return ApiKeyService()
+# HTTPConnection вместо Request, чтобы зависимости работали и в WebSocket.
+def get_api_key_service(connection: HTTPConnection) -> ApiKeyService:
+    return connection.app.state.api_key_service
 
 
-def get_notification_service() -> NotificationService:
-    return NotificationService()
+def get_redis_client(connection: HTTPConnection) -> RedisClient:
+    return connection.app.state.redis_client
 
 
-def get_redis_client(request: Request) -> RedisClient:
-    return request.app.state.redis_client
+def get_bot_registry(connection: HTTPConnection) -> BotRegistry:
+    return connection.app.state.bot_registry
+
+
+def get_health_check(connection: HTTPConnection) -> HealthCheck:
+    return connection.app.state.health_check
+
+
+def get_delivery_status_service(
+    redis_client: Annotated[RedisClient, Depends(get_redis_client)],
+) -> DeliveryStatusService:
+    return DeliveryStatusService(redis_client, settings.delivery_status_ttl)
+
+
+def get_suppression_service(
+    redis_client: Annotated[RedisClient, Depends(get_redis_client)],
+) -> SuppressionService:
+    return SuppressionService(redis_client, settings.suppression_ttl)
+
+
+def get_notify_queue_service(
+    redis_client: Annotated[RedisClient, Depends(get_redis_client)],
+    status_service: Annotated[
+        DeliveryStatusService,
+        Depends(get_delivery_status_service),
+    ],
+    suppression_service: Annotated[
+        SuppressionService,
+        Depends(get_suppression_service),
+    ],
+) -> NotifyQueueService:
+    return NotifyQueueService(
+        redis_client,
+        status_service,
+        suppression_service,
+    )
 
 
 async def verify_api_key(
@@ -34,3 +83,59 @@ async def verify_api_key(
         raise HTTPException(HTTPStatus.UNAUTHORIZED, "Not authenticated")
 
     return api_key
+
+
+async def get_current_bot(
+    api_key: Annotated[APIKey, Depends(verify_api_key)],
+    bot_registry: Annotated[BotRegistry, Depends(get_bot_registry)],
+) -> BotInfo:
+    bot = await bot_registry.get_or_load(str(api_key.bot_id))
+
+    if not bot:
+        raise HTTPException(HTTPStatus.UNAUTHORIZED, "Not authenticated")
+
+    return bot
+
+
+async def authenticate_bot(
+    key: str | None,
+    api_key_service: ApiKeyService,
+    bot_registry: BotRegistry,
+) -> BotInfo | None:
+    """Возвращает бота по значению API-ключа или None."""
+    if not key:
+        return None
+    api_key = await api_key_service.get_api_key(key)
+    if not api_key:
+        return None
+    return await bot_registry.get_or_load(str(api_key.bot_id))
+
+
+async def get_websocket_bot(
+    api_key_service: Annotated[ApiKeyService, Depends(get_api_key_service)],
+    bot_registry: Annotated[BotRegistry, Depends(get_bot_registry)],
+    key: Annotated[str | None, Header(alias="x-api-key")] = None,
+) -> BotInfo:
+    """Аутентификация WebSocket-соединения по заголовку `x-api-key`."""
+    bot = await authenticate_bot(key, api_key_service, bot_registry)
+
+    if not bot:
+        raise WebSocketException(
+            status.WS_1008_POLICY_VIOLATION,
+            "Not authenticated",
+        )
+
+    return bot
+
+
+async def verify_admin_token(
+    token: Annotated[str | None, Header(alias="x-admin-token")] = None,
+) -> None:
+    """Доступ к служебным эндпоинтам по токену `ADMIN_TOKEN`.
+
+    Без заданного токена эндпоинты скрыты (404).
+    """
+    if not settings.admin_token:
+        raise HTTPException(HTTPStatus.NOT_FOUND, "Not Found")
+    if not token or not secrets.compare_digest(token, settings.admin_token):
+        raise HTTPException(HTTPStatus.UNAUTHORIZED, "Not authenticated")
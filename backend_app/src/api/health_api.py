@@ -0,0 +1,43 @@
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from api.dependencies import get_health_check
+from api.responses import DefaultResponse
+from infra.health import HealthCheck
+from schemas.health_schema import HealthOut, HealthStatus
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live")
+async def live() -> HealthOut:
+    """Процесс запущен и обслуживает запросы (liveness)."""
+    return HealthOut(status=HealthStatus.OK)
+
+
+@router.get(
+    "/ready",
+    response_model=HealthOut,
+    responses={HTTPStatus.SERVICE_UNAVAILABLE: {"model": HealthOut}},
+)
+async def ready(
+    health: Annotated[HealthCheck, Depends(get_health_check)],
+) -> JSONResponse:
+    """Зависимости процесса (Redis, Postgres) доступны (readiness).
+
+    Результат проверки кешируется на `HEALTH_CACHE_TTL` секунд.
+    """
+    report = await health.check()
+    content = HealthOut(
+        status=HealthStatus.OK if report.ready else HealthStatus.UNAVAILABLE,
+        checks=report.checks,
+    )
+    return DefaultResponse(
+        content=content.model_dump(),
+        status_code=(
+            HTTPStatus.OK if report.ready else HTTPStatus.SERVICE_UNAVAILABLE
+        ),
+    )
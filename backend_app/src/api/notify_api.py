@@ -1,42 +1,287 @@
-import json
-from datetime import UTC, datetime
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from functools import partial
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    WebSocket,
+    status,
+)
+from fastapi.responses import Response
+from pydantic import Field, TypeAdapter, ValidationError
 
 from api.dependencies import (
-    get_redis_client,
-    verify_api_key,
+    authenticate_bot,
+    get_api_key_service,
+    get_bot_registry,
+    get_current_bot,
+    get_delivery_status_service,
+    get_notify_queue_service,
+    get_websocket_bot,
+)
+from application.api_key_service import ApiKeyService
+from application.bot_registry import BotRegistry
+from application.delivery_status_service import DeliveryStatusService
+from application.notify_queue_service import NotifyQueueService
+from application.suppression_service import SUPPRESSED_ERROR
+from core.config import settings
+from infra.ndjson import iter_lines
+from infra.serialization import dumps
+from schemas.bot_schema import BotInfo
+from schemas.delivery_schema import (
+    DeliveryStatusBulkIn,
+    DeliveryStatusBulkOut,
+    DeliveryStatusOut,
+)
+from schemas.notify_schema import (
+    NotifyCreatedOut,
+    NotifyIn,
+    NotifyStreamError,
+    NotifyStreamOut,
 )
-from infra.database.models.api_key import APIKey
-from infra.redis_client import RedisClient
-from schemas.notify_schema import NotifyIn, NotifyRedisDto
 
 router = APIRouter(prefix="/notify", tags=["notify"])
 
+# Сколько ошибок построчной валидации возвращать в ответе /stream.
+MAX_REPORTED_ERRORS = 10
+
+# Кадр WebSocket: одно уведомление или массив уведомлений.
+notify_frame_adapter = TypeAdapter(
+    NotifyIn
+    | Annotated[
+        list[NotifyIn],
+        Field(max_length=settings.notify_ws_max_batch_size),
+    ],
+)
+
 
-@router.post("/")
+@router.post("/", response_model=NotifyCreatedOut)
 async def notify(
     notify_data: NotifyIn,
-    api_key: Annotated[APIKey, Depends(verify_api_key)],
-    redis_client: Annotated[RedisClient, Depends(get_redis_client)],
-) -> JSONResponse:
-    key = f"notification:{notify_data.target_id}:{api_key.bot.token}"
-
-    notify_redis_dto = NotifyRedisDto(
-        **notify_data.model_dump(),
-        bot_token=api_key.bot.token,
-        timestamp=datetime.now(UTC).timestamp(),
+    bot: Annotated[BotInfo, Depends(get_current_bot)],
+    queue_service: Annotated[
+        NotifyQueueService,
+        Depends(get_notify_queue_service),
+    ],
+) -> Response:
+    message_id = await queue_service.enqueue(notify_data, bot)
+    if message_id is None:
+        raise HTTPException(HTTPStatus.CONFLICT, SUPPRESSED_ERROR)
+
+    return Response(
+        NotifyCreatedOut(id=message_id).model_dump_json(),
+        status_code=HTTPStatus.CREATED,
+        media_type="application/json",
     )
 
-    await redis_client.add_to_list(
-        key,
-        json.dumps(notify_redis_dto.model_dump()),
+
+@router.post("/stream")
+async def notify_stream(
+    request: Request,
+    bot: Annotated[BotInfo, Depends(get_current_bot)],
+    queue_service: Annotated[
+        NotifyQueueService,
+        Depends(get_notify_queue_service),
+    ],
+) -> NotifyStreamOut:
+    """Потоковая загрузка уведомлений в формате NDJSON.
+
+    Каждая строка тела — объект `NotifyIn`. Тело читается по мере
+    поступления, валидные строки ставятся в очередь пачками по
+    `NOTIFY_STREAM_CHUNK_SIZE`, невалидные пропускаются и учитываются
+    в итоге. Пустые строки игнорируются, уведомления в подавленные
+    чаты не ставятся в очередь и считаются в `suppressed`.
+    """
+    summary = NotifyStreamOut()
+    notifications = _iter_notifications(request, summary)
+    async for chunk in _iter_chunks(notifications):
+        _count(summary, await queue_service.enqueue_many(chunk, bot))
+    return summary
+
+
+async def _iter_notifications(
+    request: Request,
+    summary: NotifyStreamOut,
+) -> AsyncIterator[NotifyIn]:
+    """Уведомления из строк тела; невалидные строки учитываются в итоге."""
+    line_number = 0
+    async for line in iter_lines(
+        request.stream(),
+        settings.notify_stream_max_line_size,
+    ):
+        line_number += 1
+        if notify_data := _parse_or_reject(summary, line_number, line):
+            yield notify_data
+
+
+async def _iter_chunks(
+    notifications: AsyncIterator[NotifyIn],
+) -> AsyncIterator[list[NotifyIn]]:
+    """Пачки по `NOTIFY_STREAM_CHUNK_SIZE`; последняя может быть неполной."""
+    chunk: list[NotifyIn] = []
+    async for notify_data in notifications:
+        chunk.append(notify_data)
+        if len(chunk) >= settings.notify_stream_chunk_size:
+            yield chunk
+            chunk = []
+    yield chunk
+
+
+def _count(summary: NotifyStreamOut, ids: list[str | None]) -> None:
+    accepted = sum(message_id is not None for message_id in ids)
+    summary.accepted += accepted
+    summary.suppressed += len(ids) - accepted
+
+
+def _parse_line(line: bytes | None) -> NotifyIn | None:
+    if line is None:
+        msg = "Line is too long"
+        raise ValueError(msg)
+    if not line.strip():
+        return None
+    return NotifyIn.model_validate_json(line)
+
+
+def _parse_or_reject(
+    summary: NotifyStreamOut,
+    line_number: int,
+    line: bytes | None,
+) -> NotifyIn | None:
+    try:
+        return _parse_line(line)
+    except ValueError as e:
+        _reject(summary, line_number, e)
+        return None
+
+
+def _reject(summary: NotifyStreamOut, line_number: int, e: ValueError) -> None:
+    summary.rejected += 1
+    if len(summary.errors) < MAX_REPORTED_ERRORS:
+        summary.errors.append(
+            NotifyStreamError(line=line_number, error=_format_error(e)),
+        )
+
+
+def _format_error(e: ValueError) -> str:
+    if not isinstance(e, ValidationError):
+        return str(e)
+    return "; ".join(
+        f"{'.'.join(map(str, err['loc'])) or 'body'}: {err['msg']}"
+        for err in e.errors(include_url=False)
     )
 
-    return JSONResponse(
-        content={"message": "Notification created"},
-        status_code=HTTPStatus.CREATED,
+
+@router.websocket("/ws")
+async def notify_ws(
+    websocket: WebSocket,
+    bot: Annotated[BotInfo, Depends(get_websocket_bot)],
+    queue_service: Annotated[
+        NotifyQueueService,
+        Depends(get_notify_queue_service),
+    ],
+    api_key_service: Annotated[ApiKeyService, Depends(get_api_key_service)],
+    bot_registry: Annotated[BotRegistry, Depends(get_bot_registry)],
+) -> None:
+    """Прием уведомлений через постоянное WebSocket-соединение.
+
+    Ключ из заголовка `x-api-key` проверяется при подключении и затем
+    раз в `NOTIFY_WS_REAUTH_INTERVAL` секунд (чтобы отзыв ключа закрыл
+    соединение). Каждый кадр — объект `NotifyIn` или массив таких
+    объектов; на каждый кадр по порядку приходит ответ
+    `{"ids": [...]}` (null вместо id для подавленных чатов)
+    или `{"error": "..."}`.
+    """
+    await websocket.accept()
+    authenticate = partial(
+        authenticate_bot,
+        websocket.headers.get("x-api-key"),
+        api_key_service,
+        bot_registry,
+    )
+    reauth_at = time.monotonic() + settings.notify_ws_reauth_interval
+
+    while (message := await websocket.receive())["type"] != (
+        "websocket.disconnect"
+    ):
+        reauth_at = await _reauthenticate(websocket, authenticate, reauth_at)
+        if reauth_at is None:
+            return
+        reply = await _handle_frame(message, queue_service, bot)
+        await websocket.send_text(dumps(reply).decode())
+
+
+async def _reauthenticate(
+    websocket: WebSocket,
+    authenticate: Callable[[], Awaitable[BotInfo | None]],
+    reauth_at: float,
+) -> float | None:
+    """Повторно проверяет ключ, если подошел срок.
+
+    :return: Срок следующей проверки или None, если ключ больше не\
+        действует (соединение закрыто).
+    """
+    if time.monotonic() < reauth_at:
+        return reauth_at
+    if not await authenticate():
+        await websocket.close(
+            status.WS_1008_POLICY_VIOLATION,
+            "Not authenticated",
+        )
+        return None
+    return time.monotonic() + settings.notify_ws_reauth_interval
+
+
+async def _handle_frame(
+    message: dict,
+    queue_service: NotifyQueueService,
+    bot: BotInfo,
+) -> dict:
+    try:
+        frame = notify_frame_adapter.validate_json(
+            message.get("bytes") or message.get("text") or "",
+        )
+    except ValidationError as e:
+        return {"error": _format_error(e)}
+    items = frame if isinstance(frame, list) else [frame]
+    return {"ids": await queue_service.enqueue_many(items, bot)}
+
+
+@router.post("/status")
+async def get_statuses(
+    request_data: DeliveryStatusBulkIn,
+    bot: Annotated[BotInfo, Depends(get_current_bot)],
+    status_service: Annotated[
+        DeliveryStatusService,
+        Depends(get_delivery_status_service),
+    ],
+) -> DeliveryStatusBulkOut:
+    """Статусы доставки нескольких уведомлений."""
+    items = await status_service.get_many(
+        request_data.ids,
+        bot.id,
+    )
+    return DeliveryStatusBulkOut(items=items)
+
+
+@router.get("/{notification_id}")
+async def get_status(
+    notification_id: str,
+    bot: Annotated[BotInfo, Depends(get_current_bot)],
+    status_service: Annotated[
+        DeliveryStatusService,
+        Depends(get_delivery_status_service),
+    ],
+) -> DeliveryStatusOut:
+    """Статус доставки уведомления."""
+    items = await status_service.get_many(
+        [notification_id],
+        bot.id,
     )
+    if not items:
+        raise HTTPException(HTTPStatus.NOT_FOUND, "Notification not found")
+    return items[0]
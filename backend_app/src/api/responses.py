@@ -0,0 +1,7 @@
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from core.config import settings
+
+DefaultResponse: type[JSONResponse] = (
+    ORJSONResponse if settings.json_backend == "orjson" else JSONResponse
+)
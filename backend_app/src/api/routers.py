@@ -1,7 +1,11 @@
 from fastapi import APIRouter
 
+from api.debug_api import router as debug_router
+from api.health_api import router as health_router
 from api.notify_api import router as notify_router
 
 router = APIRouter()
 
 router.include_router(notify_router)
+router.include_router(debug_router)
+router.include_router(health_router)
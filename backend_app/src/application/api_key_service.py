@@ -1,10 +1,82 @@
+import asyncio
+
+from infra.database.connections import read_connection
 from infra.database.models.api_key import APIKey
+from infra.metrics import metrics
+from infra.ttl_cache import TTLCache
 
 
 class ApiKeyService:
+    """Проверка API-ключей с кэшем и объединением одинаковых запросов.
+
+    Одновременные проверки одного ключа ждут один общий запрос к базе
+    (single-flight), результат кэшируется на `ttl` секунд. Отсутствующие
+    и неактивные ключи кэшируются на `negative_ttl`, чтобы перебор
+    ключей не нагружал базу. Отзыв ключа в админке вступает в силу
+    не позже чем через `ttl` секунд.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 0,
+        negative_ttl: float = 0,
+        max_size: int = 10000,
+    ) -> None:
+        """Инициализирует сервис.
+
+        :param ttl: Время жизни найденного ключа в кэше (0 — без кэша).
+        :param negative_ttl: Время жизни отрицательного результата.
+        :param max_size: Максимальное число ключей в кэше (отдельно\
+            для найденных и отсутствующих).
+        """
+        self._found: TTLCache[str, APIKey] = TTLCache(
+            max_size=max_size,
+            ttl=ttl,
+        )
+        self._missing: TTLCache[str, bool] = TTLCache(
+            max_size=max_size,
+            ttl=negative_ttl,
+        )
+        self._in_flight: dict[str, asyncio.Future[APIKey | None]] = {}
+
     async def get_api_key(self, api_key: str) -> APIKey | None:
         """Получение API-ключа по значению."""
-        return await APIKey.get_or_none(
+        if found := self._found.get(api_key):
+            return found
+        if self._missing.get(api_key):
+            return None
+
+        # shield: отмена одного запроса не должна отменять общий запрос
+        return await asyncio.shield(self._shared_load(api_key))
+
+    def _shared_load(self, api_key: str) -> asyncio.Future[APIKey | None]:
+        future = self._in_flight.get(api_key)
+        if future is None:
+            future = asyncio.ensure_future(self._load(api_key))
+            self._in_flight[api_key] = future
+            future.add_done_callback(
+                lambda done: self._finish(api_key, done),
+            )
+        return future
+
+    async def _load(self, api_key: str) -> APIKey | None:
+        metrics.incr("api_key.db_queries")
+        result = await APIKey.get_or_none(
             key=api_key,
             is_active=True,
-        ).select_related("bot")
+            using_db=read_connection(),
+        )
+        if result:
+            self._found.set(api_key, result)
+        else:
+            self._missing.set(api_key, value=True)
+        return result
+
+    def _finish(self, api_key: str, future: asyncio.Future) -> None:
+        if self._in_flight.get(api_key) is future:
+            del self._in_flight[api_key]
+        if not future.cancelled():
+            # ошибка уже передана ожидающим; помечаем исключение
+            # как полученное
+            future.exception()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import TYPE_CHECKING
+
+from redis.exceptions import RedisError
+
+from infra.database.connections import read_connection
+from infra.database.models.bot import Bot
+from infra.serialization import loads
+from schemas.bot_schema import BotInfo
+
+if TYPE_CHECKING:
+    from infra.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+BOT_EVENTS_CHANNEL = "bots:changes"
+
+
+class BotRegistry:
+    """Кэш ботов в памяти процесса: bot id -> токен и настройки.
+
+    Загружается из таблицы `bot` при старте, обновляется по событиям
+    из Redis-канала `bots:changes` (их публикует админка) и периодически
+    перечитывается целиком на случай пропущенных событий.
+
+    Полная загрузка читает с реплики; точечное обновление по событию
+    или промаху кэша — с основной базы, чтобы не получить данные
+    до изменения из-за отставания реплики.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        refresh_interval: float,
+    ) -> None:
+        """Инициализирует реестр.
+
+        :param redis_client: Клиент Redis для подписки на события.
+        :param refresh_interval: Период полной перезагрузки в секундах.
+        """
+        self._redis = redis_client
+        self._refresh_interval = refresh_interval
+        self._bots: dict[str, BotInfo] = {}
+        self._by_token: dict[str, BotInfo] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    def get(self, bot_id: str) -> BotInfo | None:
+        """Возвращает бота по id без обращения к базе."""
+        return self._bots.get(bot_id)
+
+    def get_by_token(self, token: str) -> BotInfo | None:
+        """Возвращает бота по токену без обращения к базе."""
+        return self._by_token.get(token)
+
+    async def get_or_load(self, bot_id: str) -> BotInfo | None:
+        """Возвращает бота из кэша, при промахе читает его из базы."""
+        return self.get(bot_id) or await self.refresh(bot_id)
+
+    async def start(self) -> None:
+        """Подписывается на события и загружает всех ботов."""
+        self._tasks = [
+            asyncio.create_task(self._listen()),
+            asyncio.create_task(self._reload_periodically()),
+        ]
+        await self.load()
+
+    async def stop(self) -> None:
+        """Останавливает фоновые задачи реестра."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    async def load(self) -> None:
+        """Перечитывает всех ботов из базы."""
+        rows = await Bot.all(using_db=read_connection())
+        bots = [self._to_info(bot) for bot in rows]
+        self._bots = {bot.id: bot for bot in bots}
+        self._by_token = {bot.token: bot for bot in bots}
+        logger.info("Загружено ботов: %s", len(bots))
+
+    async def refresh(self, bot_id: str) -> BotInfo | None:
+        """Перечитывает одного бота из базы (или удаляет его из кэша)."""
+        bot = await Bot.get_or_none(id=bot_id)
+        self._forget(bot_id)
+        if bot is None:
+            return None
+
+        info = self._to_info(bot)
+        self._bots[info.id] = info
+        self._by_token[info.token] = info
+        return info
+
+    def _forget(self, bot_id: str) -> None:
+        old = self._bots.pop(bot_id, None)
+        if old:
+            self._by_token.pop(old.token, None)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                await self._consume_events()
+            except RedisError:
+                logger.exception("Потеряна подписка на %s", BOT_EVENTS_CHANNEL)
+                await asyncio.sleep(1)
+
+    async def _consume_events(self) -> None:
+        async for message in self._redis.listen_to_channel(
+            BOT_EVENTS_CHANNEL,
+        ):
+            await self._handle_event(message)
+
+    async def _handle_event(self, message: str) -> None:
+        # Ошибка одного события (битый JSON, сбой базы) не должна
+        # останавливать подписку: бот перечитается при полной перезагрузке.
+        try:
+            await self.refresh(loads(message)["id"])
+        except Exception:
+            logger.exception("Не удалось обработать событие бота %r", message)
+
+    async def _reload_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            try:
+                await self.load()
+            except Exception:
+                logger.exception("Не удалось перечитать ботов")
+
+    @staticmethod
+    def _to_info(bot: Bot) -> BotInfo:
+        return BotInfo(
+            id=str(bot.id),
+            token=bot.token,
+            callback_url=bot.callback_url or None,
+        )
@@ -0,0 +1,337 @@
+"""Архив результатов доставки в Postgres (таблица `delivery_log`).
+
+Таблица создается миграцией админки и секционирована по `created_at`
+на дневные секции `delivery_log_pYYYYMMDD`; строки без подходящей
+секции попадают в `delivery_log_default`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+import uuid
+from collections import deque
+from datetime import UTC, date, datetime, timedelta
+from itertools import chain
+from typing import TYPE_CHECKING
+
+from infra.metrics import metrics
+
+if TYPE_CHECKING:
+    from asyncpg import Connection
+    from tortoise.backends.base.client import BaseDBAsyncClient
+
+    from schemas.delivery_schema import DeliveryResult
+    from schemas.notify_schema import NotifyRedisDto
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_LOG_TABLE = "delivery_log"
+DELIVERY_LOG_COLUMNS = (
+    "created_at",
+    "message_id",
+    "bot_id",
+    "target_id",
+    "status",
+    "telegram_message_id",
+    "error_code",
+    "error",
+    "latency_ms",
+)
+PARTITION_PREFIX = f"{DELIVERY_LOG_TABLE}_p"
+DEFAULT_PARTITION = f"{DELIVERY_LOG_TABLE}_default"
+_DELETE_EXPIRED_DEFAULT_SQL = (
+    "DELETE FROM delivery_log_default WHERE created_at < $1"
+)
+# Строки дня переносятся из секции по умолчанию во временную таблицу,
+# чтобы Postgres позволил создать секцию этого дня.
+_CREATE_MOVED_SQL = (
+    "CREATE TEMP TABLE delivery_log_moved (LIKE delivery_log) ON COMMIT DROP"
+)
+_MOVE_FROM_DEFAULT_SQL = (
+    "WITH moved AS (DELETE FROM delivery_log_default "
+    "WHERE created_at >= $1 AND created_at < $2 RETURNING *), "
+    "inserted AS (INSERT INTO delivery_log_moved SELECT * FROM moved "
+    "RETURNING 1) "
+    "SELECT count(*) FROM inserted"
+)
+_RESTORE_MOVED_SQL = (
+    "INSERT INTO delivery_log SELECT * FROM delivery_log_moved"
+)
+# Ключ pg_advisory_lock: обслуживание секций выполняет один воркер.
+_MAINTENANCE_LOCK = 0x64656C6976657279
+
+
+def partition_name(day: date) -> str:
+    return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+class DeliveryLogWriter:
+    """Буферизованная запись результатов доставки в `delivery_log`.
+
+    `record` только добавляет строку в буфер и не ждет базы. Буфер
+    записывается командой COPY раз в `flush_interval` секунд или при
+    накоплении `batch_size` строк: одна команда на тысячи строк вместо
+    INSERT на каждое сообщение. Если база недоступна, строки остаются
+    в буфере до следующей попытки; при переполнении (`max_buffer`)
+    отбрасываются самые старые.
+    """
+
+    def __init__(
+        self,
+        connection: BaseDBAsyncClient,
+        *,
+        flush_interval: float,
+        batch_size: int,
+        max_buffer: int,
+    ) -> None:
+        """Инициализирует буфер архива.
+
+        :param connection: Соединение Tortoise с Postgres (asyncpg).
+        :param flush_interval: Максимальная задержка записи в секундах.
+        :param batch_size: Размер буфера, при котором запись идет сразу.
+        :param max_buffer: Максимальное число строк в буфере.
+        """
+        self._connection = connection
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._rows: deque[tuple] = deque(maxlen=max_buffer)
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def record(
+        self,
+        msg: NotifyRedisDto,
+        bot_id: str,
+        result: DeliveryResult,
+    ) -> None:
+        """Добавляет результат отправки в буфер записи."""
+        if len(self._rows) == self._rows.maxlen:
+            metrics.incr("delivery_log.dropped")
+        self._rows.append(
+            (
+                datetime.now(UTC),
+                msg.id,
+                uuid.UUID(bot_id),
+                msg.target_id,
+                result.status.value,
+                result.telegram_message_id,
+                result.error_code,
+                result.error,
+                result.latency_ms,
+            ),
+        )
+        if len(self._rows) >= self._batch_size:
+            self._full.set()
+
+    async def start(self) -> None:
+        """Запускает фоновую запись буфера."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновую запись и сбрасывает остаток буфера."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Записывает накопленные строки командами COPY."""
+        self._full.clear()
+        while self._rows:
+            batch = [
+                self._rows.popleft()
+                for _ in range(min(self._batch_size, len(self._rows)))
+            ]
+            started = time.perf_counter()
+            try:
+                async with self._connection.acquire_connection() as con:
+                    await con.copy_records_to_table(
+                        DELIVERY_LOG_TABLE,
+                        records=batch,
+                        columns=DELIVERY_LOG_COLUMNS,
+                    )
+            except Exception:
+                logger.exception(
+                    "Не удалось записать %s строк архива доставки",
+                    len(batch),
+                )
+                self._requeue(batch)
+                return
+            metrics.incr("delivery_log.written", len(batch))
+            metrics.gauge(
+                "delivery_log.copy_ms",
+                (time.perf_counter() - started) * 1000,
+            )
+
+    def _requeue(self, batch: list[tuple]) -> None:
+        overflow = len(batch) + len(self._rows) - (self._rows.maxlen or 0)
+        if overflow > 0:
+            metrics.incr("delivery_log.dropped", overflow)
+        self._rows = deque(chain(batch, self._rows), maxlen=self._rows.maxlen)
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._full.wait(),
+                    self._flush_interval,
+                )
+            await self.flush()
+
+
+class DeliveryLogPartitions:
+    """Создание и удаление дневных секций `delivery_log`.
+
+    Заранее создает секции на `days_ahead` дней вперед и удаляет
+    секции старше `retention_days`. Запускается в каждом воркере
+    sender, но работу в каждый момент выполняет один из них
+    (advisory lock Postgres).
+    """
+
+    def __init__(
+        self,
+        connection: BaseDBAsyncClient,
+        *,
+        days_ahead: int,
+        retention_days: int,
+        interval: float,
+    ) -> None:
+        """Инициализирует обслуживание секций.
+
+        :param connection: Соединение Tortoise с Postgres (asyncpg).
+        :param days_ahead: На сколько дней вперед создавать секции.
+        :param retention_days: Сколько дней хранить архив.
+        :param interval: Период обслуживания в секундах.
+        """
+        self._connection = connection
+        self._days_ahead = days_ahead
+        self._retention_days = retention_days
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """Создает секции и запускает периодическое обслуживание."""
+        await self.maintain()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает периодическое обслуживание."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def maintain(self) -> None:
+        """Создает недостающие секции и удаляет устаревшие.
+
+        Каждая секция создается в своей транзакции, а удаление идет
+        отдельно и выполняется всегда: сбой одной секции (или удаления)
+        не откатывает остальные и не останавливает очистку архива.
+        """
+        today = datetime.now(UTC).date()
+        try:
+            async with self._connection.acquire_connection() as con:
+                for offset in range(self._days_ahead + 1):
+                    day = today + timedelta(days=offset)
+                    await self._create_partition(con, day)
+                await self._drop_expired(con, today)
+        except Exception:
+            logger.exception("Не удалось обслужить секции архива доставки")
+
+    async def _create_partition(self, con: Connection, day: date) -> None:
+        try:
+            async with con.transaction():
+                moved = await _lock_and_create_partition(con, day)
+        except Exception:
+            logger.exception("Не создана секция %s", partition_name(day))
+            return
+        if moved:
+            logger.warning(
+                "В секцию %s перенесено строк из %s: %s",
+                partition_name(day),
+                DEFAULT_PARTITION,
+                moved,
+            )
+
+    async def _drop_expired(self, con: Connection, today: date) -> None:
+        oldest = today - timedelta(days=self._retention_days)
+        async with con.transaction():
+            if not await _try_lock(con):
+                return
+            # Строки, попавшие в секцию по умолчанию, удаляются по сроку.
+            await con.execute(_DELETE_EXPIRED_DEFAULT_SQL, _day_start(oldest))
+            expired = await self._expired_partitions(con, today)
+            if expired:
+                await con.execute(f"DROP TABLE IF EXISTS {', '.join(expired)}")
+                logger.info("Удалены секции архива доставки: %s", expired)
+
+    async def _expired_partitions(
+        self,
+        con: Connection,
+        today: date,
+    ) -> list[str]:
+        oldest = partition_name(today - timedelta(days=self._retention_days))
+        rows = await con.fetch(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = $1::regclass",
+            DELIVERY_LOG_TABLE,
+        )
+        # Имена секций сравниваются как строки: дата в них YYYYMMDD.
+        return sorted(
+            row["relname"]
+            for row in rows
+            if row["relname"].startswith(PARTITION_PREFIX)
+            and row["relname"] < oldest
+        )
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            await self.maintain()
+
+
+async def _try_lock(con: Connection) -> bool:
+    return await con.fetchval(
+        "SELECT pg_try_advisory_xact_lock($1)",
+        _MAINTENANCE_LOCK,
+    )
+
+
+async def _lock_and_create_partition(con: Connection, day: date) -> int:
+    """Создает секцию дня, если ее нет, внутри открытой транзакции.
+
+    Если в секции по умолчанию уже есть строки этого дня (запись
+    опередила обслуживание), Postgres не даст создать секцию: строки
+    переносятся во временную таблицу и после создания секции
+    вставляются обратно уже в нее.
+
+    :return: Число перенесенных строк.
+    """
+    name = partition_name(day)
+    if not await _try_lock(con) or await con.fetchval(
+        "SELECT to_regclass($1)",
+        name,
+    ):
+        return 0
+
+    start, end = _day_start(day), _day_start(day + timedelta(days=1))
+    await con.execute(_CREATE_MOVED_SQL)
+    moved = await con.fetchval(_MOVE_FROM_DEFAULT_SQL, start, end)
+    await con.execute(
+        f"CREATE TABLE {name} PARTITION OF {DELIVERY_LOG_TABLE} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')",
+    )
+    if moved:
+        await con.execute(_RESTORE_MOVED_SQL)
+    return moved
+
+
+def _day_start(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=UTC)
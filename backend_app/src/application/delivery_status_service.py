@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from redis.exceptions import RedisError
+
+from schemas.delivery_schema import (
+    DeliveryResult,
+    DeliveryStatus,
+    DeliveryStatusOut,
+)
+
+if TYPE_CHECKING:
+    from redis.asyncio.client import Pipeline
+
+    from infra.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+# Короткие имена полей хэша `delivery:{id}` экономят память Redis.
+_FIELDS = {
+    "status": "s",
+    "bot_id": "b",
+    "telegram_message_id": "m",
+    "error": "e",
+    "latency_ms": "l",
+    "queued_at": "q",
+    "updated_at": "u",
+}
+
+
+def status_key(message_id: str) -> str:
+    return f"delivery:{message_id}"
+
+
+def _result_fields(result: DeliveryResult) -> dict[str, str | int | float]:
+    fields = {
+        _FIELDS[name]: value
+        for name, value in result.model_dump(
+            include={"telegram_message_id", "latency_ms"},
+            exclude_none=True,
+        ).items()
+    }
+    fields[_FIELDS["status"]] = result.status.value
+    fields[_FIELDS["error"]] = result.error or ""
+    fields[_FIELDS["updated_at"]] = time.time()
+    return fields
+
+
+class DeliveryStatusService:
+    """Чтение и начальная запись статусов доставки."""
+
+    def __init__(self, redis_client: RedisClient, ttl: int) -> None:
+        """Инициализирует сервис статусов.
+
+        :param redis_client: Клиент Redis.
+        :param ttl: Время жизни статуса в секундах.
+        """
+        self._redis = redis_client
+        self._ttl = ttl
+
+    def add_queued(
+        self,
+        pipeline: Pipeline,
+        message_id: str,
+        bot_id: str,
+        queued_at: float,
+    ) -> None:
+        """Добавляет в пайплайн запись статуса `queued`.
+
+        Команды выполняются вместе с постановкой сообщения в очередь,
+        поэтому запись статуса не требует отдельного запроса к Redis.
+        """
+        key = status_key(message_id)
+        pipeline.hset(
+            key,
+            mapping={
+                _FIELDS["status"]: DeliveryStatus.QUEUED.value,
+                _FIELDS["bot_id"]: bot_id,
+                _FIELDS["queued_at"]: queued_at,
+                _FIELDS["updated_at"]: queued_at,
+            },
+        )
+        pipeline.expire(key, self._ttl)
+
+    def add_result(
+        self,
+        pipeline: Pipeline,
+        message_id: str,
+        result: DeliveryResult,
+    ) -> None:
+        """Добавляет в пайплайн запись результата доставки.
+
+        Для сообщений, которые снимаются с очереди без отправки
+        (например, в подавленные чаты).
+        """
+        key = status_key(message_id)
+        pipeline.hset(key, mapping=_result_fields(result))
+        pipeline.expire(key, self._ttl)
+
+    async def get_many(
+        self,
+        message_ids: list[str],
+        bot_id: str,
+    ) -> list[DeliveryStatusOut]:
+        """Возвращает статусы сообщений бота одним запросом к Redis.
+
+        :param message_ids: Идентификаторы сообщений.
+        :param bot_id: Бот, которому должны принадлежать сообщения.
+        :return: Найденные статусы (чужие и истекшие пропускаются).
+        """
+        pipeline = await self._redis.pipeline()
+        for message_id in message_ids:
+            pipeline.hgetall(status_key(message_id))
+        rows = await pipeline.execute()
+
+        return [
+            self._to_schema(message_id, row)
+            for message_id, row in zip(message_ids, rows, strict=True)
+            if row and row.get(_FIELDS["bot_id"]) == bot_id
+        ]
+
+    @staticmethod
+    def _to_schema(message_id: str, row: dict[str, str]) -> DeliveryStatusOut:
+        return DeliveryStatusOut(
+            id=message_id,
+            **{
+                name: row[field]
+                for name, field in _FIELDS.items()
+                if row.get(field) and name != "bot_id"
+            },
+        )
+
+
+class DeliveryStatusRecorder:
+    """Буферизованная запись статусов доставки из sender.
+
+    `record` не обращается к Redis: обновления копятся в памяти
+    и сбрасываются пайплайном раз в `flush_interval` секунд
+    или при накоплении `batch_size` сообщений.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        ttl: int,
+        *,
+        flush_interval: float,
+        batch_size: int,
+    ) -> None:
+        """Инициализирует буфер статусов.
+
+        :param redis_client: Клиент Redis.
+        :param ttl: Время жизни статуса в секундах.
+        :param flush_interval: Максимальная задержка записи в секундах.
+        :param batch_size: Размер буфера, при котором запись идет сразу.
+        """
+        self._redis = redis_client
+        self._ttl = ttl
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._pending: dict[str, dict[str, str | int | float]] = {}
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def record(self, message_id: str, result: DeliveryResult) -> None:
+        """Добавляет результат отправки в буфер записи."""
+        self._pending.setdefault(message_id, {}).update(
+            _result_fields(result),
+        )
+
+        if len(self._pending) >= self._batch_size:
+            self._full.set()
+
+    async def start(self) -> None:
+        """Запускает фоновую запись буфера."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновую запись и сбрасывает остаток буфера."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Записывает накопленные статусы одним пайплайном."""
+        self._full.clear()
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        await self._write(batch)
+
+    async def _write(
+        self,
+        batch: dict[str, dict[str, str | int | float]],
+    ) -> None:
+        pipeline = await self._redis.pipeline()
+        for message_id, fields in batch.items():
+            key = status_key(message_id)
+            pipeline.hset(key, mapping=fields)
+            pipeline.expire(key, self._ttl)
+
+        try:
+            await pipeline.execute()
+        except RedisError:
+            logger.exception("Не удалось записать %s статусов", len(batch))
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._full.wait(),
+                    self._flush_interval,
+                )
+            await self.flush()
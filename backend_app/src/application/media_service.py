@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING
+from uuid import UUID
+from weakref import WeakValueDictionary
+
+from infra.database.connections import read_connection
+from infra.database.models.attachment import Attachment
+from infra.metrics import metrics
+from infra.ttl_cache import TTLCache
+from schemas.media_schema import MediaFile, MediaKind
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from infra.redis_client import RedisClient
+
+
+class MediaError(Exception):
+    """Вложение не найдено или вложения нельзя отправить вместе."""
+
+
+def file_ids_key(bot_id: str) -> str:
+    """Хэш `sha256 -> file_id` с TTL на каждое поле (HEXPIRE).
+
+    `file_id` в Telegram свой у каждого бота.
+    """
+    return f"file_ids:{bot_id}"
+
+
+class MediaService:
+    """Подготовка вложений к отправке и кэш `file_id` Telegram.
+
+    Файл загружается в Telegram один раз на бота и содержимое: после
+    первой отправки `file_id` сохраняется в Redis на `file_id_ttl`
+    секунд и подставляется во все следующие. Пока идет первая
+    загрузка, остальные отправки того же файла в этом процессе ждут
+    ее результата.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        media_root: Path,
+        *,
+        cache_size: int,
+        cache_ttl: float,
+        file_id_ttl: int,
+    ) -> None:
+        """Инициализирует сервис.
+
+        :param redis_client: Клиент Redis для кэша `file_id`.
+        :param media_root: Каталог медиафайлов админки.
+        :param cache_size: Размер кэша записей вложений.
+        :param cache_ttl: Время жизни записи вложения в кэше.
+        :param file_id_ttl: Время жизни `file_id` в Redis в секундах.
+        """
+        self._redis = redis_client
+        self._media_root = media_root
+        self._file_id_ttl = file_id_ttl
+        self._attachments: TTLCache[str, Attachment] = TTLCache(
+            max_size=cache_size,
+            ttl=cache_ttl,
+        )
+        self._upload_locks: WeakValueDictionary[str, asyncio.Lock] = (
+            WeakValueDictionary()
+        )
+
+    async def resolve(
+        self,
+        attachment_ids: list[str],
+        bot_id: str,
+    ) -> list[MediaFile]:
+        """Возвращает вложения бота в порядке `attachment_ids`.
+
+        :raises MediaError: Вложение не найдено, принадлежит другому боту\
+            или в группе смешаны фото и документы.
+        """
+        rows = [await self._get_attachment(i) for i in attachment_ids]
+        if any(row is None or str(row.bot_id) != bot_id for row in rows):
+            msg = "Attachment not found"
+            raise MediaError(msg)
+
+        kinds = {row.kind for row in rows}
+        if len(rows) > 1 and MediaKind.DOCUMENT in kinds and len(kinds) > 1:
+            msg = "Photos and documents cannot be mixed in one message"
+            raise MediaError(msg)
+
+        files = [
+            MediaFile(
+                kind=MediaKind(row.kind),
+                path=self._media_root / row.file,
+                filename=PurePosixPath(row.file).name,
+                sha256=row.sha256,
+            )
+            for row in rows
+        ]
+        await self._fill_file_ids(bot_id, files)
+        return files
+
+    @asynccontextmanager
+    async def exclusive_upload(
+        self,
+        bot_id: str,
+        files: list[MediaFile],
+    ) -> AsyncIterator[None]:
+        """Не дает загружать один и тот же файл параллельно.
+
+        Внутри блока файлы без `file_id` загружает только один
+        отправитель; остальные получают `file_id` после его выхода.
+        """
+        keys = sorted({f"{bot_id}:{f.sha256}" for f in files if not f.file_id})
+        async with AsyncExitStack() as stack:
+            for key in keys:
+                lock = self._upload_locks.setdefault(key, asyncio.Lock())
+                await stack.enter_async_context(lock)
+            if keys:
+                await self._fill_file_ids(bot_id, files)
+            yield
+
+    async def remember(
+        self,
+        bot_id: str,
+        files: list[MediaFile],
+        file_ids: list[str | None],
+    ) -> None:
+        """Сохраняет `file_id` загруженных файлов."""
+        mapping = {
+            file.sha256: file_id
+            for file, file_id in zip(files, file_ids, strict=False)
+            if file_id and not file.file_id
+        }
+        if mapping:
+            metrics.incr("media.uploaded", len(mapping))
+            key = file_ids_key(bot_id)
+            pipeline = await self._redis.pipeline()
+            pipeline.hset(key, mapping=mapping)
+            pipeline.hexpire(key, self._file_id_ttl, *mapping)
+            await pipeline.execute()
+
+    async def _get_attachment(self, attachment_id: str) -> Attachment | None:
+        attachment = self._attachments.get(attachment_id)
+        if attachment is not None:
+            return attachment
+
+        attachment = await self._load_attachment(attachment_id)
+        if attachment is not None:
+            self._attachments.set(attachment_id, attachment)
+        return attachment
+
+    async def _load_attachment(self, attachment_id: str) -> Attachment | None:
+        try:
+            UUID(attachment_id)
+        except ValueError:
+            return None
+        return await Attachment.get_or_none(
+            id=attachment_id,
+            using_db=read_connection(),
+        )
+
+    async def _fill_file_ids(
+        self,
+        bot_id: str,
+        files: list[MediaFile],
+    ) -> None:
+        redis_con = await self._redis.get_client()
+        file_ids = await redis_con.hmget(
+            file_ids_key(bot_id),
+            [file.sha256 for file in files],
+        )
+        for file, file_id in zip(files, file_ids, strict=True):
+            file.file_id = file_id
+        metrics.incr("media.file_id_hit", sum(map(bool, file_ids)))
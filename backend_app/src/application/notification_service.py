@@ -1,37 +1,80 @@
+import asyncio
+import contextlib
 import logging
+import time
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
+from typing import Any
 
 import httpx
 
+from application.send_rate_limiter import AdaptiveRateLimiter
+from infra.metrics import metrics
+from infra.serialization import dumps
+from schemas.delivery_schema import DeliveryResult, DeliveryStatus
+from schemas.media_schema import MediaFile
 from schemas.notify_schema import MessageParseMode
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_SEND_METHODS = {"photo": "sendPhoto", "document": "sendDocument"}
+# Ошибки, при которых запрос гарантированно не дошел до Telegram. После
+# остальных (таймаут чтения, обрыв ответа) сообщение могло быть уже
+# отправлено, и повтор рискует дублем.
+_RETRYABLE_ERRORS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+)
+
 
 class NotificationService:
-    async def send(
+    def __init__(
         self,
-        chat_id: int,
-        message: str,
-        bot_token: str,
-        parse_mode: MessageParseMode | None,
+        client: httpx.AsyncClient,
+        *,
+        max_attempts: int = 3,
+        max_retry_after: float = 30,
+        upload_timeout: float = 60,
+        rate_limiter: AdaptiveRateLimiter | None = None,
     ) -> None:
-        """Отправка сообщения в Telegram."""
-        await self._send_telegram_message(
-            chat_id,
-            bot_token,
-            message,
-            parse_mode,
-        )
+        """Инициализирует сервис отправки уведомлений.
+
+        :param client: HTTP-клиент с пулом соединений к Telegram Bot API,\
+            общий для процесса (base_url — адрес API).
+        :param max_attempts: Максимальное число попыток отправки.
+        :param max_retry_after: Верхняя граница паузы между попытками.
+        :param upload_timeout: Таймаут запросов с загрузкой файлов.
+        :param rate_limiter: Подбор темпа отправки бота по ответам\
+            Telegram (без него темп не ограничивается).
+        """
+        self._client = client
+        self._max_attempts = max_attempts
+        self._max_retry_after = max_retry_after
+        self._upload_timeout = upload_timeout
+        self._rate_limiter = rate_limiter
 
-    async def _send_telegram_message(
+    async def send(  # noqa: PLR0913
         self,
         chat_id: int,
-        bot_token: str,
         message: str,
+        bot_token: str,
         parse_mode: MessageParseMode | None,
-    ) -> None:
-        """Отправка сообщения в Telegram."""
+        on_retry: Callable[[DeliveryResult], None] | None = None,
+        bot_id: str | None = None,
+    ) -> DeliveryResult:
+        """Отправка сообщения в Telegram с повторами.
+
+        Повторяются ответы 429, ошибки 5xx и ошибки установки соединения;
+        после обрыва или таймаута ответа повтора нет — сообщение могло
+        уже дойти.
+
+        :param on_retry: Вызывается с результатом неудачной попытки\
+            перед повтором (например, для записи статуса `retrying`).
+        :param bot_id: Id бота для подбора темпа отправки.
+        :return: Результат последней попытки.
+        """
         payload = {
             "chat_id": chat_id,
             "text": message,
@@ -40,14 +83,271 @@ class NotificationService:
         if parse_mode:
             payload["parse_mode"] = parse_mode
 
-        api_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-        async with httpx.AsyncClient(timeout=10) as client:
+        return await self._with_retries(
+            lambda: self._call(bot_token, "sendMessage", json=payload),
+            on_retry,
+            bot_id,
+        )
+
+    async def send_media(  # noqa: PLR0913
+        self,
+        chat_id: int,
+        media: list[MediaFile],
+        bot_token: str,
+        caption: str | None,
+        parse_mode: MessageParseMode | None,
+        on_retry: Callable[[DeliveryResult], None] | None = None,
+        bot_id: str | None = None,
+    ) -> DeliveryResult:
+        """Отправка фото или документов (одного или группой) с повторами.
+
+        Файлы с `file_id` не загружаются повторно, остальные передаются
+        потоком из хранилища, не читаясь в память целиком.
+
+        :param caption: Подпись (у группы — к первому вложению).
+        :return: Результат последней попытки; `file_ids` — в порядке `media`.
+        """
+        return await self._with_retries(
+            lambda: self._send_media_once(
+                chat_id,
+                media,
+                bot_token,
+                caption,
+                parse_mode,
+            ),
+            on_retry,
+            bot_id,
+        )
+
+    async def _with_retries(
+        self,
+        attempt_call: Callable[[], Awaitable[DeliveryResult]],
+        on_retry: Callable[[DeliveryResult], None] | None,
+        bot_id: str | None,
+    ) -> DeliveryResult:
+        for attempt in range(1, self._max_attempts):
+            result = await self._paced(attempt_call, bot_id)
+            if result.status != DeliveryStatus.RETRYING:
+                return result
+            await self._before_retry(result, attempt, on_retry)
+
+        return _give_up(await self._paced(attempt_call, bot_id))
+
+    async def _before_retry(
+        self,
+        result: DeliveryResult,
+        attempt: int,
+        on_retry: Callable[[DeliveryResult], None] | None,
+    ) -> None:
+        metrics.incr("telegram.retried")
+        if on_retry:
+            on_retry(result)
+        await asyncio.sleep(
+            min(result.retry_after or attempt, self._max_retry_after),
+        )
+
+    async def _paced(
+        self,
+        attempt_call: Callable[[], Awaitable[DeliveryResult]],
+        bot_id: str | None,
+    ) -> DeliveryResult:
+        """Попытка отправки в темпе бота с учетом ее результата.
+
+        Ответ 429 (единственный, в котором Telegram передает
+        `retry_after`) уменьшает темп, успешная отправка — увеличивает.
+        """
+        if not (self._rate_limiter and bot_id):
+            return await attempt_call()
+
+        await self._rate_limiter.acquire(bot_id)
+        result = await attempt_call()
+        await _report_pace(self._rate_limiter, bot_id, result)
+        return result
+
+    async def _send_media_once(
+        self,
+        chat_id: int,
+        media: list[MediaFile],
+        bot_token: str,
+        caption: str | None,
+        parse_mode: MessageParseMode | None,
+    ) -> DeliveryResult:
+        with contextlib.ExitStack() as stack:
             try:
-                response = await client.post(api_url, json=payload)
-                response.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                logger.info(
-                    f"Ошибка при отправке сообщения: {e.response.status_code} {e.response.text}",
+                files = {
+                    f"file{index}": (
+                        item.filename,
+                        stack.enter_context(item.path.open("rb")),
+                    )
+                    for index, item in enumerate(media)
+                    if not item.file_id
+                }
+            except OSError as e:
+                logger.warning("Не удалось открыть вложение: %s", e)
+                metrics.incr("telegram.failed")
+                return DeliveryResult(
+                    status=DeliveryStatus.FAILED,
+                    error="Attachment file is unavailable",
                 )
-            except httpx.RequestError as e:
-                logger.info(f"Ошибка соединения с Telegram API: {e}")
+
+            method, data = _media_request(
+                media,
+                _caption_fields(caption, parse_mode),
+            )
+            # Без явного таймаута действует таймаут клиента.
+            upload = {"timeout": self._upload_timeout} if files else {}
+            return await self._call(
+                bot_token,
+                method,
+                data={"chat_id": chat_id} | data,
+                files=files or None,
+                **upload,
+            )
+
+    async def _call(
+        self,
+        bot_token: str,
+        method: str,
+        **request: Any,  # noqa: ANN401
+    ) -> DeliveryResult:
+        """Вызов метода Telegram Bot API."""
+        api_url = f"/bot{bot_token}/{method}"
+        started = time.perf_counter()
+        try:
+            response = await self._client.post(api_url, **request)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.info(
+                f"Ошибка при отправке сообщения: {e.response.status_code} {e.response.text}",
+            )
+            return self._error_result(e.response, started)
+        except httpx.RequestError as e:
+            logger.info(f"Ошибка соединения с Telegram API: {e}")
+            return self._request_error_result(e, started)
+
+        metrics.incr("telegram.sent")
+        result = response.json()["result"]
+        messages = result if isinstance(result, list) else [result]
+        file_ids = [_file_id(message) for message in messages]
+        return DeliveryResult(
+            status=DeliveryStatus.SENT,
+            telegram_message_id=messages[0]["message_id"],
+            latency_ms=_elapsed_ms(started),
+            file_ids=file_ids if any(file_ids) else None,
+        )
+
+    @staticmethod
+    def _request_error_result(
+        error: httpx.RequestError,
+        started: float,
+    ) -> DeliveryResult:
+        """Формирует результат по ошибке запроса без ответа Telegram."""
+        retryable = isinstance(error, _RETRYABLE_ERRORS)
+        if not retryable:
+            metrics.incr("telegram.failed")
+
+        return DeliveryResult(
+            status=(
+                DeliveryStatus.RETRYING if retryable else DeliveryStatus.FAILED
+            ),
+            error=str(error) or type(error).__name__,
+            latency_ms=_elapsed_ms(started),
+        )
+
+    @staticmethod
+    def _error_result(
+        response: httpx.Response,
+        started: float,
+    ) -> DeliveryResult:
+        """Формирует результат по ответу Telegram с ошибкой."""
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+
+        retryable = (
+            response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+            or response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+        if not retryable:
+            metrics.incr("telegram.failed")
+
+        return DeliveryResult(
+            status=(
+                DeliveryStatus.RETRYING if retryable else DeliveryStatus.FAILED
+            ),
+            error=body.get("description") or response.reason_phrase,
+            latency_ms=_elapsed_ms(started),
+            retry_after=body.get("parameters", {}).get("retry_after"),
+            error_code=body.get("error_code") or response.status_code,
+        )
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _file_id(message: dict[str, Any]) -> str | None:
+    """`file_id` вложения из отправленного сообщения (фото — самое большое)."""
+    if photo := message.get("photo"):
+        return photo[-1]["file_id"]
+    if document := message.get("document"):
+        return document["file_id"]
+    return None
+
+
+async def _report_pace(
+    rate_limiter: AdaptiveRateLimiter,
+    bot_id: str,
+    result: DeliveryResult,
+) -> None:
+    """Передает ограничителю темпа исход попытки отправки."""
+    if result.status == DeliveryStatus.SENT:
+        rate_limiter.on_success(bot_id)
+    elif result.retry_after is not None:
+        await rate_limiter.on_throttled(bot_id, result.retry_after)
+
+
+def _give_up(result: DeliveryResult) -> DeliveryResult:
+    """Результат последней попытки: повтор после нее уже не будет."""
+    if result.status != DeliveryStatus.RETRYING:
+        return result
+    metrics.incr("telegram.failed")
+    return result.model_copy(update={"status": DeliveryStatus.FAILED})
+
+
+def _caption_fields(
+    caption: str | None,
+    parse_mode: MessageParseMode | None,
+) -> dict[str, Any]:
+    """Поля подписи вложения; формат без подписи не передается."""
+    if not caption:
+        return {}
+    fields = {"caption": caption, "parse_mode": parse_mode}
+    return {name: value for name, value in fields.items() if value}
+
+
+def _media_request(
+    media: list[MediaFile],
+    caption_fields: dict[str, Any],
+) -> tuple[str, dict[str, Any]]:
+    """Метод Bot API и поля запроса для одного вложения или группы.
+
+    Файлы без `file_id` передаются как `attach://file<номер>`.
+    """
+    refs = [
+        item.file_id or f"attach://file{index}"
+        for index, item in enumerate(media)
+    ]
+    if len(media) == 1:
+        return _SEND_METHODS[media[0].kind], {
+            media[0].kind: refs[0],
+            **caption_fields,
+        }
+
+    group = [
+        {"type": item.kind, "media": ref}
+        for item, ref in zip(media, refs, strict=True)
+    ]
+    group[0] |= caption_fields
+    return "sendMediaGroup", {"media": dumps(group).decode()}
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+from infra.compression import message_codec
+from infra.metrics import metrics
+from infra.queue_keys import notification_key
+from schemas.notify_schema import queue_record_adapter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from redis.asyncio.client import Pipeline
+
+    from application.delivery_status_service import DeliveryStatusService
+    from application.suppression_service import SuppressionService
+    from infra.redis_client import RedisClient
+    from schemas.bot_schema import BotInfo
+    from schemas.notify_schema import NotifyIn
+
+
+class NotifyQueueService:
+    """Постановка уведомлений в очереди Redis.
+
+    Общий путь для всех способов приема: сообщение кладется в очередь
+    `notification:{target_id}:{bot_id}` вместе со статусом `queued`
+    в одном пайплайне. Уведомления в подавленные чаты (бот
+    заблокирован, чат удален) в очередь не ставятся.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        status_service: DeliveryStatusService,
+        suppression_service: SuppressionService,
+    ) -> None:
+        """Инициализирует сервис.
+
+        :param redis_client: Клиент Redis.
+        :param status_service: Сервис статусов доставки.
+        :param suppression_service: Сервис подавленных чатов.
+        """
+        self._redis = redis_client
+        self._status_service = status_service
+        self._suppression_service = suppression_service
+
+    async def enqueue(self, notify_in: NotifyIn, bot: BotInfo) -> str | None:
+        """Ставит в очередь одно уведомление.
+
+        :return: Id уведомления или None, если чат подавлен.
+        """
+        [message_id] = await self.enqueue_many([notify_in], bot)
+        return message_id
+
+    async def enqueue_many(
+        self,
+        items: Iterable[NotifyIn],
+        bot: BotInfo,
+    ) -> list[str | None]:
+        """Ставит в очередь пачку уведомлений одним пайплайном.
+
+        :return: Id уведомлений в порядке `items` (None для уведомлений\
+            в подавленные чаты).
+        """
+        items = list(items)
+        suppressed = await self._suppression_service.find(
+            bot.id,
+            (notify_in.target_id for notify_in in items),
+        )
+        pipeline = await self._redis.pipeline()
+        timestamp = datetime.now(UTC).timestamp()
+        ids = [
+            None
+            if notify_in.target_id in suppressed
+            else self._add(pipeline, notify_in, bot, timestamp)
+            for notify_in in items
+        ]
+        if rejected := ids.count(None):
+            metrics.incr("suppression.rejected", rejected)
+        if any(ids):
+            await pipeline.execute()
+        return ids
+
+    def _add(
+        self,
+        pipeline: Pipeline,
+        notify_in: NotifyIn,
+        bot: BotInfo,
+        timestamp: float,
+    ) -> str:
+        """Добавляет в пайплайн запись очереди и статус `queued`.
+
+        :return: Id уведомления.
+        """
+        message_id = uuid4().hex
+        record = notify_in.to_record(
+            message_id=message_id,
+            bot_id=bot.id,
+            timestamp=timestamp,
+        )
+        _compress(record)
+        pipeline.rpush(
+            notification_key(notify_in.target_id, bot.id),
+            queue_record_adapter.dump_json(record),
+        )
+        self._status_service.add_queued(
+            pipeline,
+            message_id,
+            bot.id,
+            timestamp,
+        )
+        return message_id
+
+
+def _compress(record: dict[str, Any]) -> None:
+    """Заменяет длинный текст записи очереди сжатым."""
+    if not record.get("message"):
+        return
+    packed = message_codec.compress(record["message"])
+    if packed is not None:
+        del record["message"]
+        record["message_zstd"] = packed
+        metrics.incr("compression.compressed")
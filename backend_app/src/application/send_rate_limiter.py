@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from typing import TYPE_CHECKING
+
+from redis.exceptions import RedisError
+
+from infra.metrics import metrics
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+    from infra.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+
+def rate_key(bot_id: str) -> str:
+    """Текущий темп отправки бота (сообщений в секунду)."""
+    return f"send_rate:{bot_id}"
+
+
+def pause_key(bot_id: str) -> str:
+    """Пауза после 429: существует, пока действует `retry_after`."""
+    return f"send_rate:{bot_id}:pause"
+
+
+def window_key(bot_id: str, second: int) -> str:
+    """Счетчик отправок бота за одну секунду."""
+    return f"send_rate:{bot_id}:{second}"
+
+
+class AdaptiveRateLimiter:
+    """Темп отправки бота, подбираемый по ответам Telegram (AIMD).
+
+    Каждая успешная отправка увеличивает темп аддитивно (примерно
+    на `increase` сообщений в секунду за секунду работы на полном
+    темпе), каждый ответ 429 уменьшает его в `decrease` раз и
+    приостанавливает отправку бота на `retry_after` секунд. Так темп
+    каждого бота сходится к его фактическому лимиту.
+
+    Состояние хранится в Redis и общее для всех воркеров: темп —
+    в `send_rate:{bot_id}`, отправки считаются по секундным окнам.
+    Одно уменьшение приходится на одну паузу, поэтому пачка 429
+    от параллельных запросов не обрушивает темп до минимума.
+
+    Приросты темпа копятся в памяти и складываются в Redis одним
+    пайплайном раз в `flush_interval` секунд: учет успешной отправки
+    не обращается к Redis. Запросы делает только `acquire` — чтение
+    темпа и паузы, а затем, если бот не на паузе, счетчик окна.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        redis_client: RedisClient,
+        *,
+        initial_rate: float,
+        min_rate: float,
+        max_rate: float,
+        increase: float,
+        decrease: float,
+        state_ttl: int,
+        flush_interval: float,
+    ) -> None:
+        """Инициализирует ограничитель.
+
+        :param redis_client: Клиент Redis с общим состоянием.
+        :param initial_rate: Темп бота без накопленной статистики.
+        :param min_rate: Нижняя граница темпа.
+        :param max_rate: Верхняя граница темпа.
+        :param increase: Аддитивный прирост темпа.
+        :param decrease: Множитель темпа при ответе 429.
+        :param state_ttl: Сколько хранить темп неактивного бота (секунды).
+        :param flush_interval: Период записи приростов темпа в секундах.
+        """
+        self._redis = redis_client
+        self._initial_rate = initial_rate
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+        self._increase = increase
+        self._decrease = decrease
+        self._state_ttl = state_ttl
+        self._flush_interval = flush_interval
+        self._rates: dict[str, float] = {}
+        self._increments: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """Запускает фоновую запись приростов темпа."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновую запись и записывает остаток приростов."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def acquire(self, bot_id: str) -> None:
+        """Ждет свободного места в темпе бота.
+
+        Место в секундном окне занимается, только когда бот не
+        на паузе: ожидание паузы не расходует темп после нее.
+        """
+        redis_con = await self._redis.get_client()
+        while True:
+            delay = await self._delay(redis_con, bot_id)
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+    async def _delay(self, redis_con: Redis, bot_id: str) -> float:
+        """Сколько ждать до следующей попытки (0 — место занято)."""
+        pipeline = redis_con.pipeline(transaction=False)
+        pipeline.get(rate_key(bot_id))
+        pipeline.pttl(pause_key(bot_id))
+        rate, pause_ms = await pipeline.execute()
+
+        if rate is None:
+            await redis_con.set(
+                rate_key(bot_id),
+                self._initial_rate,
+                ex=self._state_ttl,
+                nx=True,
+            )
+        rate = self._rates[bot_id] = float(rate or self._initial_rate)
+        if pause_ms > 0:
+            return pause_ms / 1000
+        return await self._take_slot(redis_con, bot_id, rate)
+
+    @staticmethod
+    async def _take_slot(redis_con: Redis, bot_id: str, rate: float) -> float:
+        """Занимает место в окне текущей секунды или ждет следующей."""
+        now = time.time()
+        second = int(now)
+        window = window_key(bot_id, second)
+        pipeline = redis_con.pipeline(transaction=False)
+        pipeline.incr(window)
+        pipeline.expire(window, 2)
+        sent, _ = await pipeline.execute()
+
+        if sent <= math.floor(rate):
+            return 0
+        metrics.incr("telegram.rate_limited")
+        return second + 1 - now
+
+    def on_success(self, bot_id: str) -> None:
+        """Копит аддитивный прирост темпа бота после успешной отправки."""
+        rate = self._rates.get(bot_id, self._initial_rate)
+        if rate >= self._max_rate:
+            return
+        self._increments[bot_id] = (
+            self._increments.get(bot_id, 0) + self._increase / rate
+        )
+
+    async def flush(self) -> None:
+        """Складывает накопленные приросты темпа в Redis."""
+        if not self._increments:
+            return
+
+        batch, self._increments = self._increments, {}
+        try:
+            rates = await self._add_increments(batch)
+            await self._store_rates(batch, rates)
+        except RedisError:
+            logger.exception("Не удалось записать темп %s ботов", len(batch))
+
+    async def on_throttled(self, bot_id: str, retry_after: float) -> None:
+        """Уменьшает темп бота и приостанавливает его отправки.
+
+        :param retry_after: Пауза из ответа Telegram (в секундах).
+        """
+        metrics.incr("telegram.throttled")
+        # Успехи до 429 не должны прибавиться к уже уменьшенному темпу.
+        self._increments.pop(bot_id, None)
+        redis_con = await self._redis.get_client()
+        paused = await redis_con.set(
+            pause_key(bot_id),
+            1,
+            px=max(int(retry_after * 1000), 1000),
+            nx=True,
+        )
+        if not paused:
+            return
+
+        rate = self._rates.get(bot_id, self._initial_rate)
+        rate = await self._update(
+            bot_id,
+            max(rate * self._decrease, self._min_rate),
+        )
+        metrics.gauge(f"telegram.rate.{bot_id}", rate)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+
+    async def _add_increments(self, batch: dict[str, float]) -> list[float]:
+        # Приросты складываются атомарно, чтобы одновременные успехи
+        # других воркеров не затирали уменьшение темпа после 429.
+        redis_con = await self._redis.get_client()
+        pipeline = redis_con.pipeline(transaction=False)
+        for bot_id, increment in batch.items():
+            pipeline.incrbyfloat(rate_key(bot_id), increment)
+            pipeline.expire(rate_key(bot_id), self._state_ttl)
+        results = await pipeline.execute()
+        return results[::2]
+
+    async def _store_rates(
+        self,
+        batch: dict[str, float],
+        rates: list[float],
+    ) -> None:
+        for bot_id, rate in zip(batch, rates, strict=True):
+            if not self._min_rate <= rate <= self._max_rate:
+                rate = await self._update(  # noqa: PLW2901
+                    bot_id,
+                    min(max(rate, self._initial_rate), self._max_rate),
+                )
+            self._rates[bot_id] = rate
+            metrics.gauge(f"telegram.rate.{bot_id}", rate)
+
+    async def _update(self, bot_id: str, rate: float) -> float:
+        redis_con = await self._redis.get_client()
+        await redis_con.set(rate_key(bot_id), rate, ex=self._state_ttl)
+        self._rates[bot_id] = rate
+        return rate
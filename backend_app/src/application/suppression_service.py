@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from infra.metrics import metrics
+from schemas.delivery_schema import DeliveryResult, DeliveryStatus
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from redis.asyncio.client import Pipeline
+
+    from infra.redis_client import RedisClient
+
+SUPPRESSED_ERROR = "Chat is suppressed"
+
+# Ошибки 400, после которых отправка в чат не пройдет и при повторе.
+# Остальные 400 (например, ошибки разметки) зависят от сообщения.
+_PERMANENT_BAD_REQUESTS = (
+    "chat not found",
+    "user not found",
+    "peer_id_invalid",
+    "group chat was upgraded",
+    "have no rights to send",
+)
+
+
+def suppressed_key(bot_id: str) -> str:
+    """Хэш `chat_id -> причина` с TTL на каждое поле (HEXPIRE)."""
+    return f"suppressed:{bot_id}"
+
+
+def is_permanent_failure(result: DeliveryResult) -> bool:
+    """Проверяет, что чат недоступен боту (заблокирован, удален и т. п.)."""
+    if result.status != DeliveryStatus.FAILED:
+        return False
+    if result.error_code == HTTPStatus.FORBIDDEN:
+        return True
+    error = (result.error or "").lower()
+    return result.error_code == HTTPStatus.BAD_REQUEST and any(
+        marker in error for marker in _PERMANENT_BAD_REQUESTS
+    )
+
+
+class SuppressionService:
+    """Подавление отправки в чаты, недоступные боту.
+
+    Sender добавляет пару (бот, чат) после ответа Telegram, который
+    не изменится при повторе (бот заблокирован, чат удален). Прием
+    уведомлений и RPS-насос проверяют пару одной командой Redis и не
+    ставят такие сообщения в очередь. Запись живет `ttl` секунд:
+    пользователь может разблокировать бота. Список и очистка
+    доступны в админке.
+    """
+
+    def __init__(self, redis_client: RedisClient, ttl: int) -> None:
+        """Инициализирует сервис.
+
+        :param redis_client: Клиент Redis.
+        :param ttl: Время жизни записи о чате в секундах.
+        """
+        self._redis = redis_client
+        self._ttl = ttl
+
+    async def suppress(self, bot_id: str, chat_id: int, reason: str) -> None:
+        """Запоминает, что чат недоступен боту."""
+        key = suppressed_key(bot_id)
+        pipeline = await self._redis.pipeline()
+        pipeline.hset(key, str(chat_id), reason)
+        pipeline.hexpire(key, self._ttl, str(chat_id))
+        await pipeline.execute()
+        metrics.incr("suppression.added")
+
+    async def find(self, bot_id: str, chat_ids: Iterable[int]) -> set[int]:
+        """Возвращает подавленные чаты бота из `chat_ids`."""
+        unique = list(set(chat_ids))
+        if not unique:
+            return set()
+        redis_con = await self._redis.get_client()
+        reasons = await redis_con.hmget(suppressed_key(bot_id), unique)
+        return {
+            chat_id
+            for chat_id, reason in zip(unique, reasons, strict=True)
+            if reason is not None
+        }
+
+    @staticmethod
+    def add_check(pipeline: Pipeline, bot_id: str, chat_id: str) -> None:
+        """Добавляет в пайплайн проверку чата (результат — bool)."""
+        pipeline.hexists(suppressed_key(bot_id), chat_id)
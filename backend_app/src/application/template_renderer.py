@@ -0,0 +1,165 @@
+import html
+import re
+from collections.abc import Callable
+from functools import partial
+from string import Template
+from uuid import UUID
+
+from infra.database.connections import read_connection
+from infra.database.models.message_template import MessageTemplate
+from infra.metrics import metrics
+from infra.ttl_cache import TTLCache
+from schemas.notify_schema import MessageParseMode, TemplateVariables
+
+# Символы, которые Telegram требует экранировать обратным слешем.
+_MARKDOWN_V2_SPECIAL = re.compile(r"([_*\[\]()~`>#+\-=|{}.!\\])")
+_MARKDOWN_SPECIAL = re.compile(r"([_*`\[])")
+
+_ESCAPERS: dict[MessageParseMode | None, Callable[[str], str]] = {
+    MessageParseMode.HTML: partial(html.escape, quote=False),
+    MessageParseMode.MARKDOWN_V2: partial(_MARKDOWN_V2_SPECIAL.sub, r"\\\1"),
+    MessageParseMode.MARKDOWN: partial(_MARKDOWN_SPECIAL.sub, r"\\\1"),
+}
+
+
+class TemplateError(Exception):
+    """Шаблон не найден или в нем не хватает переменных."""
+
+
+class CompiledTemplate:
+    """Шаблон, заранее разобранный на литералы и имена переменных.
+
+    Синтаксис — как у `string.Template`: `$name`, `${name}`, `$$`.
+    Рендеринг сводится к одному `join` без повторного разбора текста.
+    """
+
+    __slots__ = ("_literals", "_names", "bot_id", "format")
+
+    def __init__(
+        self,
+        bot_id: str,
+        text: str,
+        parse_mode: MessageParseMode | None,
+    ) -> None:
+        """Разбирает текст шаблона.
+
+        :param bot_id: Id бота-владельца шаблона.
+        :param text: Текст шаблона.
+        :param parse_mode: Формат шаблона по умолчанию.
+        """
+        self.bot_id = bot_id
+        self.format = parse_mode
+        self._literals: list[str] = []
+        self._names: list[str] = []
+
+        current: list[str] = []
+        position = 0
+        for match in Template.pattern.finditer(text):
+            current.append(text[position : match.start()])
+            position = match.end()
+            name = match["named"] or match["braced"]
+            if name is None:
+                # `$$` или одиночный `$` выводятся как `$`
+                current.append(Template.delimiter)
+                continue
+            self._literals.append("".join(current))
+            self._names.append(name)
+            current = []
+        current.append(text[position:])
+        self._literals.append("".join(current))
+
+    def render(
+        self,
+        variables: TemplateVariables | None,
+        parse_mode: MessageParseMode | None,
+    ) -> str:
+        """Подставляет переменные в шаблон.
+
+        :param variables: Значения переменных.
+        :param parse_mode: Итоговый формат сообщения; значения переменных\
+            экранируются по его правилам.
+        :return: Текст сообщения.
+        """
+        variables = variables or {}
+        missing = [name for name in self._names if name not in variables]
+        if missing:
+            msg = f"Missing template variables: {', '.join(missing)}"
+            raise TemplateError(msg)
+
+        escape = _ESCAPERS.get(parse_mode, str)
+        parts = [self._literals[0]]
+        for name, literal in zip(self._names, self._literals[1:], strict=True):
+            parts.extend((escape(str(variables[name])), literal))
+        return "".join(parts)
+
+
+class TemplateRenderer:
+    """Рендеринг шаблонов сообщений с LRU-кэшем разобранных шаблонов.
+
+    Шаблон читается из базы при первом использовании и живет в кэше
+    `ttl` секунд, поэтому правка шаблона в админке применяется
+    не позже чем через `ttl`.
+    """
+
+    def __init__(self, *, max_size: int, ttl: float) -> None:
+        """Инициализирует рендерер.
+
+        :param max_size: Максимальное число шаблонов в кэше.
+        :param ttl: Время жизни шаблона в кэше в секундах.
+        """
+        self._cache: TTLCache[str, CompiledTemplate] = TTLCache(
+            max_size=max_size,
+            ttl=ttl,
+        )
+
+    async def render(
+        self,
+        template_id: str,
+        bot_id: str,
+        variables: TemplateVariables | None,
+        parse_mode: MessageParseMode | None,
+    ) -> tuple[str, MessageParseMode | None]:
+        """Рендерит шаблон бота.
+
+        :param parse_mode: Формат из запроса; если не задан, берется\
+            формат шаблона.
+        :return: Текст сообщения и итоговый формат.
+        """
+        template = await self.get(template_id)
+        if template is None or template.bot_id != bot_id:
+            msg = "Template not found"
+            raise TemplateError(msg)
+
+        parse_mode = parse_mode or template.format
+        return template.render(variables, parse_mode), parse_mode
+
+    async def get(self, template_id: str) -> CompiledTemplate | None:
+        """Возвращает разобранный шаблон из кэша или из базы."""
+        template = self._cache.get(template_id)
+        if template is not None:
+            metrics.incr("templates.cache_hit")
+            return template
+
+        metrics.incr("templates.cache_miss")
+        template = await self._load(template_id)
+        if template is not None:
+            self._cache.set(template_id, template)
+        return template
+
+    async def _load(self, template_id: str) -> CompiledTemplate | None:
+        try:
+            UUID(template_id)
+        except ValueError:
+            return None
+
+        row = await MessageTemplate.get_or_none(
+            id=template_id,
+            using_db=read_connection(),
+        )
+        if row is None:
+            return None
+        return CompiledTemplate(
+            str(row.bot_id),
+            row.text,
+            MessageParseMode(row.format) if row.format else None,
+        )
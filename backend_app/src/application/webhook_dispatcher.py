@@ -0,0 +1,156 @@
+import asyncio
+import contextlib
+import logging
+from collections import defaultdict, deque
+from http import HTTPStatus
+
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from infra.metrics import metrics
+from infra.serialization import dumps
+from schemas.delivery_schema import DeliveryEvent
+
+logger = logging.getLogger(__name__)
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Повторяем ошибки соединения, 429 и 5xx."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return (
+            status == HTTPStatus.TOO_MANY_REQUESTS
+            or status >= HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+    return isinstance(error, httpx.TransportError)
+
+
+class WebhookDispatcher:
+    """Пакетная отправка результатов доставки на callback URL ботов.
+
+    `submit` только кладет событие в буфер получателя и никогда не ждет
+    сети. Буфер отправляется, когда в нем набирается `batch_size` событий
+    или раз в `flush_interval` секунд. При переполнении буфера
+    (`max_buffer`) отбрасываются самые старые события.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        client: httpx.AsyncClient,
+        *,
+        batch_size: int,
+        flush_interval: float,
+        max_attempts: int,
+        max_buffer: int,
+        max_concurrency: int,
+    ) -> None:
+        """Инициализирует диспетчер.
+
+        :param client: HTTP-клиент с пулом соединений.
+        :param batch_size: Максимальное число событий в одном запросе.
+        :param flush_interval: Максимальная задержка отправки в секундах.
+        :param max_attempts: Число попыток доставки пачки.
+        :param max_buffer: Максимальный размер буфера одного получателя.
+        :param max_concurrency: Максимум одновременных запросов.
+        """
+        self._client = client
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_attempts = max_attempts
+        self._buffers: defaultdict[str, deque[DeliveryEvent]] = defaultdict(
+            lambda: deque(maxlen=max_buffer),
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._sending: set[asyncio.Task] = set()
+        self._timer: asyncio.Task | None = None
+
+    def submit(self, url: str, event: DeliveryEvent) -> None:
+        """Добавляет событие в буфер получателя.
+
+        :param url: Callback URL бота.
+        :param event: Событие доставки.
+        """
+        buffer = self._buffers[url]
+        if len(buffer) == buffer.maxlen:
+            metrics.incr("webhook.dropped")
+        buffer.append(event)
+
+        if len(buffer) >= self._batch_size:
+            self._flush_url(url)
+
+    async def start(self) -> None:
+        """Запускает периодическую отправку буферов."""
+        self._timer = asyncio.create_task(self._run())
+
+    # Таймаут ограничивает только ожидание уже начатых отправок: остаток
+    # буферов должен быть отправлен в любом случае, поэтому не
+    # asyncio.timeout вокруг всего вызова.
+    async def stop(self, timeout: float) -> None:  # noqa: ASYNC109
+        """Отправляет остаток буферов и ждет завершения запросов.
+
+        :param timeout: Сколько ждать незавершенные отправки (в секундах).
+        """
+        if self._timer:
+            self._timer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._timer
+            self._timer = None
+
+        self.flush()
+        if self._sending:
+            await asyncio.wait(self._sending, timeout=timeout)
+
+    def flush(self) -> None:
+        """Запускает отправку всех непустых буферов."""
+        for url in list(self._buffers):
+            self._flush_url(url)
+
+    def _flush_url(self, url: str) -> None:
+        events = list(self._buffers.pop(url, ()))
+        for start in range(0, len(events), self._batch_size):
+            task = asyncio.create_task(
+                self._deliver(url, events[start : start + self._batch_size]),
+            )
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _deliver(self, url: str, events: list[DeliveryEvent]) -> None:
+        body = dumps({"events": [event.model_dump() for event in events]})
+        async with self._semaphore:
+            try:
+                await self._post(url, body)
+            except httpx.HTTPError as e:
+                metrics.incr("webhook.failed", len(events))
+                logger.warning(
+                    "Не удалось отправить webhook на %s: %s",
+                    url,
+                    e,
+                )
+            else:
+                metrics.incr("webhook.delivered", len(events))
+
+    async def _post(self, url: str, body: bytes) -> None:
+        """Отправляет пачку событий, повторяя попытки при сбоях."""
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(self._max_attempts),
+            wait=wait_exponential(multiplier=0.5, max=30),
+            retry=retry_if_exception(_is_retryable),
+            reraise=True,
+        ):
+            with attempt:
+                response = await self._client.post(
+                    url,
+                    content=body,
+                    headers={"Content-Type": "application/json"},
+                )
+                response.raise_for_status()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            self.flush()
@@ -0,0 +1,91 @@
+"""Сжатие текста уведомлений zstd на пути API -> Redis -> RabbitMQ -> sender.
+
+Текст длиннее порога кладется в поле `message_zstd` (zstd, base64)
+вместо `message`, остальные поля остаются открытым JSON: RPS-насосу
+не нужно ничего распаковывать. Распаковывает только sender.
+
+Словарь (`ZSTD_DICTIONARY_PATH`, обучается командой
+`main_train_zstd_dictionary.py`) заметно улучшает сжатие коротких
+типовых сообщений. Он должен быть одинаковым у API и sender; при
+замене словаря сообщения, сжатые старым, распаковать не получится,
+поэтому менять его стоит при пустых очередях.
+"""
+
+from __future__ import annotations
+
+import base64
+from typing import TYPE_CHECKING
+
+import zstandard
+
+from core.config import settings
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class MessageCodec:
+    def __init__(
+        self,
+        *,
+        threshold: int,
+        level: int,
+        dictionary: bytes | None = None,
+    ) -> None:
+        """Инициализирует кодек.
+
+        :param threshold: Минимальный размер текста (в байтах UTF-8)\
+            для сжатия; 0 — не сжимать.
+        :param level: Уровень сжатия zstd.
+        :param dictionary: Обученный словарь zstd.
+        """
+        self._threshold = threshold
+        dict_data = (
+            zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        )
+        self._compressor = zstandard.ZstdCompressor(
+            level=level,
+            dict_data=dict_data,
+        )
+        self._decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+
+    @classmethod
+    def from_path(
+        cls,
+        *,
+        threshold: int,
+        level: int,
+        dictionary_path: Path | None,
+    ) -> MessageCodec:
+        """Создает кодек, читая словарь из файла (если путь задан)."""
+        return cls(
+            threshold=threshold,
+            level=level,
+            dictionary=(
+                dictionary_path.read_bytes() if dictionary_path else None
+            ),
+        )
+
+    def compress(self, text: str) -> str | None:
+        """Сжимает текст, если он длиннее порога и сжатие выгодно.
+
+        :return: Сжатый текст в base64 или None (хранить как есть).
+        """
+        if not self._threshold:
+            return None
+        data = text.encode()
+        if len(data) < self._threshold:
+            return None
+        packed = base64.b64encode(self._compressor.compress(data))
+        return packed.decode() if len(packed) < len(data) else None
+
+    def decompress(self, packed: str) -> str:
+        """Распаковывает текст, сжатый `compress`."""
+        return self._decompressor.decompress(base64.b64decode(packed)).decode()
+
+
+message_codec = MessageCodec.from_path(
+    threshold=settings.message_compression_threshold,
+    level=settings.message_compression_level,
+    dictionary_path=settings.zstd_dictionary_path,
+)
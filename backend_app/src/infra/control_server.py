@@ -0,0 +1,330 @@
+"""HTTP-сервер управления воркерами (RPS-насос, sender).
+
+У воркеров нет своего HTTP API, поэтому служебные эндпоинты (профиль
+процесса, стеки задач, метрики, проверки `/health/live` и
+`/health/ready`) они отдают на отдельном порту `CONTROL_PORT`. Сервер
+намеренно минимальный (GET без тела, одно соединение — один запрос)
+и работает в event loop воркера, не запуская потоков.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import math
+import secrets
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
+from typing import TYPE_CHECKING, NamedTuple, get_args
+from urllib.parse import parse_qsl, urlsplit
+
+from core.config import settings
+from infra.metrics import metrics
+from infra.profiling import (
+    ProfileFormat,
+    ProfilerBusyError,
+    ProfilerUnavailableError,
+    dump_tasks,
+    profile,
+)
+from schemas.health_schema import HealthOut, HealthStatus
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from infra.health import HealthCheck
+
+logger = logging.getLogger(__name__)
+
+ADMIN_TOKEN_HEADER = "x-admin-token"  # noqa: S105
+_READ_TIMEOUT = 5
+_MAX_HEADERS = 100
+
+
+class ControlResponse(NamedTuple):
+    status: HTTPStatus
+    body: bytes = b""
+    content_type: str = "text/plain; charset=utf-8"
+    filename: str | None = None
+
+
+Handler = Callable[[dict[str, str]], Awaitable[ControlResponse]]
+
+
+class ControlServer:
+    """HTTP-сервер управления процессом.
+
+    Маршруты с `admin=True` требуют заголовок `X-Admin-Token`, равный
+    `ADMIN_TOKEN`; без заданного токена они недоступны.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        admin_token: str | None,
+    ) -> None:
+        """Инициализирует сервер.
+
+        :param host: Адрес для прослушивания.
+        :param port: Порт.
+        :param admin_token: Токен служебных маршрутов.
+        """
+        self._host = host
+        self._port = port
+        self._admin_token = admin_token
+        self._routes: dict[str, tuple[Handler, bool]] = {}
+        self._server: asyncio.Server | None = None
+
+    def add_route(self, path: str, handler: Handler, *, admin: bool) -> None:
+        """Регистрирует обработчик GET-запросов.
+
+        :param path: Путь запроса.
+        :param handler: Корутина, получающая параметры строки запроса.
+        :param admin: Требовать токен администратора.
+        """
+        self._routes[path] = (handler, admin)
+
+    async def start(self) -> None:
+        """Начинает принимать соединения."""
+        self._server = await asyncio.start_server(
+            self._handle,
+            self._host,
+            self._port,
+        )
+        logger.info("Control server on %s:%s", self._host, self._port)
+
+    async def stop(self) -> None:
+        """Перестает принимать соединения."""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        try:
+            try:
+                async with asyncio.timeout(_READ_TIMEOUT):
+                    method, target, headers = await _read_request(reader)
+            except (ValueError, TimeoutError, asyncio.IncompleteReadError):
+                response = ControlResponse(HTTPStatus.BAD_REQUEST)
+            else:
+                response = await self._respond(method, target, headers)
+
+            with contextlib.suppress(ConnectionError):
+                writer.write(_encode_response(response))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _respond(
+        self,
+        method: str,
+        target: str,
+        headers: dict[str, str],
+    ) -> ControlResponse:
+        try:
+            return await self._dispatch(method, target, headers)
+        except Exception:
+            logger.exception("Control request %s %s failed", method, target)
+            return ControlResponse(HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    async def _dispatch(
+        self,
+        method: str,
+        target: str,
+        headers: dict[str, str],
+    ) -> ControlResponse:
+        url = urlsplit(target)
+        route = self._routes.get(url.path)
+        if route is None:
+            return ControlResponse(HTTPStatus.NOT_FOUND)
+        handler, admin = route
+        if rejected := self._reject(method, headers, admin=admin):
+            return rejected
+        return await handler(dict(parse_qsl(url.query)))
+
+    def _reject(
+        self,
+        method: str,
+        headers: dict[str, str],
+        *,
+        admin: bool,
+    ) -> ControlResponse | None:
+        if method != "GET":
+            return ControlResponse(HTTPStatus.METHOD_NOT_ALLOWED)
+        if admin and not self._is_admin(headers.get(ADMIN_TOKEN_HEADER)):
+            return ControlResponse(HTTPStatus.UNAUTHORIZED)
+        return None
+
+    def _is_admin(self, token: str | None) -> bool:
+        return bool(
+            self._admin_token
+            and token
+            and secrets.compare_digest(token, self._admin_token),
+        )
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> tuple[str, str, dict[str, str]]:
+    request_line = (await reader.readline()).decode("latin-1")
+    method, target, _ = request_line.split(" ", 2)
+    headers: dict[str, str] = {}
+    for _ in range(_MAX_HEADERS):
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, value = line.split(":", 1)
+        headers[name.strip().lower()] = value.strip()
+    return method, target, headers
+
+
+def _encode_response(response: ControlResponse) -> bytes:
+    status = response.status
+    head = [
+        f"HTTP/1.1 {status.value} {status.phrase}",
+        f"Content-Type: {response.content_type}",
+        f"Content-Length: {len(response.body)}",
+        "Connection: close",
+    ]
+    if response.filename:
+        head.append(
+            f'Content-Disposition: attachment; filename="{response.filename}"',
+        )
+    return "\r\n".join([*head, "", ""]).encode("latin-1") + response.body
+
+
+async def _profile_route(query: dict[str, str]) -> ControlResponse:
+    try:
+        seconds, output = _profile_query(query)
+    except ValueError as e:
+        return ControlResponse(HTTPStatus.BAD_REQUEST, str(e).encode())
+    return await _profile_response(seconds, output)
+
+
+def _profile_query(query: dict[str, str]) -> tuple[float, ProfileFormat]:
+    """Разбирает параметры профилирования.
+
+    :raises ValueError: Недопустимая длительность или формат.
+    """
+    seconds = _to_float(query.get("seconds", "10"))
+    if not 0 < seconds <= settings.profile_max_seconds:
+        msg = "Invalid seconds"
+        raise ValueError(msg)
+    output = query.get("format", "html")
+    if output not in get_args(ProfileFormat):
+        msg = "Invalid format"
+        raise ValueError(msg)
+    return seconds, output
+
+
+def _to_float(value: str) -> float:
+    """Число из строки; нечисловое значение — NaN (не проходит сравнения)."""
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
+
+
+async def _profile_response(
+    seconds: float,
+    output: ProfileFormat,
+) -> ControlResponse:
+    try:
+        report = await profile(seconds, output, settings.profile_interval)
+    except ProfilerBusyError:
+        return ControlResponse(HTTPStatus.CONFLICT, b"Profiling in progress")
+    except ProfilerUnavailableError as e:
+        return ControlResponse(HTTPStatus.NOT_IMPLEMENTED, str(e).encode())
+    return ControlResponse(
+        HTTPStatus.OK,
+        report.content,
+        report.media_type,
+        report.filename,
+    )
+
+
+async def _tasks_route(_query: dict[str, str]) -> ControlResponse:
+    return ControlResponse(HTTPStatus.OK, dump_tasks().encode())
+
+
+async def _metrics_route(_query: dict[str, str]) -> ControlResponse:
+    return ControlResponse(
+        HTTPStatus.OK,
+        metrics.exposition().encode(),
+        "text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+def _health_response(
+    status: HTTPStatus,
+    content: HealthOut,
+) -> ControlResponse:
+    return ControlResponse(
+        status,
+        content.model_dump_json().encode(),
+        "application/json",
+    )
+
+
+async def _live_route(_query: dict[str, str]) -> ControlResponse:
+    return _health_response(HTTPStatus.OK, HealthOut(status=HealthStatus.OK))
+
+
+def _ready_route(health: HealthCheck) -> Handler:
+    async def handler(_query: dict[str, str]) -> ControlResponse:
+        report = await health.check()
+        if report.ready:
+            return _health_response(
+                HTTPStatus.OK,
+                HealthOut(status=HealthStatus.OK, checks=report.checks),
+            )
+        return _health_response(
+            HTTPStatus.SERVICE_UNAVAILABLE,
+            HealthOut(status=HealthStatus.UNAVAILABLE, checks=report.checks),
+        )
+
+    return handler
+
+
+@contextlib.asynccontextmanager
+async def serve_control(
+    port: int | None,
+    health: HealthCheck | None = None,
+) -> AsyncIterator[None]:
+    """Держит сервер управления запущенным на время контекста.
+
+    :param port: Порт сервера; None — сервер не запускается.
+    :param health: Проверка готовности для `/health/ready`; без нее\
+        готовность равна живости.
+    """
+    if port is None:
+        yield
+        return
+
+    server = ControlServer(
+        settings.control_host,
+        port,
+        admin_token=settings.admin_token,
+    )
+    server.add_route("/debug/profile", _profile_route, admin=True)
+    server.add_route("/debug/tasks", _tasks_route, admin=True)
+    server.add_route("/metrics", _metrics_route, admin=False)
+    server.add_route("/health/live", _live_route, admin=False)
+    server.add_route(
+        "/health/ready",
+        _ready_route(health) if health else _live_route,
+        admin=False,
+    )
+    await server.start()
+    try:
+        yield
+    finally:
+        await server.stop()
@@ -0,0 +1,17 @@
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from core.config import settings
+
+REPLICA_CONNECTION = "replica"
+
+
+def read_connection() -> BaseDBAsyncClient:
+    """Соединение для чтения: реплика, если она настроена, иначе основная база.
+
+    Используется для горячих чтений, которым допустимо небольшое
+    отставание реплики (проверка API-ключей, загрузка реестра ботов).
+    """
+    if settings.DB_REPLICA_HOST:
+        return connections.get(REPLICA_CONNECTION)
+    return connections.get("default")
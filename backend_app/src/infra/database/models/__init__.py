@@ -1,5 +1,7 @@
 from .api_key import APIKey
+from .attachment import Attachment
 from .bot import Bot
+from .message_template import MessageTemplate
 from .user import User
 
-__all__ = ["APIKey", "Bot", "User"]
+__all__ = ["APIKey", "Attachment", "Bot", "MessageTemplate", "User"]
@@ -0,0 +1,25 @@
+import uuid
+from typing import TYPE_CHECKING
+
+from tortoise import fields
+from tortoise.models import Model
+
+if TYPE_CHECKING:
+  from infra.database.models.bot import Bot
+
+
+class Attachment(Model):
+  id = fields.UUIDField(primary_key=True, default=uuid.uuid4)
+  bot: fields.ForeignKeyRelation["Bot"] = fields.ForeignKeyField(
+      "models.Bot",
+      on_delete=fields.CASCADE,
+      related_name="attachments",
+  )
+  name = fields.CharField(max_length=255)
+  kind = fields.CharField(max_length=16)
+  file = fields.CharField(max_length=100)
+  sha256 = fields.CharField(max_length=64)
+  created_at = fields.DatetimeField()
+
+  class Meta:
+    table = "attachment"
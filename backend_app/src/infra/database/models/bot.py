@@ -13,6 +13,7 @@ class Bot(Model):
   id = fields.UUIDField(primary_key=True, default=uuid.uuid4)
   name = fields.CharField(max_length=255)
   token = fields.CharField(max_length=255)
+  callback_url = fields.CharField(max_length=200, default="")
   owner: fields.ForeignKeyRelation["User"] = fields.ForeignKeyField(
       "models.User",
       on_delete=fields.CASCADE,
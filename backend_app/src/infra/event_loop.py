@@ -0,0 +1,20 @@
+import asyncio
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+from core.config import settings
+
+T = TypeVar("T")
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """Запускает корутину в event loop, выбранном настройкой `EVENT_LOOP`.
+
+    :param main: Корутина точки входа процесса.
+    :return: Результат корутины.
+    """
+    if settings.event_loop == "uvloop":
+        import uvloop
+
+        return uvloop.run(main)
+    return asyncio.run(main)
@@ -0,0 +1,136 @@
+"""Проверки живости и готовности процесса (`/health/live`, `/health/ready`).
+
+Готовность — это доступность зависимостей процесса (Redis, Postgres,
+RabbitMQ). Проверки выполняются параллельно, каждая ограничена
+таймаутом, а результат кешируется на `cache_ttl` секунд: частые запросы
+оркестратора и балансировщика не нагружают зависимости, а одновременные
+запросы ждут одну и ту же проверку.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, NamedTuple
+
+from tortoise import connections
+
+if TYPE_CHECKING:
+    from faststream.broker.core.usecase import BrokerUsecase
+
+    from infra.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+HEALTH_OK = "ok"
+
+Probe = Callable[[], Awaitable[object]]
+
+
+class HealthReport(NamedTuple):
+    # Имя зависимости -> "ok" или описание ошибки.
+    checks: dict[str, str]
+
+    @property
+    def ready(self) -> bool:
+        """Все зависимости доступны."""
+        return all(result == HEALTH_OK for result in self.checks.values())
+
+
+class BrokerUnavailableError(ConnectionError):
+    """Нет подключения к брокеру сообщений."""
+
+
+class HealthCheck:
+    def __init__(self, *, timeout: float, cache_ttl: float) -> None:
+        """Инициализирует проверку готовности.
+
+        :param timeout: Таймаут одной проверки в секундах.
+        :param cache_ttl: Время кеширования результата в секундах.
+        """
+        self._timeout = timeout
+        self._cache_ttl = cache_ttl
+        self._probes: dict[str, Probe] = {}
+        self._report: HealthReport | None = None
+        self._checked_at = 0.0
+        self._pending: asyncio.Task[HealthReport] | None = None
+
+    def add_probe(self, name: str, probe: Probe) -> None:
+        """Добавляет проверку зависимости.
+
+        :param name: Имя зависимости в отчете.
+        :param probe: Корутина, бросающая исключение, если зависимость\
+            недоступна.
+        """
+        self._probes[name] = probe
+
+    async def check(self) -> HealthReport:
+        """Возвращает результат проверки (из кеша, если он свежий)."""
+        if (
+            self._report is not None
+            and time.monotonic() - self._checked_at < self._cache_ttl
+        ):
+            return self._report
+        if self._pending is None:
+            self._pending = asyncio.create_task(self._run())
+        # shield: отмена одного запроса не прерывает общую проверку.
+        return await asyncio.shield(self._pending)
+
+    async def _run(self) -> HealthReport:
+        try:
+            results = await asyncio.gather(
+                *(
+                    self._probe(name, probe)
+                    for name, probe in self._probes.items()
+                ),
+            )
+            report = HealthReport(dict(results))
+            if not report.ready and (
+                self._report is None or self._report.ready
+            ):
+                logger.warning("Process is not ready: %s", report.checks)
+            self._report, self._checked_at = report, time.monotonic()
+            return report
+        finally:
+            self._pending = None
+
+    async def _probe(self, name: str, probe: Probe) -> tuple[str, str]:
+        try:
+            async with asyncio.timeout(self._timeout):
+                await probe()
+        except TimeoutError:
+            return name, f"timeout after {self._timeout} s"
+        except Exception as e:  # noqa: BLE001
+            error = type(e).__name__
+            return name, f"{error}: {e}" if str(e) else error
+        return name, HEALTH_OK
+
+
+def redis_probe(get_redis: Callable[[], Awaitable[RedisClient]]) -> Probe:
+    """Проверка Redis командой PING.
+
+    :param get_redis: Корутина, возвращающая клиент Redis.
+    """
+
+    async def probe() -> None:
+        await (await get_redis()).ping()
+
+    return probe
+
+
+async def database_probe() -> None:
+    """Проверка основной базы Postgres запросом `SELECT 1`."""
+    await connections.get("default").execute_query("SELECT 1")
+
+
+def broker_probe(broker: BrokerUsecase) -> Probe:
+    """Проверка подключения к брокеру сообщений."""
+
+    async def probe() -> None:
+        # Флаг состояния подключения проверяется сразу, без ожидания.
+        if not await broker.ping(timeout=0):
+            raise BrokerUnavailableError
+
+    return probe
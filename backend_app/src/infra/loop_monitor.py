@@ -0,0 +1,254 @@
+"""Наблюдение за event loop: задержка, блокировки и время задач.
+
+Вся работа процесса идет в одном event loop, поэтому любой блокирующий
+вызов задерживает все остальные задачи. Монитор:
+
+- раз в `interval` секунд ставит в loop проверочный колбэк из отдельного
+  потока и измеряет, через сколько он выполнится (`loop.lag_ms`);
+- если колбэк не выполнился за `slow_threshold`, снимает стек потока
+  event loop и пишет его в лог — видно, чем именно занят loop;
+- с `task_timing` замеряет каждый шаг (от `await` до `await`) каждой
+  задачи и суммирует время по типу корутины
+  (`loop.busy_seconds.<корутина>`), а слишком долгие шаги пишет в лог.
+  Обертка добавляет работу каждой задаче, поэтому по умолчанию замер
+  выключен (`LOOP_TASK_TIMING`) и включается на время расследования.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Coroutine, Generator
+from typing import TYPE_CHECKING, Any
+
+from core.config import settings
+from infra.metrics import metrics
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from types import FrameType
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        *,
+        interval: float,
+        slow_threshold: float,
+        task_timing: bool,
+    ) -> None:
+        """Инициализирует монитор.
+
+        :param interval: Период измерения задержки в секундах.
+        :param slow_threshold: Порог блокировки loop и долгого шага\
+            задачи в секундах.
+        :param task_timing: Замерять время шагов задач.
+        """
+        self._interval = interval
+        self._slow_threshold = slow_threshold
+        self._task_timing = task_timing
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id = 0
+        self._previous_factory: Any = None
+        self._stopping = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+    async def start(self) -> None:
+        """Запускает поток наблюдения за текущим event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        if self._task_timing:
+            self._previous_factory = self._loop.get_task_factory()
+            self._loop.set_task_factory(self._create_task)
+        self._stopping.clear()
+        self._watchdog = threading.Thread(
+            target=self._watch,
+            name="loop-watchdog",
+            daemon=True,
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Останавливает наблюдение."""
+        self._stopping.set()
+        if self._watchdog:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+        if self._loop and self._task_timing:
+            self._loop.set_task_factory(self._previous_factory)
+        self._loop = None
+
+    def _watch(self) -> None:
+        while not self._stopping.wait(self._interval):
+            if not self._probe():
+                return
+
+    def _probe(self) -> bool:
+        pong = threading.Event()
+        sent = time.perf_counter()
+        try:
+            self._loop.call_soon_threadsafe(self._pong, pong, sent)
+        except RuntimeError:
+            # Event loop уже закрыт.
+            return False
+        if pong.wait(self._slow_threshold):
+            return True
+
+        self._report_blocked()
+        # Ждем освобождения loop, чтобы не снимать стек той же блокировки.
+        return self._wait_unblocked(pong)
+
+    def _wait_unblocked(self, pong: threading.Event) -> bool:
+        while not pong.wait(self._interval):
+            if self._stopping.is_set():
+                return False
+        return True
+
+    def _pong(self, pong: threading.Event, sent: float) -> None:
+        lag = time.perf_counter() - sent
+        pong.set()
+        metrics.gauge("loop.lag_ms", lag * 1000)
+        metrics.incr("loop.lag_seconds", lag)
+        metrics.incr("loop.lag_samples")
+        if lag >= self._slow_threshold:
+            metrics.incr("loop.blocked")
+            logger.warning("Event loop был заблокирован %.0f мс", lag * 1000)
+
+    def _report_blocked(self) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)  # noqa: SLF001
+        logger.warning(
+            "Event loop заблокирован дольше %.0f мс, стек:\n%s",
+            self._slow_threshold * 1000,
+            _format_stack(frame),
+        )
+
+    def _create_task(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        coro: Coroutine,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> asyncio.Future:
+        timed = TimedCoroutine(coro, self._slow_threshold)
+        if self._previous_factory is not None:
+            return self._previous_factory(loop, timed, **kwargs)
+        return asyncio.Task(timed, loop=loop, **kwargs)
+
+
+class TimedCoroutine(Coroutine):
+    """Обертка корутины задачи, замеряющая каждый ее шаг.
+
+    Задача выполняет корутину шагами (`send`/`throw`) между точками
+    `await`; пока идет шаг, остальные задачи ждут. Время шагов
+    суммируется по `__qualname__` корутины.
+    """
+
+    __slots__ = (
+        "_busy_key",
+        "_coro",
+        "_name",
+        "_slow_threshold",
+        "_steps_key",
+    )
+
+    def __init__(self, coro: Coroutine, slow_threshold: float) -> None:
+        """Оборачивает корутину.
+
+        :param coro: Корутина задачи.
+        :param slow_threshold: Порог долгого шага в секундах.
+        """
+        self._coro = coro
+        self._slow_threshold = slow_threshold
+        self._name = getattr(coro, "__qualname__", type(coro).__qualname__)
+        self._busy_key = f"loop.busy_seconds.{self._name}"
+        self._steps_key = f"loop.steps.{self._name}"
+
+    def send(self, value: Any) -> Any:  # noqa: ANN401
+        """Выполняет шаг корутины."""
+        started = time.perf_counter()
+        try:
+            return self._coro.send(value)
+        finally:
+            self._observe(time.perf_counter() - started)
+
+    def throw(self, *args: Any) -> Any:  # noqa: ANN401
+        """Выполняет шаг корутины, бросая в нее исключение."""
+        started = time.perf_counter()
+        try:
+            return self._coro.throw(*args)
+        finally:
+            self._observe(time.perf_counter() - started)
+
+    def close(self) -> None:
+        """Закрывает корутину."""
+        self._coro.close()
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        """Делегирует ожидание исходной корутине."""
+        return self._coro.__await__()
+
+    @property
+    def __name__(self) -> str:
+        """Имя исходной корутины."""
+        return self._name
+
+    @property
+    def cr_frame(self) -> FrameType | None:
+        """Кадр исходной корутины (для `Task.print_stack`, `dump_tasks`)."""
+        return getattr(self._coro, "cr_frame", None)
+
+    @property
+    def cr_await(self) -> Any:  # noqa: ANN401
+        """Объект, который ожидает исходная корутина."""
+        return getattr(self._coro, "cr_await", None)
+
+    @property
+    def cr_running(self) -> bool:
+        """Выполняется ли исходная корутина."""
+        return getattr(self._coro, "cr_running", False)
+
+    def _observe(self, elapsed: float) -> None:
+        metrics.incr(self._busy_key, elapsed)
+        metrics.incr(self._steps_key)
+        if elapsed >= self._slow_threshold:
+            metrics.incr("loop.slow_steps")
+            logger.warning(
+                "Долгий шаг задачи %s: %.0f мс",
+                self._name,
+                elapsed * 1000,
+            )
+
+
+def _format_stack(frame: FrameType | None) -> str:
+    if frame is None:
+        return "<нет данных>"
+    return "".join(traceback.format_stack(frame))
+
+
+@contextlib.asynccontextmanager
+async def monitor_loop() -> AsyncIterator[None]:
+    """Наблюдает за текущим event loop на время контекста.
+
+    Параметры берутся из настроек `LOOP_*`; с `LOOP_MONITOR_ENABLED=false`
+    ничего не делает.
+    """
+    if not settings.loop_monitor_enabled:
+        yield
+        return
+
+    monitor = LoopMonitor(
+        interval=settings.loop_lag_interval,
+        slow_threshold=settings.loop_slow_threshold,
+        task_timing=settings.loop_task_timing,
+    )
+    await monitor.start()
+    try:
+        yield
+    finally:
+        await monitor.stop()
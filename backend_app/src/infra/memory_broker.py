@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import zlib
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Self
+
+from core.config import settings
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from faststream.rabbit import RabbitExchange
+
+logger = logging.getLogger(__name__)
+
+Message = str | bytes
+Handler = Callable[[Message], Awaitable[None]]
+
+
+class MemoryBroker:
+    """Брокер сообщений в памяти процесса для встроенного режима.
+
+    Повторяет используемую RPS-насосом часть интерфейса `RabbitBroker`
+    (`publish` в очередь или exchange и `async with broker`). Очереди —
+    ограниченные `asyncio.Queue`: когда обработчики не успевают,
+    `publish` ждет, а сообщения остаются в Redis. Публикация
+    в exchange выбирает привязанную очередь по хэшу ключа
+    маршрутизации, как `x-consistent-hash` в RabbitMQ.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Инициализирует брокер.
+
+        :param maxsize: Максимальный размер каждой очереди.
+        """
+        self._maxsize = maxsize
+        self._queues: dict[str, asyncio.Queue[Message]] = {}
+        self._subscribers: list[tuple[str, Handler, int]] = []
+        self._bindings: defaultdict[str, list[str]] = defaultdict(list)
+        self._consumers: list[asyncio.Task] = []
+        # Сообщения в обработке по порядку их получения.
+        self._processing: dict[int, Message] = {}
+        self._sequence = itertools.count()
+
+    async def __aenter__(self) -> Self:
+        """Брокер уже готов к публикации."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Жизненным циклом управляют `start` и `close`."""
+
+    async def publish(
+        self,
+        message: Message,
+        queue: str = "",
+        exchange: RabbitExchange | None = None,
+        *,
+        routing_key: str = "",
+    ) -> None:
+        """Кладет сообщение в очередь, ожидая свободного места.
+
+        :param queue: Имя очереди (если не задан `exchange`).
+        :param exchange: Exchange, очередь выбирается среди привязанных\
+            к нему по хэшу `routing_key`.
+        """
+        if exchange is not None:
+            queues = self._bindings[exchange.name]
+            queue = queues[zlib.crc32(routing_key.encode()) % len(queues)]
+        await self._queue(queue).put(message)
+
+    def bind(self, exchange: RabbitExchange, queue: str) -> None:
+        """Привязывает очередь к exchange."""
+        self._bindings[exchange.name].append(queue)
+
+    def subscriber(
+        self,
+        queue: str,
+        handler: Handler,
+        concurrency: int,
+    ) -> None:
+        """Регистрирует обработчик очереди.
+
+        :param queue: Имя очереди.
+        :param handler: Корутина, принимающая тело сообщения.
+        :param concurrency: Число одновременно обрабатываемых сообщений.
+        """
+        self._subscribers.append((queue, handler, concurrency))
+
+    async def start(self) -> None:
+        """Запускает обработчики зарегистрированных очередей."""
+        for queue, handler, concurrency in self._subscribers:
+            self._consumers.extend(
+                asyncio.create_task(self._consume(self._queue(queue), handler))
+                for _ in range(concurrency)
+            )
+
+    async def join(self) -> None:
+        """Дожидается обработки всех сообщений очередей.
+
+        Ожидание ограничивается снаружи (`asyncio.timeout`), после чего
+        брокер закрывается `close`.
+        """
+        for queue in self._queues.values():
+            await queue.join()
+
+    async def close(self) -> list[Message]:
+        """Останавливает обработчики.
+
+        :return: Сообщения, которые не успели обработать (их нужно\
+            вернуть в Redis).
+        """
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+
+        # Прерванные сообщения идут первыми: они старше оставшихся в очереди.
+        undelivered = list(self._processing.values())
+        self._processing.clear()
+        undelivered.extend(self._take_queued())
+        return undelivered
+
+    def _take_queued(self) -> list[Message]:
+        queued = []
+        for queue in self._queues.values():
+            while not queue.empty():
+                queued.append(queue.get_nowait())
+                queue.task_done()
+        return queued
+
+    def _queue(self, name: str) -> asyncio.Queue[Message]:
+        if name not in self._queues:
+            self._queues[name] = asyncio.Queue(self._maxsize)
+        return self._queues[name]
+
+    async def _consume(
+        self,
+        queue: asyncio.Queue[Message],
+        handler: Handler,
+    ) -> None:
+        while True:
+            message = await queue.get()
+            number = next(self._sequence)
+            self._processing[number] = message
+            try:
+                await handler(message)
+            except Exception:
+                logger.exception("Ошибка обработки сообщения")
+            # При отмене сообщение остается в _processing и вернется
+            # из close() как недоставленное.
+            del self._processing[number]
+            queue.task_done()
+
+
+memory_broker = MemoryBroker(settings.embedded_queue_size)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+
+# Символы, недопустимые в именах метрик Prometheus.
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+class Metrics:
+    """Простой реестр счетчиков и текущих значений (gauge) процесса."""
+
+    def __init__(self) -> None:
+        """Инициализирует пустой реестр счетчиков."""
+        self._counters: defaultdict[str, float] = defaultdict(float)
+        self._gauges: dict[str, float] = {}
+
+    def incr(self, name: str, amount: float = 1) -> None:
+        """Увеличивает счетчик на указанное значение.
+
+        :param name: Имя счетчика.
+        :param amount: Величина приращения (по умолчанию 1).
+        """
+        self._counters[name] += amount
+
+    def gauge(self, name: str, value: float) -> None:
+        """Запоминает текущее значение показателя.
+
+        :param name: Имя показателя.
+        :param value: Значение (заменяет предыдущее).
+        """
+        self._gauges[name] = value
+
+    def snapshot(self) -> dict[str, float]:
+        """Возвращает копию текущих значений счетчиков."""
+        return dict(self._counters)
+
+    def gauges(self) -> dict[str, float]:
+        """Возвращает копию текущих значений показателей."""
+        return dict(self._gauges)
+
+    def exposition(self) -> str:
+        """Возвращает счетчики и показатели в текстовом формате Prometheus.
+
+        Точки и прочие недопустимые символы имен заменяются на `_`.
+        """
+        lines = []
+        for kind, values in (
+            ("counter", self._counters),
+            ("gauge", self._gauges),
+        ):
+            for name, value in sorted(values.items()):
+                metric = _INVALID_NAME_CHARS.sub("_", name)
+                lines.append(f"# TYPE {metric} {kind}")
+                lines.append(f"{metric} {value}")
+        return "\n".join([*lines, ""])
+
+    @staticmethod
+    def merge(*snapshots: dict[str, float]) -> dict[str, float]:
+        """Суммирует несколько снимков счетчиков в один.
+
+        :param snapshots: Снимки счетчиков (например, от разных процессов).
+        :return: Агрегированный снимок.
+        """
+        result: defaultdict[str, float] = defaultdict(float)
+        for snapshot in snapshots:
+            for name, value in snapshot.items():
+                result[name] += value
+        return dict(result)
+
+
+metrics = Metrics()
@@ -0,0 +1,68 @@
+from collections.abc import AsyncIterable, AsyncIterator
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes],
+    max_line_size: int,
+) -> AsyncIterator[bytes | None]:
+    """Разбивает поток байтов на строки NDJSON, не накапливая весь поток.
+
+    В памяти держится не больше одной строки. Строки длиннее
+    `max_line_size` байт пропускаются целиком, вместо них
+    возвращается `None`.
+
+    :param chunks: Поток фрагментов тела запроса.
+    :param max_line_size: Максимальная длина строки в байтах.
+    :return: Строки без символа перевода строки или `None`.
+    """
+    async for lines in _line_batches(chunks, max_line_size):
+        for line in lines:
+            yield line
+
+
+async def _line_batches(
+    chunks: AsyncIterable[bytes],
+    max_line_size: int,
+) -> AsyncIterator[list[bytes | None]]:
+    """Строки, завершенные в каждом фрагменте, и остаток в конце потока."""
+    buffer = _LineBuffer(max_line_size)
+    async for chunk in chunks:
+        yield buffer.feed(chunk)
+    yield buffer.close()
+
+
+class _LineBuffer:
+    """Незавершенная строка потока с ограничением длины."""
+
+    def __init__(self, max_line_size: int) -> None:
+        self._max_line_size = max_line_size
+        self._buffer = bytearray()
+        self._too_long = False
+
+    def feed(self, chunk: bytes) -> list[bytes | None]:
+        """Возвращает строки, завершенные во фрагменте, и копит остаток."""
+        lines = []
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            self._append(chunk[start:end])
+            lines.append(self._take())
+            start = end + 1
+        self._append(chunk[start:])
+        return lines
+
+    def close(self) -> list[bytes | None]:
+        """Возвращает последнюю строку потока без перевода строки."""
+        return [self._take()] if self._too_long or self._buffer else []
+
+    def _append(self, part: bytes) -> None:
+        if not self._too_long:
+            self._buffer += part
+            self._too_long = len(self._buffer) > self._max_line_size
+        if self._too_long:
+            self._buffer.clear()
+
+    def _take(self) -> bytes | None:
+        line = None if self._too_long else bytes(self._buffer)
+        self._buffer.clear()
+        self._too_long = False
+        return line
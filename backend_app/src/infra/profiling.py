@@ -0,0 +1,107 @@
+"""Профилирование процесса по запросу и дамп задач asyncio.
+
+Профилировщик (pyinstrument) импортируется и запускается только на время
+запроса: в остальное время он не влияет на работу процесса. Он снимает
+стеки потока event loop с заданным интервалом, поэтому в отчет попадает
+вся работа процесса, а не только вызвавшая его задача.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+from functools import partial
+from typing import TYPE_CHECKING, Literal, NamedTuple
+
+if TYPE_CHECKING:
+    from pyinstrument import Profiler
+
+ProfileFormat = Literal["html", "speedscope", "pstats", "text"]
+
+_profile_lock = asyncio.Lock()
+
+# Тип содержимого и имя файла отчета каждого формата.
+_REPORT_FILES: dict[str, tuple[str, str]] = {
+    "html": ("text/html", "profile.html"),
+    "speedscope": ("application/json", "profile.json"),
+    "pstats": ("application/octet-stream", "profile.pstats"),
+    "text": ("text/plain", "profile.txt"),
+}
+
+
+class ProfilerUnavailableError(RuntimeError):
+    """Pyinstrument не установлен."""
+
+
+class ProfilerBusyError(RuntimeError):
+    """Профилирование уже идет."""
+
+
+class ProfileReport(NamedTuple):
+    content: bytes
+    media_type: str
+    filename: str
+
+
+async def profile(
+    seconds: float,
+    output: ProfileFormat,
+    interval: float,
+) -> ProfileReport:
+    """Профилирует процесс `seconds` секунд.
+
+    :param seconds: Длительность профилирования.
+    :param output: Формат отчета: html (интерактивный отчет),\
+        speedscope (flamegraph для speedscope.app), pstats (файл для\
+        `pstats`/snakeviz) или text.
+    :param interval: Интервал снятия стеков в секундах.
+    :raises ProfilerUnavailableError: Pyinstrument не установлен.
+    :raises ProfilerBusyError: Профилирование уже идет.
+    """
+    try:
+        from pyinstrument import Profiler
+    except ImportError as e:
+        raise ProfilerUnavailableError(str(e)) from e
+    if _profile_lock.locked():
+        raise ProfilerBusyError
+
+    async with _profile_lock:
+        # async_mode="disabled": стеки всего потока, не только этой задачи.
+        profiler = Profiler(interval=interval, async_mode="disabled")
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.stop()
+    # Отчет по длинной сессии строится заметное время — не в event loop.
+    return await asyncio.to_thread(_render, profiler, output)
+
+
+def _render(profiler: Profiler, output: ProfileFormat) -> ProfileReport:
+    from pyinstrument import renderers
+
+    renderer = {
+        "html": renderers.HTMLRenderer,
+        "speedscope": renderers.SpeedscopeRenderer,
+        "pstats": renderers.PstatsRenderer,
+        "text": partial(
+            renderers.ConsoleRenderer,
+            unicode=True,
+            show_all=False,
+        ),
+    }[output]()
+    # Отчет pstats — двоичные данные, переданные в str через
+    # surrogateescape; текстовым отчетам это кодирование не мешает.
+    content = profiler.output(renderer).encode(errors="surrogateescape")
+    return ProfileReport(content, *_REPORT_FILES[output])
+
+
+def dump_tasks() -> str:
+    """Возвращает стеки всех задач asyncio текущего event loop."""
+    tasks = sorted(asyncio.all_tasks(), key=lambda task: task.get_name())
+    buffer = io.StringIO()
+    buffer.write(f"{len(tasks)} tasks\n")
+    for task in tasks:
+        buffer.write("\n")
+        task.print_stack(file=buffer)
+    return buffer.getvalue()
@@ -0,0 +1,46 @@
+"""Раскладка ключей очередей уведомлений в Redis.
+
+Очередь на пару (чат, бот) — список `notification:{target_id}:{bot_id}`.
+Ранее вместо `bot_id` в ключе был токен бота; такие ключи переносятся
+командой `main_migrate_queue_keys.py`.
+
+Сообщения, снятые RPS-насосом с очереди, но еще не опубликованные
+в RabbitMQ, лежат в списке `processing:{ключ очереди}`. После падения
+насоса они возвращаются в начало исходной очереди.
+"""
+
+from uuid import UUID
+
+NOTIFICATION_KEY_PREFIX = "notification"
+NOTIFICATION_KEY_PATTERN = f"{NOTIFICATION_KEY_PREFIX}:*"
+PROCESSING_KEY_PREFIX = "processing"
+PROCESSING_KEY_PATTERN = f"{PROCESSING_KEY_PREFIX}:{NOTIFICATION_KEY_PATTERN}"
+
+
+def notification_key(target_id: int, bot_id: str) -> str:
+    return f"{NOTIFICATION_KEY_PREFIX}:{target_id}:{bot_id}"
+
+
+def split_notification_key(key: str) -> tuple[str, str]:
+    """Возвращает `(target_id, bot_ref)`, где bot_ref — id или токен бота."""
+    _, target_id, bot_ref = key.split(":", 2)
+    return target_id, bot_ref
+
+
+def is_legacy_key(key: str) -> bool:
+    """Проверяет, что ключ содержит токен бота вместо его id."""
+    _, bot_ref = split_notification_key(key)
+    try:
+        UUID(bot_ref)
+    except ValueError:
+        return True
+    return False
+
+
+def processing_key(key: str) -> str:
+    return f"{PROCESSING_KEY_PREFIX}:{key}"
+
+
+def source_key(processing: str) -> str:
+    """Возвращает ключ очереди, которой принадлежит список обработки."""
+    return processing.removeprefix(f"{PROCESSING_KEY_PREFIX}:")
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 from collections.abc import AsyncGenerator
-from typing import Any
+from functools import cache
+from typing import TYPE_CHECKING, Any
 
 import redis.asyncio as redis
 
-from infra.decorators import retry_on_failure
+if TYPE_CHECKING:
+    from fakeredis import FakeServer
+    from redis.asyncio.client import Pipeline
+
+# DSN встроенного режима: данные хранятся в памяти процесса.
+MEMORY_DSN_SCHEME = "memory://"
 
 
 class RedisClient:
@@ -14,7 +20,8 @@ class RedisClient:
     def __init__(self, dsn: str, *, decode_responses: bool = True) -> None:
         """Инициализирует клиент Redis.
 
-        :param dsn: DSN строка подключения (например, "redis://localhost:6379/0")
+        :param dsn: DSN строка подключения (например, "redis://localhost:6379/0"\
+            или "memory://" для Redis в памяти процесса)
         :param decode_responses: Флаг декодирования ответов Redis в строки \
             (по умолчанию True)
         """
@@ -22,10 +29,15 @@ class RedisClient:
         self._decode_responses = decode_responses
         self._redis: redis.Redis | None = None
 
-    @retry_on_failure
     async def connect(self) -> None:
-        """Устанавливает подключение к Redis."""
-        if not self._redis:
+        """Создает клиент Redis.
+
+        Соединения открываются при первой команде, поэтому метод не ждет
+        Redis: доступность проверяет `ping` (проба готовности).
+        """
+        if not self._redis and self._dsn.startswith(MEMORY_DSN_SCHEME):
+            self._redis = _memory_redis(self._decode_responses)
+        elif not self._redis:
             self._redis = redis.from_url(
                 self._dsn,
                 decode_responses=self._decode_responses,
@@ -37,6 +49,11 @@ class RedisClient:
             await self._redis.close()
             self._redis = None
 
+    async def ping(self) -> None:
+        """Проверяет доступность Redis командой PING."""
+        redis_con = await self._get_redis_connection()
+        await redis_con.ping()
+
     async def set_value(
         self,
         key: str,
@@ -292,6 +309,29 @@ class RedisClient:
             )
         ]
 
+    async def scan_keys(
+        self,
+        cursor: int,
+        match: str,
+        count: int = 100,
+        type: str | None = "LIST",  # noqa: A002
+    ) -> tuple[int, list[str]]:
+        """Выполняет один шаг SCAN.
+
+        :param cursor: Курсор предыдущего шага (0 — начало обхода).
+        :param match: Шаблон ключей.
+        :param count: Подсказка Redis о размере шага.
+        :param type: Тип ключей (по умолчанию списки).
+        :return: Следующий курсор (0 — обход завершен) и найденные ключи.
+        """
+        redis_client = await self._get_redis_connection()
+        return await redis_client.scan(
+            cursor=cursor,
+            match=match,
+            count=count,
+            _type=type,
+        )
+
     async def publish_to_channel(self, channel: str, message: str) -> None:
         """Публикует сообщение в канал.
 
@@ -317,6 +357,15 @@ class RedisClient:
                 if message["type"] == "message":
                     yield message["data"]
 
+    async def pipeline(self, *, transaction: bool = False) -> Pipeline:
+        """Возвращает пайплайн для отправки нескольких команд за один запрос.
+
+        :param transaction: Оборачивать ли команды в MULTI/EXEC.
+        :return: Объект `Pipeline`, команды выполняются вызовом `execute()`.
+        """
+        redis_con = await self._get_redis_connection()
+        return redis_con.pipeline(transaction=transaction)
+
     async def get_client(self) -> redis.Redis:
         """Возвращает объект клиента Redis.
 
@@ -332,3 +381,20 @@ class RedisClient:
         while not self._redis:
             await self.connect()
         return self._redis
+
+
+def _memory_redis(decode_responses: bool) -> redis.Redis:  # noqa: FBT001
+    """Redis в памяти процесса (fakeredis), общий для всех клиентов."""
+    from fakeredis.aioredis import FakeRedis
+
+    return FakeRedis(
+        server=_memory_server(),
+        decode_responses=decode_responses,
+    )
+
+
+@cache
+def _memory_server() -> FakeServer:
+    from fakeredis import FakeServer
+
+    return FakeServer()
@@ -0,0 +1,58 @@
+"""Очереди sender в RabbitMQ.
+
+RPS-насос публикует сообщения в exchange типа `x-consistent-hash`
+(плагин `rabbitmq_consistent_hash_exchange`) с ключом маршрутизации —
+ключом очереди Redis `notification:{target_id}:{bot_id}`. Поэтому все
+сообщения одного чата попадают в один шард `telegram:messages:{n}`.
+
+Шард обрабатывается строго последовательно: у очереди один активный
+потребитель (`x-single-active-consumer`), а он держит не больше одного
+неподтвержденного сообщения. Порядок сообщений чата сохраняется,
+а общая пропускная способность растет с числом шардов. Старая очередь
+`telegram:messages` читается без этого ограничения, как до шардирования.
+"""
+
+from faststream.rabbit import (
+    ExchangeType,
+    RabbitBroker,
+    RabbitExchange,
+    RabbitQueue,
+)
+
+SENDER_EXCHANGE = RabbitExchange(
+    "telegram:messages",
+    type=ExchangeType.X_CONSISTENT_HASH,
+    durable=True,
+)
+
+# До шардирования sender читал одну очередь; она дочитывается, чтобы
+# не потерять сообщения, опубликованные до обновления. Флаги объявления
+# прежние: повторное объявление очереди, флаги которой отличаются,
+# RabbitMQ отклоняет (PRECONDITION_FAILED).
+LEGACY_QUEUE = RabbitQueue("telegram:messages", auto_delete=True)
+
+
+def shard_queue(index: int) -> RabbitQueue:
+    return RabbitQueue(
+        f"telegram:messages:{index}",
+        durable=True,
+        arguments={"x-single-active-consumer": True},
+        # Для consistent-hash exchange ключ привязки — вес шарда.
+        routing_key="1",
+    )
+
+
+def shard_queues(count: int) -> list[RabbitQueue]:
+    return [shard_queue(index) for index in range(count)]
+
+
+async def declare(broker: RabbitBroker, shards: int) -> None:
+    """Объявляет exchange и шарды с привязками.
+
+    Насос вызывает ее при старте, чтобы сообщения не терялись, если
+    sender еще ни разу не запускался и не создал очереди.
+    """
+    exchange = await broker.declare_exchange(SENDER_EXCHANGE)
+    for queue in shard_queues(shards):
+        declared = await broker.declare_queue(queue)
+        await declared.bind(exchange, routing_key=queue.routing)
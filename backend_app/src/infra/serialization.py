@@ -0,0 +1,29 @@
+"""Выбор JSON-бэкенда для сериализации сообщений.
+
+Бэкенд задается настройкой `JSON_BACKEND` при старте процесса:
+`json` — стандартная библиотека, `orjson` — orjson.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+from core.config import settings
+
+
+def _json_dumps(obj: object) -> bytes:
+    return json.dumps(obj, ensure_ascii=False).encode()
+
+
+def _select_backend() -> tuple[
+    Callable[[Any], bytes],
+    Callable[[str | bytes], Any],
+]:
+    if settings.json_backend == "orjson":
+        import orjson
+
+        return orjson.dumps, orjson.loads
+    return _json_dumps, json.loads
+
+
+dumps, loads = _select_backend()
@@ -0,0 +1,35 @@
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """LRU-кэш в памяти процесса с ограниченным временем жизни записей."""
+
+    def __init__(self, *, max_size: int, ttl: float) -> None:
+        """Инициализирует кэш.
+
+        :param max_size: Максимальное число записей.
+        :param ttl: Время жизни записи в секундах.
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """Возвращает значение, если оно есть и не устарело."""
+        cached = self._data.get(key)
+        if cached is None or cached[0] <= time.monotonic():
+            return None
+        self._data.move_to_end(key)
+        return cached[1]
+
+    def set(self, key: K, value: V) -> None:
+        """Сохраняет значение, вытесняя самые давно использованные."""
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
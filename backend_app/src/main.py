@@ -6,8 +6,13 @@ from fastapi import (
 )
 from tortoise.contrib.fastapi import register_tortoise
 
+from api.responses import DefaultResponse
 from api.routers import router as main_router
+from application.api_key_service import ApiKeyService
+from application.bot_registry import BotRegistry
 from core.config import settings
+from infra.health import HealthCheck, database_probe
+from infra.loop_monitor import monitor_loop
 from infra.redis_client import RedisClient
 
 router = APIRouter(prefix="/api")
@@ -17,11 +22,40 @@ router.include_router(main_router)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    redis_client = RedisClient(settings.redis_dsn)
-    await redis_client.connect()
-    app.state.redis_client = redis_client
-    yield
-    await redis_client.disconnect()
+    async with monitor_loop():
+        redis_client = RedisClient(settings.redis_dsn)
+        await redis_client.connect()
+        app.state.redis_client = redis_client
+
+        bot_registry = BotRegistry(
+            redis_client,
+            settings.bot_registry_refresh_interval,
+        )
+        await bot_registry.start()
+        app.state.bot_registry = bot_registry
+
+        health_check = HealthCheck(
+            timeout=settings.health_probe_timeout,
+            cache_ttl=settings.health_cache_ttl,
+        )
+        health_check.add_probe("redis", redis_client.ping)
+        health_check.add_probe("postgres", database_probe)
+        app.state.health_check = health_check
+
+        app.state.api_key_service = ApiKeyService(
+            ttl=settings.api_key_cache_ttl,
+            negative_ttl=settings.api_key_negative_cache_ttl,
+            max_size=settings.api_key_cache_max_size,
+        )
+        if settings.runtime_mode == "embedded":
+            from tasks.embedded import run_embedded
+
+            async with run_embedded():
+                yield
+        else:
+            yield
+        await bot_registry.stop()
+        await redis_client.disconnect()
 
 
 app = FastAPI(
@@ -31,6 +65,7 @@ app = FastAPI(
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
     lifespan=lifespan,
+    default_response_class=DefaultResponse,
 )
 
 
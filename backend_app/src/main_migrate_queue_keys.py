@@ -0,0 +1,5 @@
+from infra.event_loop import run
+from tasks.migrate_queue_keys import main
+
+if __name__ == "__main__":
+    run(main())
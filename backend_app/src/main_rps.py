@@ -1,6 +1,5 @@
-import asyncio
-
+from infra.event_loop import run
 from tasks.rps import main
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
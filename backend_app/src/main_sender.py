@@ -1,6 +1,10 @@
-import asyncio
-
+from core.config import settings
+from infra.event_loop import run
+from tasks import supervisor
 from tasks.sender import main
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if settings.sender_workers == 1:
+        run(main())
+    else:
+        supervisor.main()
@@ -0,0 +1,5 @@
+from infra.event_loop import run
+from tasks.train_zstd_dictionary import main
+
+if __name__ == "__main__":
+    run(main())
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class BotInfo(BaseModel):
+    """Данные бота, нужные на пути отправки.
+
+    :id: str
+    :token: str
+    :callback_url: str | None — адрес для результатов доставки
+    """
+
+    id: str
+    token: str
+    callback_url: str | None = None
@@ -0,0 +1,61 @@
+from enum import StrEnum
+
+from pydantic import BaseModel, Field
+
+
+class DeliveryStatus(StrEnum):
+    QUEUED = "queued"
+    SENT = "sent"
+    FAILED = "failed"
+    RETRYING = "retrying"
+    EXPIRED = "expired"
+
+
+class DeliveryResult(BaseModel):
+    """Результат попытки отправки сообщения в Telegram.
+
+    :status: DeliveryStatus
+    :telegram_message_id: int | None — id сообщения в Telegram
+    :error: str | None — описание ошибки от Telegram или транспорта
+    :latency_ms: float | None — время запроса к Telegram API
+    :retry_after: float | None — через сколько секунд повторить попытку
+    :error_code: int | None — код ошибки Telegram (HTTP-статус ответа)
+    :file_ids: list[str | None] | None — `file_id` отправленных вложений
+    """
+
+    status: DeliveryStatus
+    telegram_message_id: int | None = None
+    error: str | None = None
+    latency_ms: float | None = None
+    retry_after: float | None = None
+    error_code: int | None = None
+    file_ids: list[str | None] | None = None
+
+
+class DeliveryStatusOut(BaseModel):
+    id: str
+    status: DeliveryStatus
+    telegram_message_id: int | None = None
+    error: str | None = None
+    latency_ms: float | None = None
+    queued_at: float | None = None
+    updated_at: float | None = None
+
+
+class DeliveryStatusBulkIn(BaseModel):
+    ids: list[str] = Field(min_length=1, max_length=1000)
+
+
+class DeliveryStatusBulkOut(BaseModel):
+    items: list[DeliveryStatusOut]
+
+
+class DeliveryEvent(BaseModel):
+    """Событие доставки, отправляемое на callback URL бота."""
+
+    id: str
+    target_id: int
+    status: DeliveryStatus
+    telegram_message_id: int | None = None
+    error: str | None = None
+    timestamp: float
@@ -0,0 +1,20 @@
+from enum import StrEnum
+
+from pydantic import BaseModel, Field
+
+
+class HealthStatus(StrEnum):
+    OK = "ok"
+    UNAVAILABLE = "unavailable"
+
+
+class HealthOut(BaseModel):
+    """Состояние процесса.
+
+    :status: HealthStatus
+    :checks: dict[str, str] — результат проверки каждой зависимости:\
+        "ok" или описание ошибки
+    """
+
+    status: HealthStatus
+    checks: dict[str, str] = Field(default_factory=dict)
@@ -0,0 +1,26 @@
+from enum import StrEnum
+from pathlib import Path
+
+from pydantic import BaseModel
+
+
+class MediaKind(StrEnum):
+    PHOTO = "photo"
+    DOCUMENT = "document"
+
+
+class MediaFile(BaseModel):
+    """Вложение, подготовленное к отправке.
+
+    :kind: MediaKind
+    :path: Path — файл в хранилище медиа админки
+    :filename: str — имя файла для загрузки
+    :sha256: str — хэш содержимого (ключ кэша `file_id`)
+    :file_id: str | None — `file_id` Telegram, если файл уже загружался
+    """
+
+    kind: MediaKind
+    path: Path
+    filename: str
+    sha256: str
+    file_id: str | None = None
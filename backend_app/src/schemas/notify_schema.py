@@ -1,7 +1,15 @@
-from datetime import datetime
+from datetime import UTC, datetime
 from enum import StrEnum
+from typing import Any, Self
+from uuid import uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import (
+    BaseModel,
+    Field,
+    TypeAdapter,
+    field_validator,
+    model_validator,
+)
 
 
 class SourceType(StrEnum):
@@ -10,26 +18,160 @@ class SourceType(StrEnum):
 
 class MessageParseMode(StrEnum):
     MARKDOWN = "Markdown"
+    MARKDOWN_V2 = "MarkdownV2"
     HTML = "HTML"
 
 
+TemplateVariables = dict[str, str | int | float]
+
+
 class NotifyIn(BaseModel):
     """Схема уведомления.
 
+    Передается либо готовый текст `message`, либо `template_id`
+    шаблона бота и `variables` для подстановки. С `attachments`
+    (id вложений бота из админки) текст становится подписью и может
+    отсутствовать.
+
+    Срок актуальности задается либо `ttl` (секунды от приема), либо
+    моментом `expires_at`; просроченное уведомление не отправляется.
+
     :target_id: int
-    :message: str
+    :message: str | None
+    :template_id: str | None
+    :variables: dict[str, str | int | float] | None
+    :attachments: list[str] | None — до 10 вложений
+    :ttl: int | None — сколько секунд уведомление актуально
+    :expires_at: datetime | None — до какого момента (без зоны — UTC)
     :source: SourceType = Field(SourceType.TELEGRAM)
     """
 
     target_id: int
-    message: str
+    message: str | None = None
+    template_id: str | None = None
+    variables: TemplateVariables | None = None
+    attachments: list[str] | None = Field(None, min_length=1, max_length=10)
     format: MessageParseMode | None = None
+    ttl: int | None = Field(None, gt=0)
+    expires_at: datetime | None = None
     source: SourceType = Field(SourceType.TELEGRAM)
 
+    @field_validator("expires_at")
+    @classmethod
+    def check_expires_at(cls, value: datetime | None) -> datetime | None:
+        """Приводит `expires_at` к UTC и отклоняет прошедший момент."""
+        if value is None:
+            return None
+        value = value.replace(tzinfo=value.tzinfo or UTC)
+        if value <= datetime.now(UTC):
+            msg = "expires_at is in the past"
+            raise ValueError(msg)
+        return value
+
+    @model_validator(mode="after")
+    def check_content(self) -> Self:
+        """Проверяет, что задан ровно один источник текста или вложения."""
+        if self.message is not None and self.template_id is not None:
+            msg = "Only one of message or template_id is allowed"
+            raise ValueError(msg)
+        if not (self.message or self.template_id or self.attachments):
+            msg = "One of message, template_id or attachments is required"
+            raise ValueError(msg)
+        return self
+
+    @model_validator(mode="after")
+    def check_expiry(self) -> Self:
+        """Проверяет, что срок задан не больше чем одним способом."""
+        if self.ttl is not None and self.expires_at is not None:
+            msg = "Only one of ttl or expires_at is allowed"
+            raise ValueError(msg)
+        return self
+
+    def to_record(
+        self,
+        *,
+        message_id: str,
+        bot_id: str,
+        timestamp: float,
+    ) -> dict[str, Any]:
+        """Собирает запись очереди (поля `NotifyRedisDto`, кроме пустых).
+
+        Поля уже провалидированы при приеме, поэтому запись собирается
+        без промежуточной модели и повторной валидации. Состав полей
+        берется из `NotifyRedisDto`: одноименные поля копируются
+        из запроса, новое поле DTO не потеряется в очереди.
+
+        :param message_id: Id уведомления.
+        :param bot_id: Id бота-отправителя.
+        :param timestamp: Момент приема (unix time).
+        """
+        assigned = {
+            "id": message_id,
+            "bot_id": bot_id,
+            "timestamp": timestamp,
+            "expires_at": self.expiry(timestamp),
+        }
+        fields = vars(self) | assigned
+        return {
+            name: value
+            for name in NotifyRedisDto.model_fields
+            if (value := fields.get(name)) is not None
+        }
+
+    def expiry(self, timestamp: float) -> float | None:
+        """Момент истечения (unix time) для принятого в `timestamp`."""
+        if self.ttl is not None:
+            return timestamp + self.ttl
+        if self.expires_at is not None:
+            return self.expires_at.timestamp()
+        return None
+
+
+class NotifyCreatedOut(BaseModel):
+    message: str = "Notification created"
+    id: str
+
+
+class NotifyStreamError(BaseModel):
+    line: int
+    error: str
+
+
+class NotifyStreamOut(BaseModel):
+    """Итог потоковой загрузки уведомлений.
+
+    :accepted: Число поставленных в очередь уведомлений.
+    :rejected: Число отклоненных строк.
+    :suppressed: Число уведомлений в подавленные чаты (не поставлены).
+    :errors: Первые ошибки с номерами строк (нумерация с 1).
+    """
+
+    accepted: int = 0
+    rejected: int = 0
+    suppressed: int = 0
+    errors: list[NotifyStreamError] = Field(default_factory=list)
+
 
 class NotifyRedisDto(BaseModel):
+    id: str = Field(default_factory=lambda: uuid4().hex)
     target_id: int
-    message: str
+    message: str | None = None
+    # Длинный текст хранится сжатым (см. infra.compression).
+    message_zstd: str | None = None
+    template_id: str | None = None
+    variables: TemplateVariables | None = None
+    attachments: list[str] | None = None
     format: MessageParseMode | None = None
-    bot_token: str
+    bot_id: str | None = None
+    # Сообщения, поставленные до появления реестра ботов, несут токен.
+    bot_token: str | None = None
     timestamp: float
+    expires_at: float | None = None
+
+    def is_expired(self, now: float) -> bool:
+        """Проверяет, истек ли срок актуальности к моменту `now`."""
+        return self.expires_at is not None and self.expires_at <= now
+
+
+# Записи очереди сериализуются pydantic-core напрямую в JSON (bytes).
+queue_record_adapter = TypeAdapter(dict[str, Any])
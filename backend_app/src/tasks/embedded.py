@@ -0,0 +1,81 @@
+"""Встроенный режим: API, RPS-насос и sender в одном event loop.
+
+Включается `RUNTIME_MODE=embedded`: приложение API при старте запускает
+насос и обработчики sender, а RabbitMQ заменяется очередью в памяти
+(`infra.memory_broker`). С `REDIS_DSN=memory://` не нужен и Redis —
+очереди и статусы хранятся в памяти процесса и теряются при перезапуске
+(нужен extra `embedded`). Запускать одним процессом: `uvicorn main:app`.
+"""
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from core.config import settings
+from infra.memory_broker import Message, memory_broker
+from infra.queue_keys import notification_key
+from infra.redis_client import RedisClient
+from infra.sender_queues import SENDER_EXCHANGE, shard_queue
+from schemas.notify_schema import NotifyRedisDto
+from tasks import rps, sender
+
+logger = logging.getLogger(__name__)
+
+
+async def handle_message(message: Message) -> None:
+    await sender.deliver(NotifyRedisDto.model_validate_json(message))
+
+
+async def requeue(redis_client: RedisClient, messages: list[Message]) -> None:
+    """Возвращает необработанные сообщения в начало их очередей Redis.
+
+    Сообщения старого формата (с токеном бота вместо id) возвращаются
+    в очередь со старым ключом: ее дочитывает насос и переносит
+    `main_migrate_queue_keys.py`.
+    """
+    pipeline = await redis_client.pipeline()
+    requeued = 0
+    for message in reversed(messages):
+        dto = NotifyRedisDto.model_validate_json(message)
+        bot_ref = dto.bot_id or dto.bot_token
+        if bot_ref is None:
+            logger.error("Dropped undelivered message without bot: %s", dto.id)
+            continue
+        pipeline.lpush(notification_key(dto.target_id, bot_ref), message)
+        requeued += 1
+    await pipeline.execute()
+    logger.warning("Returned %s undelivered messages to Redis", requeued)
+
+
+@asynccontextmanager
+async def run_embedded() -> AsyncIterator[None]:
+    """Запускает насос и sender на время жизни приложения API."""
+    await sender.startup()
+    # Как и в RabbitMQ, каждый шард обрабатывается последовательно,
+    # чтобы сохранить порядок сообщений чата.
+    for index in range(settings.embedded_sender_concurrency):
+        queue = shard_queue(index).name
+        memory_broker.bind(SENDER_EXCHANGE, queue)
+        memory_broker.subscriber(queue, handle_message, concurrency=1)
+    await memory_broker.start()
+    pump = asyncio.create_task(rps.clock.serve())
+    logger.info("Embedded pump and sender started")
+
+    try:
+        yield
+    finally:
+        rps.stopping.set()
+        await rps.drain()
+        pump.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await pump
+
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(settings.sender_graceful_timeout):
+                await memory_broker.join()
+        undelivered = await memory_broker.close()
+        if undelivered:
+            await requeue(sender.Dependencies.redis_client, undelivered)
+        await sender.shutdown()
@@ -0,0 +1,187 @@
+"""Онлайн-перенос очередей со старых ключей на ключи с id бота.
+
+`notification:{target_id}:{bot_token}` -> `notification:{target_id}:{bot_id}`
+
+Ключи обходятся SCAN, сообщения переносятся пачками `LMOVE ... RIGHT LEFT`
+в одном пайплайне: каждая команда атомарна, порядок старых сообщений
+сохраняется, и они оказываются перед сообщениями, уже попавшими в новый
+ключ. Redis не блокируется дольше одной пачки. Курсор SCAN и счетчики
+сохраняются в хэше `migration:queue_keys`, повторный запуск продолжает
+с места остановки.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from tortoise import Tortoise
+
+from application.bot_registry import BotRegistry
+from core.config import settings
+from infra.queue_keys import (
+    NOTIFICATION_KEY_PATTERN,
+    is_legacy_key,
+    notification_key,
+    split_notification_key,
+)
+from infra.redis_client import RedisClient
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY = "migration:queue_keys"
+
+
+class QueueKeyMigration:
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        bot_registry: BotRegistry,
+        *,
+        batch_size: int,
+        scan_count: int,
+        pause: float,
+    ) -> None:
+        """Инициализирует миграцию.
+
+        :param redis_client: Клиент Redis.
+        :param bot_registry: Загруженный реестр ботов (токен -> id).
+        :param batch_size: Сколько сообщений переносить за один пайплайн.
+        :param scan_count: Подсказка COUNT для SCAN.
+        :param pause: Пауза между пачками в секундах (разгрузка Redis).
+        """
+        self._redis = redis_client
+        self._bots = bot_registry
+        self._batch_size = batch_size
+        self._scan_count = scan_count
+        self._pause = pause
+        self._progress: dict[str, int] = {}
+
+    async def run(self, *, restart: bool = False) -> dict[str, int]:
+        """Выполняет (или продолжает) миграцию.
+
+        :param restart: Начать обход заново, сбросив сохраненный прогресс.
+        :return: Итоговые счетчики.
+        """
+        if restart:
+            await self._redis.delete_key(PROGRESS_KEY)
+        await self._load_progress()
+
+        await self._scan_all(started=time.monotonic())
+        self._progress["done"] = 1
+        await self._save_progress()
+        return self._progress
+
+    async def _scan_all(self, *, started: float) -> None:
+        cursor = self._progress["cursor"]
+        while True:
+            cursor = await self._scan_page(cursor)
+            self._log_progress(started)
+            if cursor == 0:
+                return
+
+    async def _scan_page(self, cursor: int) -> int:
+        """Переносит ключи одной страницы SCAN и сохраняет прогресс.
+
+        :return: Курсор следующей страницы (0 — обход завершен).
+        """
+        cursor, keys = await self._redis.scan_keys(
+            cursor,
+            NOTIFICATION_KEY_PATTERN,
+            count=self._scan_count,
+        )
+        for key in filter(is_legacy_key, keys):
+            await self._migrate_key(key)
+
+        self._progress["cursor"] = cursor
+        self._progress["scanned"] += len(keys)
+        await self._save_progress()
+        return cursor
+
+    async def _migrate_key(self, key: str) -> None:
+        target_id, token = split_notification_key(key)
+        bot = self._bots.get_by_token(token)
+        if bot is None:
+            logger.warning("Бот для ключа %s не найден, пропуск", key)
+            self._progress["orphaned"] += 1
+            return
+
+        await self._move_all(key, notification_key(int(target_id), bot.id))
+        self._progress["keys"] += 1
+
+    async def _move_all(self, source: str, destination: str) -> None:
+        while moved := await self._move_batch(source, destination):
+            self._progress["moved"] += moved
+            if moved < self._batch_size:
+                return
+            await asyncio.sleep(self._pause)
+
+    async def _move_batch(self, source: str, destination: str) -> int:
+        pipeline = await self._redis.pipeline()
+        for _ in range(self._batch_size):
+            pipeline.lmove(source, destination, "RIGHT", "LEFT")
+        results = await pipeline.execute()
+        return sum(result is not None for result in results)
+
+    async def _load_progress(self) -> None:
+        redis_con = await self._redis.get_client()
+        saved = await redis_con.hgetall(PROGRESS_KEY)
+        if saved.get("done") == "1":
+            logger.info("Миграция уже завершена, начинаю повторный обход")
+            saved = {}
+        elif saved:
+            logger.info("Продолжаю миграцию с курсора %s", saved["cursor"])
+        self._progress = {
+            name: int(saved.get(name, 0))
+            for name in ("cursor", "scanned", "keys", "moved", "orphaned")
+        }
+
+    async def _save_progress(self) -> None:
+        redis_con = await self._redis.get_client()
+        await redis_con.hset(PROGRESS_KEY, mapping=self._progress)
+
+    def _log_progress(self, started: float) -> None:
+        elapsed = max(time.monotonic() - started, 1e-6)
+        logger.info(
+            "scanned=%s keys=%s moved=%s orphaned=%s (%.0f msg/s)",
+            self._progress["scanned"],
+            self._progress["keys"],
+            self._progress["moved"],
+            self._progress["orphaned"],
+            self._progress["moved"] / elapsed,
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--scan-count", type=int, default=1000)
+    parser.add_argument("--pause", type=float, default=0.0)
+    parser.add_argument("--restart", action="store_true")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    redis_client = RedisClient(settings.redis_dsn)
+    await redis_client.connect()
+    await Tortoise.init(config=settings.tortoise_config)
+    try:
+        bot_registry = BotRegistry(
+            redis_client,
+            settings.bot_registry_refresh_interval,
+        )
+        await bot_registry.load()
+        migration = QueueKeyMigration(
+            redis_client,
+            bot_registry,
+            batch_size=args.batch_size,
+            scan_count=args.scan_count,
+            pause=args.pause,
+        )
+        result = await migration.run(restart=args.restart)
+        logger.info("Миграция завершена: %s", result)
+    finally:
+        await Tortoise.close_connections()
+        await redis_client.disconnect()
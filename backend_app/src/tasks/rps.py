@@ -1,19 +1,60 @@
+import asyncio
+import contextlib
 import logging
+import signal
+import time
 from contextlib import asynccontextmanager
 
 from aioclock import AioClock, Depends, Every
 from aioclock.group import Group
 from faststream.rabbit import RabbitBroker
 
+from application.delivery_status_service import DeliveryStatusService
+from application.suppression_service import (
+    SUPPRESSED_ERROR,
+    SuppressionService,
+)
 from core.config import settings
+from infra.control_server import serve_control
+from infra.health import HealthCheck, broker_probe, redis_probe
+from infra.loop_monitor import monitor_loop
+from infra.memory_broker import memory_broker
+from infra.metrics import metrics
+from infra.queue_keys import (
+    NOTIFICATION_KEY_PATTERN,
+    PROCESSING_KEY_PATTERN,
+    processing_key,
+    source_key,
+    split_notification_key,
+)
 from infra.redis_client import RedisClient
+from infra.sender_queues import SENDER_EXCHANGE, declare
+from infra.serialization import loads
+from schemas.delivery_schema import DeliveryResult, DeliveryStatus
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-broker = RabbitBroker(settings.rabbitmq_url)
+broker = (
+    memory_broker
+    if settings.runtime_mode == "embedded"
+    else RabbitBroker(settings.rabbitmq_url)
+)
 tasks = Group()
 
+SUPPRESSED_RESULT = DeliveryResult(
+    status=DeliveryStatus.FAILED,
+    error=SUPPRESSED_ERROR,
+)
+EXPIRED_RESULT = DeliveryResult(status=DeliveryStatus.EXPIRED)
+# Сообщения без срока пропускаются без разбора JSON.
+EXPIRES_AT_FIELD = '"expires_at"'
+
+# Выставляется по SIGTERM/SIGINT: новые пачки больше не забираются.
+stopping = asyncio.Event()
+# Удерживается, пока пачка уже забрана из очередей, но не опубликована.
+in_flight = asyncio.Lock()
+
 
 class Dependencies:
     redis_client: RedisClient | None = None
@@ -26,28 +67,176 @@ class Dependencies:
         return cls.redis_client
 
 
-@tasks.task(trigger=Every(seconds=5))
+@tasks.task(trigger=Every(seconds=settings.rps_interval))
 async def process_rps(
     redis: RedisClient = Depends(Dependencies.get_redis),
 ) -> None:
     """Периодическая задача, публикующая сообщение в очередь и работающая с Redis."""
+    if stopping.is_set():
+        return
+
     logger.info("Processing scheduled task... Sending message to the queue.")
 
-    keys = await redis.get_all_keys(match="notification:*", count=100)
+    async with in_flight:
+        keys = await redis.get_all_keys(
+            match=NOTIFICATION_KEY_PATTERN,
+            count=100,
+        )
+        for key in keys:
+            if stopping.is_set():
+                break
+            await pump_queue(redis, key)
 
-    for key in keys:
-        messages = await redis.pop_from_list(key=key, count=5, right=False)
+    logger.info("Message sent to queue.")
 
-        if not messages:
-            continue
 
-        if isinstance(messages, list):
-            for m in messages:
-                await broker.publish(message=m, queue="telegram:messages")
-        else:
-            await broker.publish(message=messages, queue="telegram:messages")
+async def pump_queue(redis: RedisClient, key: str) -> None:
+    """Переносит пачку сообщений очереди в RabbitMQ.
 
-    logger.info("Message sent to queue.")
+    Сообщения атомарно перекладываются (`LMOVE`) в список обработки
+    и удаляются из него только после публикации, поэтому при падении
+    процесса они не теряются, а возвращаются `recover_in_flight`.
+    Если публикация прервалась посреди пачки, из списка обработки
+    удаляются только обработанные сообщения, а остальные возвращаются
+    в начало очереди. Сообщения в подавленный чат не публикуются,
+    а отбрасываются. Ключ очереди служит ключом маршрутизации: все
+    сообщения чата попадают в один шард sender и отправляются по порядку.
+
+    :param redis: Клиент Redis.
+    :param key: Ключ очереди уведомлений.
+    """
+    suppressed, messages = await take_batch(redis, key)
+    if not messages:
+        return
+    if suppressed:
+        metrics.incr("suppression.dropped", len(messages))
+        await finish_batch(redis, key, messages, SUPPRESSED_RESULT)
+        return
+    await publish_batch(redis, key, messages)
+
+
+async def take_batch(redis: RedisClient, key: str) -> tuple[bool, list[str]]:
+    """Перекладывает пачку очереди в список обработки.
+
+    :return: Подавлен ли чат очереди и сообщения пачки.
+    """
+    processing = processing_key(key)
+    target_id, bot_id = split_notification_key(key)
+    pipeline = await redis.pipeline()
+    SuppressionService.add_check(pipeline, bot_id, target_id)
+    # Остатки пачки, которые не удалось вернуть в очередь, идут первыми.
+    pipeline.lrange(processing, 0, -1)
+    for _ in range(settings.rps_batch_size):
+        pipeline.lmove(key, processing, "LEFT", "RIGHT")
+    suppressed, leftovers, *moved = await pipeline.execute()
+    return suppressed, leftovers + [m for m in moved if m is not None]
+
+
+async def publish_batch(
+    redis: RedisClient,
+    key: str,
+    messages: list[str],
+) -> None:
+    """Публикует пачку, отбрасывая сообщения с истекшим сроком."""
+    now = time.time()
+    expired = []
+    handled = 0
+    try:
+        for m in messages:
+            if is_expired(m, now):
+                expired.append(m)
+            else:
+                await broker.publish(
+                    message=m,
+                    exchange=SENDER_EXCHANGE,
+                    routing_key=key,
+                )
+            handled += 1
+    finally:
+        metrics.incr("rps.expired", len(expired))
+        await finish_batch(
+            redis,
+            key,
+            messages[:handled],
+            EXPIRED_RESULT,
+            dropped=expired,
+        )
+
+
+def is_expired(message: str, now: float) -> bool:
+    """Проверяет срок сообщения, не разбирая JSON сообщений без срока."""
+    if EXPIRES_AT_FIELD not in message:
+        return False
+    expires_at = loads(message).get("expires_at")
+    return expires_at is not None and expires_at <= now
+
+
+async def finish_batch(
+    redis: RedisClient,
+    key: str,
+    handled: list[str],
+    result: DeliveryResult,
+    *,
+    dropped: list[str] | None = None,
+) -> None:
+    """Снимает обработанные сообщения пачки и записывает статус отброшенных.
+
+    Обработанные сообщения лежат в начале списка обработки и удаляются
+    (`LTRIM`); необработанные возвращаются в начало очереди в прежнем
+    порядке.
+
+    :param key: Ключ очереди уведомлений.
+    :param handled: Обработанные сообщения (начало списка обработки).
+    :param result: Итоговый статус отброшенных (чтобы отправитель\
+        увидел причину при запросе статуса).
+    :param dropped: Сообщения, снятые без публикации; по умолчанию —\
+        все обработанные.
+    """
+    processing = processing_key(key)
+    status_service = DeliveryStatusService(redis, settings.delivery_status_ttl)
+    pipeline = await redis.pipeline()
+    message_ids = (
+        loads(message).get("id")
+        for message in (handled if dropped is None else dropped)
+    )
+    for message_id in filter(None, message_ids):
+        status_service.add_result(pipeline, message_id, result)
+    pipeline.ltrim(processing, len(handled), -1)
+    pipeline.llen(processing)
+    *_, remaining = await pipeline.execute()
+    if remaining:
+        await requeue_processing(redis, processing, key)
+
+
+async def requeue_processing(
+    redis: RedisClient,
+    processing: str,
+    key: str,
+) -> int:
+    """Возвращает список обработки в начало очереди, сохраняя порядок.
+
+    :return: Количество возвращенных сообщений.
+    """
+    redis_con = await redis.get_client()
+    requeued = 0
+    while await redis_con.lmove(processing, key, "RIGHT", "LEFT") is not None:
+        requeued += 1
+    return requeued
+
+
+async def recover_in_flight(redis: RedisClient) -> None:
+    """Возвращает неопубликованные сообщения в начало их очередей.
+
+    Такие сообщения остаются в списках обработки, если прошлый запуск
+    был убит посреди пачки.
+    """
+    for processing in await redis.get_all_keys(
+        match=PROCESSING_KEY_PATTERN,
+        count=100,
+    ):
+        key = source_key(processing)
+        recovered = await requeue_processing(redis, processing, key)
+        logger.warning("Recovered %s in-flight messages to %s", recovered, key)
 
 
 @asynccontextmanager
@@ -59,18 +248,67 @@ async def lifespan(aio_clock: AioClock):
         settings.redis_dsn,
     )
     await Dependencies.redis_client.connect()
+    await recover_in_flight(Dependencies.redis_client)
 
-    async with broker:
-        yield aio_clock
-
-    await Dependencies.redis_client.disconnect()
-    Dependencies.redis_client = None
-    logger.info("Stopping FastStream broker and AioClock scheduler...")
+    try:
+        async with broker:
+            if isinstance(broker, RabbitBroker):
+                await declare(broker, settings.sender_shards)
+            yield aio_clock
+    finally:
+        await Dependencies.redis_client.disconnect()
+        Dependencies.redis_client = None
+        logger.info("Stopping FastStream broker and AioClock scheduler...")
 
 
 clock = AioClock(lifespan=lifespan)
 clock.include_group(tasks)
 
 
+async def drain() -> None:
+    """Дожидается публикации текущей пачки, но не дольше таймаута.
+
+    Если таймаут истек, пачка остается в списке обработки и будет
+    возвращена в очередь при следующем запуске.
+    """
+    logger.info("Stopping RPS pump, draining in-flight messages...")
+    try:
+        async with asyncio.timeout(settings.rps_shutdown_timeout):
+            await in_flight.acquire()
+    except TimeoutError:
+        logger.warning("In-flight batch was not published in time")
+
+
+def health_check() -> HealthCheck:
+    """Проверка готовности насоса: доступны Redis и RabbitMQ."""
+    health = HealthCheck(
+        timeout=settings.health_probe_timeout,
+        cache_ttl=settings.health_cache_ttl,
+    )
+    health.add_probe("redis", redis_probe(Dependencies.get_redis))
+    health.add_probe("rabbitmq", broker_probe(broker))
+    return health
+
+
 async def main() -> None:
-    await clock.serve()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stopping.set)
+
+    async with (
+        monitor_loop(),
+        serve_control(settings.control_port, health_check()),
+    ):
+        serving = asyncio.create_task(clock.serve())
+        stop_requested = asyncio.create_task(stopping.wait())
+        await asyncio.wait(
+            {serving, stop_requested},
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+
+        if stopping.is_set():
+            await drain()
+        stop_requested.cancel()
+        serving.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await serving
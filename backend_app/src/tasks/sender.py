@@ -1,40 +1,491 @@
 import logging
+import time
+from functools import partial
+from typing import TypeVar
 
+import httpx
 from faststream import FastStream
-from faststream.rabbit import (
-    ExchangeType,
-    RabbitBroker,
-    RabbitExchange,
-    RabbitQueue,
-)
-from pydantic import Json
+from faststream.rabbit import RabbitBroker
+from faststream.rabbit.message import RabbitMessage
+from tortoise import Tortoise, connections
 
+from application.bot_registry import BotRegistry
+from application.delivery_log import DeliveryLogPartitions, DeliveryLogWriter
+from application.delivery_status_service import DeliveryStatusRecorder
+from application.media_service import MediaError, MediaService
 from application.notification_service import (
     NotificationService,
 )
+from application.send_rate_limiter import AdaptiveRateLimiter
+from application.suppression_service import (
+    SuppressionService,
+    is_permanent_failure,
+)
+from application.template_renderer import TemplateError, TemplateRenderer
+from application.webhook_dispatcher import WebhookDispatcher
 from core.config import settings
-from schemas.notify_schema import NotifyRedisDto
+from infra.compression import message_codec
+from infra.control_server import serve_control
+from infra.health import (
+    HealthCheck,
+    broker_probe,
+    database_probe,
+    redis_probe,
+)
+from infra.loop_monitor import monitor_loop
+from infra.metrics import metrics
+from infra.redis_client import RedisClient
+from infra.sender_queues import LEGACY_QUEUE, SENDER_EXCHANGE, shard_queues
+from schemas.bot_schema import BotInfo
+from schemas.delivery_schema import (
+    DeliveryEvent,
+    DeliveryResult,
+    DeliveryStatus,
+)
+from schemas.notify_schema import MessageParseMode, NotifyRedisDto
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-broker = RabbitBroker(settings.rabbitmq_url)
+# По SIGTERM брокер перестает брать новые сообщения и ждет завершения
+# текущих обработчиков; неподтвержденные к таймауту сообщения RabbitMQ
+# вернет в очередь при закрытии канала.
+# max_consumers=1 — prefetch каждого потребителя: шард обрабатывается
+# по одному сообщению, что сохраняет порядок сообщений чата.
+broker = RabbitBroker(
+    settings.rabbitmq_url,
+    graceful_timeout=settings.sender_graceful_timeout,
+    max_consumers=1,
+)
+# prefetch задается на канал брокера, поэтому старая очередь читается
+# отдельным брокером без ограничения, как до шардирования.
+legacy_broker = RabbitBroker(
+    settings.rabbitmq_url,
+    graceful_timeout=settings.sender_graceful_timeout,
+)
 
 app = FastStream(broker)
 
-exch = RabbitExchange("exchange", auto_delete=True, type=ExchangeType.TOPIC)
-queue_1 = RabbitQueue("telegram:messages", auto_delete=True)
+BOT_NOT_FOUND = DeliveryResult(
+    status=DeliveryStatus.FAILED,
+    error="Bot not found",
+)
+
+T = TypeVar("T")
+
+
+def _require(service: T | None, name: str) -> T:
+    if service is None:
+        msg = f"{name} не инициализирован"
+        raise RuntimeError(msg)
+    return service
+
+
+class Dependencies:
+    http_client: httpx.AsyncClient | None = None
+    webhook_client: httpx.AsyncClient | None = None
+    redis_client: RedisClient | None = None
+    notification_service: NotificationService | None = None
+    rate_limiter: AdaptiveRateLimiter | None = None
+    status_recorder: DeliveryStatusRecorder | None = None
+    webhook_dispatcher: WebhookDispatcher | None = None
+    bot_registry: BotRegistry | None = None
+    template_renderer: TemplateRenderer | None = None
+    media_service: MediaService | None = None
+    suppression_service: SuppressionService | None = None
+    delivery_log: DeliveryLogWriter | None = None
+    delivery_log_partitions: DeliveryLogPartitions | None = None
+    # ORM инициализирован sender, поэтому и закрывается sender.
+    owns_orm = False
+
+    @classmethod
+    async def get_redis(cls) -> RedisClient:
+        """Возвращает инстанс Redis-клиента."""
+        return _require(cls.redis_client, "RedisClient")
+
+    @classmethod
+    def get_notification_service(cls) -> NotificationService:
+        """Возвращает инстанс сервиса отправки уведомлений."""
+        return _require(cls.notification_service, "NotificationService")
+
+    @classmethod
+    def get_status_recorder(cls) -> DeliveryStatusRecorder:
+        """Возвращает буфер записи статусов доставки."""
+        return _require(cls.status_recorder, "DeliveryStatusRecorder")
+
+    @classmethod
+    def get_webhook_dispatcher(cls) -> WebhookDispatcher:
+        """Возвращает диспетчер webhook-уведомлений о доставке."""
+        return _require(cls.webhook_dispatcher, "WebhookDispatcher")
+
+    @classmethod
+    def get_bot_registry(cls) -> BotRegistry:
+        """Возвращает реестр ботов."""
+        return _require(cls.bot_registry, "BotRegistry")
+
+    @classmethod
+    def get_template_renderer(cls) -> TemplateRenderer:
+        """Возвращает рендерер шаблонов сообщений."""
+        return _require(cls.template_renderer, "TemplateRenderer")
+
+    @classmethod
+    def get_media_service(cls) -> MediaService:
+        """Возвращает сервис вложений."""
+        return _require(cls.media_service, "MediaService")
+
+    @classmethod
+    def get_suppression_service(cls) -> SuppressionService:
+        """Возвращает сервис подавленных чатов."""
+        return _require(cls.suppression_service, "SuppressionService")
+
+
+@app.on_startup
+async def startup() -> None:
+    """Создает пул HTTP-соединений к Telegram, буферы и реестр ботов."""
+    await init_orm()
+    Dependencies.http_client = httpx.AsyncClient(
+        base_url=settings.telegram_api_url,
+        timeout=10,
+        limits=httpx.Limits(
+            max_connections=settings.telegram_max_connections,
+            max_keepalive_connections=settings.telegram_max_connections,
+        ),
+    )
+    Dependencies.redis_client = RedisClient(settings.redis_dsn)
+    await Dependencies.redis_client.connect()
+    if settings.telegram_adaptive_rate:
+        await start_rate_limiter(Dependencies.redis_client)
+    Dependencies.notification_service = NotificationService(
+        Dependencies.http_client,
+        max_attempts=settings.telegram_max_attempts,
+        max_retry_after=settings.telegram_max_retry_after,
+        upload_timeout=settings.media_upload_timeout,
+        rate_limiter=Dependencies.rate_limiter,
+    )
+    Dependencies.status_recorder = DeliveryStatusRecorder(
+        Dependencies.redis_client,
+        settings.delivery_status_ttl,
+        flush_interval=settings.delivery_status_flush_interval,
+        batch_size=settings.delivery_status_batch_size,
+    )
+    await Dependencies.status_recorder.start()
+    if settings.delivery_log_enabled:
+        await start_delivery_log()
+
+    Dependencies.bot_registry = BotRegistry(
+        Dependencies.redis_client,
+        settings.bot_registry_refresh_interval,
+    )
+    await Dependencies.bot_registry.start()
+    Dependencies.template_renderer = TemplateRenderer(
+        max_size=settings.template_cache_size,
+        ttl=settings.template_cache_ttl,
+    )
+    Dependencies.media_service = MediaService(
+        Dependencies.redis_client,
+        settings.media_root,
+        cache_size=settings.media_cache_size,
+        cache_ttl=settings.media_cache_ttl,
+        file_id_ttl=settings.media_file_id_ttl,
+    )
+    Dependencies.suppression_service = SuppressionService(
+        Dependencies.redis_client,
+        settings.suppression_ttl,
+    )
+
+    Dependencies.webhook_client = httpx.AsyncClient(
+        timeout=settings.webhook_timeout,
+        limits=httpx.Limits(
+            max_connections=settings.webhook_max_concurrency,
+        ),
+    )
+    Dependencies.webhook_dispatcher = WebhookDispatcher(
+        Dependencies.webhook_client,
+        batch_size=settings.webhook_batch_size,
+        flush_interval=settings.webhook_flush_interval,
+        max_attempts=settings.webhook_max_attempts,
+        max_buffer=settings.webhook_max_buffer,
+        max_concurrency=settings.webhook_max_concurrency,
+    )
+    await Dependencies.webhook_dispatcher.start()
+
+
+@app.after_startup
+async def start_legacy_broker() -> None:
+    """Начинает дочитывать старую очередь после запуска шардов."""
+    await legacy_broker.start()
+
+
+@app.on_shutdown
+async def stop_legacy_broker() -> None:
+    """Дожидается обработчиков старой очереди и закрывает подключение."""
+    await legacy_broker.close()
+
+
+async def init_orm() -> None:
+    """Инициализирует ORM, если этого еще не сделало приложение API.
+
+    Приложение API (встроенный режим) само закрывает свои соединения,
+    поэтому sender закрывает их, только если инициализировал ORM сам.
+    """
+    if Tortoise._inited:  # noqa: SLF001
+        return
+    await Tortoise.init(config=settings.tortoise_config)
+    Dependencies.owns_orm = True
+
+
+async def start_rate_limiter(redis_client: RedisClient) -> None:
+    """Запускает подбор темпа отправки ботов по ответам Telegram."""
+    Dependencies.rate_limiter = AdaptiveRateLimiter(
+        redis_client,
+        initial_rate=settings.telegram_rate_initial,
+        min_rate=settings.telegram_rate_min,
+        max_rate=settings.telegram_rate_max,
+        increase=settings.telegram_rate_increase,
+        decrease=settings.telegram_rate_decrease,
+        state_ttl=settings.telegram_rate_state_ttl,
+        flush_interval=settings.telegram_rate_flush_interval,
+    )
+    await Dependencies.rate_limiter.start()
+
+
+async def start_delivery_log() -> None:
+    """Запускает архив результатов доставки в Postgres."""
+    connection = connections.get("default")
+    Dependencies.delivery_log_partitions = DeliveryLogPartitions(
+        connection,
+        days_ahead=settings.delivery_log_partitions_ahead,
+        retention_days=settings.delivery_log_retention_days,
+        interval=settings.delivery_log_maintenance_interval,
+    )
+    await Dependencies.delivery_log_partitions.start()
+    Dependencies.delivery_log = DeliveryLogWriter(
+        connection,
+        flush_interval=settings.delivery_log_flush_interval,
+        batch_size=settings.delivery_log_batch_size,
+        max_buffer=settings.delivery_log_max_buffer,
+    )
+    await Dependencies.delivery_log.start()
+
+
+@app.after_shutdown
+async def shutdown() -> None:
+    """Сбрасывает буферы статусов и webhook и закрывает соединения."""
+    await stop_services()
+    if Dependencies.webhook_dispatcher:
+        await Dependencies.webhook_dispatcher.stop(settings.webhook_timeout)
+    await close_clients()
+    Dependencies.http_client = None
+    Dependencies.webhook_client = None
+    Dependencies.redis_client = None
+    Dependencies.notification_service = None
+    Dependencies.rate_limiter = None
+    Dependencies.status_recorder = None
+    Dependencies.webhook_dispatcher = None
+    Dependencies.bot_registry = None
+    Dependencies.template_renderer = None
+    Dependencies.media_service = None
+    Dependencies.suppression_service = None
+    Dependencies.delivery_log = None
+    Dependencies.delivery_log_partitions = None
+    if Dependencies.owns_orm:
+        await Tortoise.close_connections()
+        Dependencies.owns_orm = False
+
+
+async def stop_services() -> None:
+    """Останавливает фоновые задачи сервисов, сбрасывая их буферы."""
+    services = (
+        Dependencies.bot_registry,
+        Dependencies.status_recorder,
+        Dependencies.rate_limiter,
+        Dependencies.delivery_log_partitions,
+        Dependencies.delivery_log,
+    )
+    for service in filter(None, services):
+        await service.stop()
+
+
+async def close_clients() -> None:
+    """Закрывает подключение к Redis и пулы HTTP-соединений."""
+    if Dependencies.redis_client:
+        await Dependencies.redis_client.disconnect()
+    clients = (Dependencies.http_client, Dependencies.webhook_client)
+    for client in filter(None, clients):
+        await client.aclose()
+
+
+async def decode_message(message: RabbitMessage) -> NotifyRedisDto:
+    """Разбирает и валидирует тело сообщения за один проход."""
+    return NotifyRedisDto.model_validate_json(message.body)
+
+
+@legacy_broker.subscriber(LEGACY_QUEUE, decoder=decode_message)
+async def base_handler1(msg: NotifyRedisDto) -> None:
+    await deliver(msg)
+
+
+for shard in shard_queues(settings.sender_shards):
+    broker.subscriber(shard, SENDER_EXCHANGE, decoder=decode_message)(
+        base_handler1,
+    )
+
+
+async def deliver(msg: NotifyRedisDto) -> None:
+    """Отправляет уведомление и записывает результат доставки."""
+    bot = await resolve_bot(msg)
+    if bot is None:
+        Dependencies.get_status_recorder().record(msg.id, BOT_NOT_FOUND)
+        return
+
+    result = await attempt_delivery(msg, bot)
+    await record_result(msg, bot, result)
+
+
+async def attempt_delivery(
+    msg: NotifyRedisDto,
+    bot: BotInfo,
+) -> DeliveryResult:
+    """Отправляет уведомление, если его срок не истек."""
+    if msg.is_expired(time.time()):
+        # Подтверждается без отправки: устаревшее уведомление
+        # только задержало бы свежие.
+        metrics.incr("sender.expired")
+        return DeliveryResult(status=DeliveryStatus.EXPIRED)
+    try:
+        return await send_message(msg, bot)
+    except (TemplateError, MediaError) as e:
+        return DeliveryResult(status=DeliveryStatus.FAILED, error=str(e))
+
+
+async def record_result(
+    msg: NotifyRedisDto,
+    bot: BotInfo,
+    result: DeliveryResult,
+) -> None:
+    """Записывает статус доставки, архив и webhook-событие бота."""
+    Dependencies.get_status_recorder().record(msg.id, result)
+    if bot.id:
+        await archive_result(msg, bot.id, result)
+    if bot.callback_url:
+        notify_callback(bot.callback_url, msg, result)
+
+
+async def archive_result(
+    msg: NotifyRedisDto,
+    bot_id: str,
+    result: DeliveryResult,
+) -> None:
+    """Пишет результат в архив и подавляет чат при постоянной ошибке."""
+    if Dependencies.delivery_log:
+        Dependencies.delivery_log.record(msg, bot_id, result)
+    if is_permanent_failure(result):
+        await Dependencies.get_suppression_service().suppress(
+            bot_id,
+            msg.target_id,
+            result.error or "",
+        )
+
+
+async def send_message(msg: NotifyRedisDto, bot: BotInfo) -> DeliveryResult:
+    """Отправляет текст или вложения уведомления в Telegram.
+
+    :raises TemplateError: Шаблон не найден или не хватает переменных.
+    :raises MediaError: Вложения не найдены или несовместимы.
+    """
+    notification_service = Dependencies.get_notification_service()
+    on_retry = partial(Dependencies.get_status_recorder().record, msg.id)
+    message, parse_mode = await render_message(msg, bot)
+    if not msg.attachments:
+        return await notification_service.send(
+            chat_id=msg.target_id,
+            bot_token=bot.token,
+            message=message,
+            parse_mode=parse_mode,
+            on_retry=on_retry,
+            bot_id=bot.id,
+        )
+
+    media_service = Dependencies.get_media_service()
+    files = await media_service.resolve(msg.attachments, bot.id)
+    async with media_service.exclusive_upload(bot.id, files):
+        result = await notification_service.send_media(
+            chat_id=msg.target_id,
+            media=files,
+            bot_token=bot.token,
+            caption=message,
+            parse_mode=parse_mode,
+            on_retry=on_retry,
+            bot_id=bot.id,
+        )
+        if result.status == DeliveryStatus.SENT and result.file_ids:
+            await media_service.remember(bot.id, files, result.file_ids)
+    return result
+
+
+async def render_message(
+    msg: NotifyRedisDto,
+    bot: BotInfo,
+) -> tuple[str, MessageParseMode | None]:
+    """Возвращает текст и формат сообщения (рендерит шаблон, если он задан)."""
+    if msg.message_zstd is not None:
+        return message_codec.decompress(msg.message_zstd), msg.format
+    if not msg.template_id:
+        return msg.message or "", msg.format
+    return await Dependencies.get_template_renderer().render(
+        msg.template_id,
+        bot.id,
+        msg.variables,
+        msg.format,
+    )
+
+
+async def resolve_bot(msg: NotifyRedisDto) -> BotInfo | None:
+    """Находит бота сообщения в реестре (по id или по токену)."""
+    bot_registry = Dependencies.get_bot_registry()
+    if msg.bot_id:
+        return await bot_registry.get_or_load(msg.bot_id)
+    if msg.bot_token:
+        return bot_registry.get_by_token(msg.bot_token) or BotInfo(
+            id="",
+            token=msg.bot_token,
+        )
+    return None
+
+
+def notify_callback(
+    callback_url: str,
+    msg: NotifyRedisDto,
+    result: DeliveryResult,
+) -> None:
+    """Ставит результат доставки в очередь webhook-уведомлений бота."""
+    Dependencies.get_webhook_dispatcher().submit(
+        callback_url,
+        DeliveryEvent(
+            id=msg.id,
+            target_id=msg.target_id,
+            status=result.status,
+            telegram_message_id=result.telegram_message_id,
+            error=result.error,
+            timestamp=time.time(),
+        ),
+    )
 
 
-@broker.subscriber(queue_1, exch)
-async def base_handler1(msg: Json[NotifyRedisDto]) -> None:
-    await NotificationService().send(
-        chat_id=msg.target_id,
-        bot_token=msg.bot_token,
-        message=msg.message,
-        parse_mode=msg.format,
+def health_check() -> HealthCheck:
+    """Проверка готовности sender: доступны Redis, Postgres и RabbitMQ."""
+    health = HealthCheck(
+        timeout=settings.health_probe_timeout,
+        cache_ttl=settings.health_cache_ttl,
     )
+    health.add_probe("redis", redis_probe(Dependencies.get_redis))
+    health.add_probe("postgres", database_probe)
+    health.add_probe("rabbitmq", broker_probe(broker))
+    health.add_probe("rabbitmq_legacy", broker_probe(legacy_broker))
+    return health
 
 
-async def main() -> None:
-    await app.run()
+async def main(control_port: int | None = settings.control_port) -> None:
+    """Запускает sender и, если задан порт, сервер управления процессом."""
+    async with monitor_loop(), serve_control(control_port, health_check()):
+        await app.run()
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from typing import TYPE_CHECKING
+
+from core.config import settings
+from infra.event_loop import run
+from infra.metrics import Metrics, metrics
+from tasks.sender import main as run_sender
+
+if TYPE_CHECKING:
+    from multiprocessing.process import BaseProcess
+    from multiprocessing.queues import Queue
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# pid, счетчики и показатели воркера.
+MetricsMessage = tuple[int, dict[str, float], dict[str, float]]
+
+
+def _metrics_message() -> MetricsMessage:
+    return os.getpid(), metrics.snapshot(), metrics.gauges()
+
+
+async def _report_metrics(
+    metrics_queue: Queue[MetricsMessage],
+    interval: float,
+) -> None:
+    """Периодически отправляет снимок счетчиков воркера супервизору."""
+    while True:
+        await asyncio.sleep(interval)
+        metrics_queue.put(_metrics_message())
+
+
+async def _serve_worker(
+    metrics_queue: Queue[MetricsMessage],
+    control_port: int | None,
+) -> None:
+    """Запускает sender в текущем процессе вместе с отчетом о метриках."""
+    reporter = asyncio.create_task(
+        _report_metrics(metrics_queue, settings.metrics_interval / 2),
+    )
+    try:
+        await run_sender(control_port)
+    finally:
+        reporter.cancel()
+        metrics_queue.put(_metrics_message())
+
+
+def _control_port(index: int) -> int | None:
+    """У каждого воркера свой порт управления: CONTROL_PORT + индекс."""
+    if settings.control_port is None:
+        return None
+    return settings.control_port + index
+
+
+def run_worker(
+    metrics_queue: Queue[MetricsMessage],
+    control_port: int | None,
+) -> None:
+    """Точка входа процесса-воркера."""
+    run(_serve_worker(metrics_queue, control_port))
+
+
+class SenderSupervisor:
+    """Запускает несколько процессов sender и следит за ними.
+
+    Каждый воркер имеет собственное подключение к брокеру
+    и пул HTTP-соединений.
+    Упавшие воркеры перезапускаются, по SIGTERM воркерам дается
+    `shutdown_timeout` секунд на завершение обработки текущих сообщений.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        *,
+        shutdown_timeout: float,
+        restart_delay: float,
+        metrics_interval: float,
+    ) -> None:
+        """Инициализирует супервизор.
+
+        :param workers: Количество воркеров (0 — по числу ядер CPU).
+        :param shutdown_timeout: Время на штатное завершение воркеров.
+        :param restart_delay: Пауза перед перезапуском упавшего воркера.
+        :param metrics_interval: Период вывода агрегированных метрик.
+        """
+        self._workers_count = workers or os.cpu_count() or 1
+        self._shutdown_timeout = shutdown_timeout
+        self._restart_delay = restart_delay
+        self._metrics_interval = metrics_interval
+        # Воркеры форкаются от forkserver, который один раз импортировал
+        # sender: запуск и перезапуск воркера не ждут импорта зависимостей.
+        self._context = multiprocessing.get_context("forkserver")
+        self._context.set_forkserver_preload(["tasks.supervisor"])
+        self._metrics_queue: Queue[MetricsMessage] = self._context.Queue()
+        self._workers: dict[int, BaseProcess] = {}
+        self._restart_at: dict[int, float] = {}
+        self._snapshots: dict[int, dict[str, float]] = {}
+        self._gauges: dict[str, float] = {}
+        self._stopping = False
+
+    def run(self) -> None:
+        """Запускает воркеры и блокируется до получения сигнала остановки."""
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+
+        logger.info("Starting %s sender workers...", self._workers_count)
+        for index in range(self._workers_count):
+            self._start_worker(index)
+
+        next_report = time.monotonic() + self._metrics_interval
+        while not self._stopping:
+            self._collect_metrics(timeout=1)
+            self._restart_dead_workers()
+            next_report = self._maybe_log_metrics(next_report)
+
+        self._stop_workers()
+        self._collect_metrics(timeout=0)
+        self._log_metrics()
+
+    def aggregated_metrics(self) -> dict[str, float]:
+        """Возвращает сумму счетчиков всех воркеров, включая завершенные."""
+        return Metrics.merge(*self._snapshots.values())
+
+    def _handle_stop(self, signum: int, _frame: object) -> None:
+        logger.info("Received signal %s, draining sender workers...", signum)
+        self._stopping = True
+
+    def _start_worker(self, index: int) -> None:
+        process = self._context.Process(
+            target=run_worker,
+            args=(self._metrics_queue, _control_port(index)),
+            name=f"sender-worker-{index}",
+        )
+        process.start()
+        self._workers[index] = process
+        logger.info("Sender worker %s started (pid=%s)", index, process.pid)
+
+    def _restart_dead_workers(self) -> None:
+        now = time.monotonic()
+        dead = [
+            index
+            for index, process in self._workers.items()
+            if not process.is_alive()
+        ]
+        for index in dead:
+            restart_at = self._restart_at.setdefault(
+                index,
+                now + self._restart_delay,
+            )
+            if now >= restart_at:
+                self._restart_worker(index)
+
+    def _restart_worker(self, index: int) -> None:
+        process = self._workers[index]
+        logger.warning(
+            "Sender worker %s (pid=%s) exited with code %s, restarting",
+            index,
+            process.pid,
+            process.exitcode,
+        )
+        del self._restart_at[index]
+        self._start_worker(index)
+
+    def _stop_workers(self) -> None:
+        alive = [p for p in self._workers.values() if p.is_alive()]
+        for process in alive:
+            process.terminate()
+
+        deadline = time.monotonic() + self._shutdown_timeout
+        for process in alive:
+            process.join(max(deadline - time.monotonic(), 0))
+        _kill_stuck(alive)
+
+    def _collect_metrics(self, timeout: float) -> None:
+        try:
+            message = self._metrics_queue.get(timeout=timeout)
+            while True:
+                pid, snapshot, gauges = message
+                self._snapshots[pid] = snapshot
+                # Показатели общие для воркеров (например, темп отправки
+                # бота хранится в Redis) — берется последнее значение.
+                self._gauges.update(gauges)
+                message = self._metrics_queue.get_nowait()
+        except queue.Empty:
+            return
+
+    def _maybe_log_metrics(self, next_report: float) -> float:
+        if time.monotonic() < next_report:
+            return next_report
+        self._log_metrics()
+        return time.monotonic() + self._metrics_interval
+
+    def _log_metrics(self) -> None:
+        logger.info(
+            "Sender metrics: %s, gauges: %s",
+            self.aggregated_metrics(),
+            self._gauges,
+        )
+
+
+def _kill_stuck(processes: list[BaseProcess]) -> None:
+    for process in [p for p in processes if p.is_alive()]:
+        logger.warning("%s did not stop in time, killing", process.name)
+        process.kill()
+        process.join()
+
+
+def main() -> None:
+    SenderSupervisor(
+        settings.sender_workers,
+        shutdown_timeout=settings.sender_shutdown_timeout,
+        restart_delay=settings.sender_restart_delay,
+        metrics_interval=settings.metrics_interval,
+    ).run()
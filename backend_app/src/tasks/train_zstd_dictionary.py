@@ -0,0 +1,105 @@
+"""Обучение словаря zstd на текстах уведомлений из очередей Redis.
+
+Очереди `notification:*` обходятся SCAN, из каждой берется до
+`--per-key` сообщений, пока не наберется `--samples` текстов. Готовый
+словарь записывается в `--output`; чтобы кодек начал им пользоваться,
+путь к файлу передается API и sender в `ZSTD_DICTIONARY_PATH`.
+"""
+
+import argparse
+import logging
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import zstandard
+
+from core.config import settings
+from infra.compression import message_codec
+from infra.queue_keys import NOTIFICATION_KEY_PATTERN
+from infra.redis_client import RedisClient
+from infra.serialization import loads
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def collect_samples(
+    redis_client: RedisClient,
+    *,
+    limit: int,
+    per_key: int,
+) -> list[bytes]:
+    """Собирает тексты сообщений из очередей.
+
+    :param redis_client: Клиент Redis.
+    :param limit: Сколько текстов собрать.
+    :param per_key: Сколько сообщений брать из одной очереди.
+    :return: Тексты в UTF-8.
+    """
+    samples: list[bytes] = []
+    async for text in _queued_texts(redis_client, per_key):
+        samples.append(text.encode())
+        if len(samples) >= limit:
+            break
+    return samples
+
+
+async def _queued_texts(
+    redis_client: RedisClient,
+    per_key: int,
+) -> AsyncIterator[str]:
+    async for key in _queue_keys(redis_client):
+        messages = await redis_client.get_list_range(key, 0, per_key - 1)
+        for text in filter(None, map(_message_text, map(loads, messages))):
+            yield text
+
+
+async def _queue_keys(redis_client: RedisClient) -> AsyncIterator[str]:
+    cursor = None
+    while cursor != 0:
+        cursor, keys = await redis_client.scan_keys(
+            cursor or 0,
+            NOTIFICATION_KEY_PATTERN,
+            count=1000,
+        )
+        for key in keys:
+            yield key
+
+
+def _message_text(message: dict) -> str | None:
+    if message.get("message_zstd"):
+        # Уже сжатые сообщения читаются текущим словарем.
+        return message_codec.decompress(message["message_zstd"])
+    return message.get("message")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument("--samples", type=int, default=10000)
+    parser.add_argument("--per-key", type=int, default=100)
+    parser.add_argument("--size", type=int, default=16384)
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    redis_client = RedisClient(settings.redis_dsn)
+    await redis_client.connect()
+    try:
+        samples = await collect_samples(
+            redis_client,
+            limit=args.samples,
+            per_key=args.per_key,
+        )
+    finally:
+        await redis_client.disconnect()
+
+    logger.info("Собрано %s текстов", len(samples))
+    try:
+        dictionary = zstandard.train_dictionary(args.size, samples)
+    except zstandard.ZstdError:
+        logger.exception("Не удалось обучить словарь, нужно больше текстов")
+        return
+    args.output.write_bytes(dictionary.as_bytes())
+    logger.info("Словарь записан в %s", args.output)
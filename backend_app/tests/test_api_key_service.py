@@ -0,0 +1,79 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from application import api_key_service
+from application.api_key_service import ApiKeyService
+
+ACTIVE_KEY = SimpleNamespace(key="active", bot_id=1)
+
+
+class FakeKeys:
+    """Таблица API-ключей, отвечающая после сигнала `release`."""
+
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+        self.release = asyncio.Event()
+
+    async def get_or_none(self, *, key: str, **_filters: object) -> object:
+        self.queries.append(key)
+        await self.release.wait()
+        return ACTIVE_KEY if key == ACTIVE_KEY.key else None
+
+
+@pytest.fixture
+def keys(monkeypatch: pytest.MonkeyPatch) -> FakeKeys:
+    keys = FakeKeys()
+    monkeypatch.setattr(api_key_service, "APIKey", keys)
+    monkeypatch.setattr(api_key_service, "read_connection", lambda: None)
+    return keys
+
+
+def test_concurrent_lookups_share_one_query(keys: FakeKeys) -> None:
+    async def scenario() -> list[object]:
+        service = ApiKeyService(ttl=60, negative_ttl=60)
+        lookups = [
+            asyncio.create_task(service.get_api_key(key))
+            for key in ("active", "active", "missing", "missing")
+        ]
+        await asyncio.sleep(0)
+        keys.release.set()
+        results = await asyncio.gather(*lookups)
+        # Повторные проверки берутся из кэша, в том числе отрицательные.
+        results += [
+            await service.get_api_key("active"),
+            await service.get_api_key("missing"),
+        ]
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert results == [ACTIVE_KEY, ACTIVE_KEY, None, None, ACTIVE_KEY, None]
+    assert sorted(keys.queries) == ["active", "missing"]
+
+
+def test_cancelled_lookup_does_not_cancel_shared_query(keys: FakeKeys) -> None:
+    async def scenario() -> object:
+        service = ApiKeyService(ttl=60)
+        cancelled = asyncio.create_task(service.get_api_key("active"))
+        waiting = asyncio.create_task(service.get_api_key("active"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        keys.release.set()
+        return await waiting
+
+    assert asyncio.run(scenario()) == ACTIVE_KEY
+    assert keys.queries == ["active"]
+
+
+def test_zero_ttl_disables_cache(keys: FakeKeys) -> None:
+    async def scenario() -> None:
+        service = ApiKeyService()
+        keys.release.set()
+        await service.get_api_key("active")
+        await service.get_api_key("active")
+
+    asyncio.run(scenario())
+
+    assert keys.queries == ["active", "active"]
@@ -0,0 +1,92 @@
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+
+from application.delivery_log import (
+    DeliveryLogPartitions,
+    partition_name,
+)
+
+TODAY = datetime.now(UTC).date()
+DAYS_AHEAD = 2
+
+
+class PartitionError(RuntimeError):
+    pass
+
+
+class FakeConnection:
+    """Соединение asyncpg, помнящее секции и выполненные транзакции."""
+
+    def __init__(self, partitions: list[str], fail_on: str) -> None:
+        self.partitions = set(partitions)
+        self.fail_on = fail_on
+        self.pending: list[str] = []
+        self.committed: list[str] = []
+        self.moved = 0
+
+    @contextlib.asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        self.pending = []
+        yield
+        self.committed.extend(self.pending)
+
+    async def fetchval(self, query: str, *args: object) -> object:
+        if "to_regclass" in query:
+            return args[0] if args[0] in self.partitions else None
+        if "delivery_log_default" in query:
+            return self.moved
+        return True
+
+    async def fetch(self, _query: str, *_args: object) -> list[dict]:
+        return [{"relname": name} for name in sorted(self.partitions)]
+
+    async def execute(self, query: str, *_args: object) -> None:
+        if self.fail_on in query:
+            raise PartitionError
+        self.pending.append(query)
+
+
+class FakeClient:
+    def __init__(self, con: FakeConnection) -> None:
+        self.con = con
+
+    @contextlib.asynccontextmanager
+    async def acquire_connection(self) -> AsyncIterator[FakeConnection]:
+        yield self.con
+
+
+def maintain(con: FakeConnection) -> None:
+    partitions = DeliveryLogPartitions(
+        FakeClient(con),
+        days_ahead=DAYS_AHEAD,
+        retention_days=7,
+        interval=60,
+    )
+    asyncio.run(partitions.maintain())
+
+
+def test_failed_partition_does_not_stop_others() -> None:
+    tomorrow = partition_name(TODAY + timedelta(days=1))
+    expired = partition_name(TODAY - timedelta(days=8))
+    con = FakeConnection([expired], fail_on=f"TABLE {tomorrow} ")
+
+    maintain(con)
+
+    created = [query for query in con.committed if "CREATE TABLE" in query]
+    assert len(created) == DAYS_AHEAD
+    assert all(tomorrow not in query for query in created)
+    assert f"DROP TABLE IF EXISTS {expired}" in con.committed
+
+
+def test_rows_from_default_partition_are_restored() -> None:
+    con = FakeConnection([], fail_on="<none>")
+    con.moved = 3
+
+    maintain(con)
+
+    restored = [
+        query for query in con.committed if query.startswith("INSERT INTO")
+    ]
+    assert len(restored) == DAYS_AHEAD + 1
@@ -0,0 +1,126 @@
+import asyncio
+from collections.abc import Iterator
+from datetime import UTC, datetime
+
+import pytest
+from tortoise import Tortoise
+
+from application.delivery_status_service import DeliveryStatusService
+from application.notify_queue_service import NotifyQueueService
+from application.suppression_service import SuppressionService
+from core.config import settings
+from infra.database.models import Bot, User
+from infra.memory_broker import MemoryBroker
+from infra.queue_keys import NOTIFICATION_KEY_PATTERN
+from infra.redis_client import RedisClient
+from schemas.bot_schema import BotInfo
+from schemas.delivery_schema import DeliveryResult, DeliveryStatus
+from schemas.notify_schema import NotifyIn
+from tasks import embedded, rps, sender
+
+MESSAGES = 20
+
+ORM_CONFIG = {
+    "connections": {"default": "sqlite://:memory:"},
+    "apps": {
+        "models": {
+            "models": ["infra.database.models"],
+            "default_connection": "default",
+        },
+    },
+}
+
+
+class FakeTelegram:
+    """Сервис отправки, запоминающий тексты вместо запросов к Telegram."""
+
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    async def send(self, *, message: str, **_kwargs: object) -> DeliveryResult:
+        self.sent.append(message)
+        return DeliveryResult(status=DeliveryStatus.SENT)
+
+
+@pytest.fixture
+def embedded_mode(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setattr(settings, "redis_dsn", "memory://")
+    monkeypatch.setattr(settings, "telegram_adaptive_rate", False)
+    monkeypatch.setattr(settings, "embedded_sender_concurrency", 2)
+    broker = MemoryBroker(settings.embedded_queue_size)
+    monkeypatch.setattr(embedded, "memory_broker", broker)
+    monkeypatch.setattr(rps, "broker", broker)
+    yield
+    rps.stopping.clear()
+    if rps.in_flight.locked():
+        rps.in_flight.release()
+
+
+async def create_bot() -> BotInfo:
+    now = datetime.now(UTC)
+    bot = await Bot.create(
+        name="embedded",
+        token="1:embedded",  # noqa: S106
+        owner=await User.create(),
+        created_at=now,
+        updated_at=now,
+    )
+    return BotInfo(id=str(bot.id), token=bot.token)
+
+
+async def enqueue(redis: RedisClient, bot: BotInfo) -> list[str]:
+    queue_service = NotifyQueueService(
+        redis,
+        DeliveryStatusService(redis, settings.delivery_status_ttl),
+        SuppressionService(redis, settings.suppression_ttl),
+    )
+    return await queue_service.enqueue_many(
+        (
+            NotifyIn(target_id=number % 4, message=f"m{number}")
+            for number in range(MESSAGES)
+        ),
+        bot,
+    )
+
+
+async def pump_until_sent(redis: RedisClient, telegram: FakeTelegram) -> None:
+    async with asyncio.timeout(5):
+        while len(telegram.sent) < MESSAGES:
+            for key in await redis.get_all_keys(NOTIFICATION_KEY_PATTERN):
+                await rps.pump_queue(redis, key)
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.usefixtures("embedded_mode")
+def test_pump_delivers_through_memory_broker() -> None:
+    async def scenario() -> tuple[list[str], list[str], int]:
+        await Tortoise.init(config=ORM_CONFIG)
+        await Tortoise.generate_schemas()
+        try:
+            bot = await create_bot()
+            telegram = FakeTelegram()
+            async with embedded.run_embedded():
+                sender.Dependencies.notification_service = telegram
+                redis = sender.Dependencies.redis_client
+                ids = await enqueue(redis, bot)
+                await pump_until_sent(redis, telegram)
+
+            # ORM принадлежит приложению: sender не закрыл соединения.
+            bots = await Bot.all().count()
+            statuses = await DeliveryStatusService(
+                RedisClient(settings.redis_dsn),
+                settings.delivery_status_ttl,
+            ).get_many(ids, bot.id)
+        finally:
+            await Tortoise.close_connections()
+        return telegram.sent, [item.status for item in statuses], bots
+
+    sent, statuses, bots = asyncio.run(scenario())
+
+    assert sorted(sent) == sorted(f"m{number}" for number in range(MESSAGES))
+    # Сообщения одного чата доставляются по порядку.
+    assert [text for text in sent if int(text[1:]) % 4 == 0] == [
+        f"m{number}" for number in range(0, MESSAGES, 4)
+    ]
+    assert statuses == [DeliveryStatus.SENT] * MESSAGES
+    assert bots == 1
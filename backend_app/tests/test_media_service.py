@@ -0,0 +1,44 @@
+import asyncio
+from pathlib import Path
+
+from fakeredis.aioredis import FakeRedis
+
+from application.media_service import MediaService, file_ids_key
+from infra.redis_client import RedisClient
+from schemas.media_schema import MediaFile, MediaKind
+
+FILE_ID_TTL = 3600
+
+
+def media_file(sha256: str, file_id: str | None = None) -> MediaFile:
+    return MediaFile(
+        kind=MediaKind.PHOTO,
+        path=Path(f"/media/{sha256}.jpg"),
+        filename=f"{sha256}.jpg",
+        sha256=sha256,
+        file_id=file_id,
+    )
+
+
+def test_remembered_file_ids_expire() -> None:
+    async def scenario() -> tuple[dict[str, str], list[int]]:
+        redis = RedisClient("redis://test")
+        redis._redis = FakeRedis(decode_responses=True)  # noqa: SLF001
+        service = MediaService(
+            redis,
+            Path("/media"),
+            cache_size=1,
+            cache_ttl=0,
+            file_id_ttl=FILE_ID_TTL,
+        )
+        files = [media_file("new"), media_file("known", "known-id")]
+        await service.remember("bot", files, ["new-id", "known-id"])
+
+        redis_con = await redis.get_client()
+        key = file_ids_key("bot")
+        return await redis_con.hgetall(key), await redis_con.httl(key, "new")
+
+    stored, ttls = asyncio.run(scenario())
+
+    assert stored == {"new": "new-id"}
+    assert 0 < ttls[0] <= FILE_ID_TTL
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from infra.queue_keys import notification_key
+from infra.redis_client import RedisClient
+from schemas.bot_schema import BotInfo
+from tasks.migrate_queue_keys import PROGRESS_KEY, QueueKeyMigration
+
+BOT = BotInfo(id="00000000000000000000000000000001", token="1:token")  # noqa: S106
+TARGETS = range(6)
+
+
+class RegistryError(RuntimeError):
+    pass
+
+
+class StaticRegistry:
+    """Реестр с одним ботом, падающий на заданном по счету поиске."""
+
+    def __init__(self, fail_on: int) -> None:
+        self.fail_on = fail_on
+        self.lookups = 0
+
+    def get_by_token(self, token: str) -> BotInfo | None:
+        self.lookups += 1
+        if self.lookups == self.fail_on:
+            raise RegistryError
+        return BOT if token == BOT.token else None
+
+
+def make_redis() -> RedisClient:
+    redis = RedisClient("redis://test")
+    redis._redis = FakeRedis(decode_responses=True)  # noqa: SLF001
+    return redis
+
+
+def migration(
+    redis: RedisClient,
+    registry: StaticRegistry,
+) -> QueueKeyMigration:
+    return QueueKeyMigration(
+        redis,
+        registry,
+        batch_size=2,
+        scan_count=2,
+        pause=0,
+    )
+
+
+def test_interrupted_migration_resumes_without_losing_messages() -> None:
+    async def scenario() -> tuple[dict, dict[int, list[str]], list[str]]:
+        redis = make_redis()
+        redis_con = await redis.get_client()
+        for target in TARGETS:
+            await redis_con.rpush(
+                f"notification:{target}:{BOT.token}",
+                *(f"old{i}" for i in range(5)),
+            )
+            await redis_con.rpush(notification_key(target, BOT.id), "new")
+
+        with pytest.raises(RegistryError):
+            await migration(redis, StaticRegistry(fail_on=4)).run()
+        progress = await migration(redis, StaticRegistry(fail_on=0)).run()
+
+        queues = {
+            target: await redis_con.lrange(
+                notification_key(target, BOT.id),
+                0,
+                -1,
+            )
+            for target in TARGETS
+        }
+        return progress, queues, await redis_con.keys(f"*{BOT.token}")
+
+    progress, queues, legacy = asyncio.run(scenario())
+
+    assert legacy == []
+    assert all(
+        queue == [*(f"old{i}" for i in range(5)), "new"]
+        for queue in queues.values()
+    )
+    assert progress["done"] == 1
+    assert progress["moved"] == len(TARGETS) * 5
+
+
+def test_restart_resets_saved_progress() -> None:
+    async def scenario() -> dict:
+        redis = make_redis()
+        redis_con = await redis.get_client()
+        await redis_con.hset(PROGRESS_KEY, mapping={"cursor": 7, "moved": 3})
+        return await migration(redis, StaticRegistry(fail_on=0)).run(
+            restart=True,
+        )
+
+    progress = asyncio.run(scenario())
+
+    assert progress["moved"] == 0
+    assert progress["cursor"] == 0
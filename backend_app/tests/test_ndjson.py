@@ -0,0 +1,41 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from infra.ndjson import iter_lines
+
+
+async def stream(chunks: list[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+def lines(chunks: list[bytes], max_line_size: int) -> list[bytes | None]:
+    async def scenario() -> list[bytes | None]:
+        split = iter_lines(stream(chunks), max_line_size)
+        return [line async for line in split]
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(
+    "chunks",
+    [
+        [b'{"a":1}\n{"b":2}\n\n{"c":3}'],
+        [b'{"a":', b"1}\n", b'{"b":2}\n', b"\n", b'{"c":3}'],
+        [bytes([byte]) for byte in b'{"a":1}\n{"b":2}\n\n{"c":3}\n'],
+    ],
+)
+def test_lines_do_not_depend_on_chunking(chunks: list[bytes]) -> None:
+    assert lines(chunks, 16) == [b'{"a":1}', b'{"b":2}', b"", b'{"c":3}']
+
+
+def test_too_long_lines_are_skipped_whole() -> None:
+    chunks = [b"ok\n" + b"x" * 5, b"x" * 5, b"x\nok\n", b"y" * 11]
+
+    assert lines(chunks, 10) == [b"ok", None, b"ok", None]
+
+
+def test_line_of_max_size_is_kept() -> None:
+    assert lines([b"x" * 5, b"x" * 5 + b"\n"], 10) == [b"x" * 10]
@@ -0,0 +1,135 @@
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from application.notification_service import NotificationService
+from schemas.delivery_schema import DeliveryResult, DeliveryStatus
+from schemas.media_schema import MediaFile, MediaKind
+from schemas.notify_schema import MessageParseMode
+
+MAX_ATTEMPTS = 3
+UPLOAD_TIMEOUT = 42
+
+
+def send_with_error(error: httpx.RequestError) -> tuple[DeliveryResult, int]:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        raise error.__class__(str(error), request=request)
+
+    async def scenario() -> DeliveryResult:
+        async with httpx.AsyncClient(
+            base_url="http://telegram",
+            transport=httpx.MockTransport(handler),
+        ) as client:
+            service = NotificationService(
+                client,
+                max_attempts=MAX_ATTEMPTS,
+                max_retry_after=0,
+            )
+            return await service.send(1, "text", "token", None)
+
+    return asyncio.run(scenario()), calls
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        httpx.ConnectError("refused"),
+        httpx.ConnectTimeout("timeout"),
+        httpx.PoolTimeout("timeout"),
+    ],
+)
+def test_connection_errors_are_retried(error: httpx.RequestError) -> None:
+    result, calls = send_with_error(error)
+
+    assert result.status == DeliveryStatus.FAILED
+    assert calls == MAX_ATTEMPTS
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        httpx.ReadTimeout("timeout"),
+        httpx.WriteTimeout("timeout"),
+        httpx.RemoteProtocolError("disconnected"),
+    ],
+)
+def test_ambiguous_errors_are_not_retried(error: httpx.RequestError) -> None:
+    result, calls = send_with_error(error)
+
+    assert result.status == DeliveryStatus.FAILED
+    assert calls == 1
+
+
+def form_field(body: bytes, name: str) -> bytes:
+    header = f'name="{name}"\r\n\r\n'.encode()
+    return body.split(header)[1].split(b"\r\n")[0]
+
+
+def test_media_group_uploads_only_new_files(tmp_path: Path) -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        result = [{"message_id": 1}, {"message_id": 2}]
+        return httpx.Response(200, json={"ok": True, "result": result})
+
+    (tmp_path / "new.jpg").write_bytes(b"jpeg")
+    media = [
+        MediaFile(
+            kind=MediaKind.PHOTO,
+            path=tmp_path / "known.jpg",
+            filename="known.jpg",
+            sha256="known",
+            file_id="known-id",
+        ),
+        MediaFile(
+            kind=MediaKind.PHOTO,
+            path=tmp_path / "new.jpg",
+            filename="new.jpg",
+            sha256="new",
+        ),
+    ]
+
+    async def scenario() -> DeliveryResult:
+        async with httpx.AsyncClient(
+            base_url="http://telegram",
+            transport=httpx.MockTransport(handler),
+        ) as client:
+            service = NotificationService(
+                client,
+                upload_timeout=UPLOAD_TIMEOUT,
+            )
+            return await service.send_media(
+                1,
+                media,
+                "token",
+                "caption",
+                MessageParseMode.HTML,
+            )
+
+    result = asyncio.run(scenario())
+
+    assert result.status == DeliveryStatus.SENT
+    [request] = requests
+    assert request.url.path == "/bottoken/sendMediaGroup"
+    assert request.extensions["timeout"]["read"] == UPLOAD_TIMEOUT
+    body = request.read()
+    assert b'filename="new.jpg"' in body
+    assert b"known.jpg" not in body
+    group = json.loads(form_field(body, "media"))
+    assert group == [
+        {
+            "type": "photo",
+            "media": "known-id",
+            "caption": "caption",
+            "parse_mode": "HTML",
+        },
+        {"type": "photo", "media": "attach://file1"},
+    ]
@@ -0,0 +1,74 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from schemas.notify_schema import (
+    NotifyIn,
+    NotifyRedisDto,
+    queue_record_adapter,
+)
+
+BOT_ID = "00000000000000000000000000000001"
+TIMESTAMP = 1_700_000_000.0
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"target_id": 1, "message": "<b>Привет</b>", "format": "HTML"},
+        {
+            "target_id": 2,
+            "template_id": "order_shipped",
+            "variables": {"name": "Анна", "order": 123, "total": 19.5},
+            "ttl": 60,
+        },
+        {
+            "target_id": 3,
+            "attachments": ["chart"],
+            "expires_at": datetime.now(UTC) + timedelta(hours=1),
+        },
+    ],
+)
+def test_record_round_trips_through_dto(body: dict) -> None:
+    notify_in = NotifyIn.model_validate(body)
+    record = notify_in.to_record(
+        message_id="m1",
+        bot_id=BOT_ID,
+        timestamp=TIMESTAMP,
+    )
+
+    dto = NotifyRedisDto.model_validate_json(
+        queue_record_adapter.dump_json(record),
+    )
+
+    assert dto.model_dump(exclude_none=True).keys() == record.keys()
+    assert (dto.id, dto.bot_id, dto.timestamp) == ("m1", BOT_ID, TIMESTAMP)
+    assert dto.expires_at == notify_in.expiry(TIMESTAMP)
+    copied = NotifyRedisDto.model_fields.keys() & NotifyIn.model_fields
+    for name in copied - {"expires_at"}:
+        assert getattr(dto, name) == getattr(notify_in, name), name
+
+
+def test_record_includes_every_dto_field_known_to_request() -> None:
+    notify_in = NotifyIn(
+        target_id=1,
+        message="text",
+        format="HTML",
+        ttl=30,
+    )
+
+    record = notify_in.to_record(
+        message_id="m1",
+        bot_id=BOT_ID,
+        timestamp=TIMESTAMP,
+    )
+
+    assert record == {
+        "id": "m1",
+        "target_id": 1,
+        "message": "text",
+        "format": "HTML",
+        "bot_id": BOT_ID,
+        "timestamp": TIMESTAMP,
+        "expires_at": TIMESTAMP + 30,
+    }
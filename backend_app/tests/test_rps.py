@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from infra.queue_keys import notification_key, processing_key
+from infra.redis_client import RedisClient
+from tasks import rps
+
+KEY = notification_key(1, "00000000000000000000000000000001")
+
+
+class PublishError(ConnectionError):
+    pass
+
+
+class FailingBroker:
+    """Брокер, падающий на публикации с заданным номером."""
+
+    def __init__(self, fail_on: int) -> None:
+        self.fail_on = fail_on
+        self.published: list[str] = []
+
+    async def publish(self, message: str, **_kwargs: object) -> None:
+        if len(self.published) == self.fail_on:
+            raise PublishError
+        self.published.append(message)
+
+
+def make_redis() -> RedisClient:
+    redis = RedisClient("redis://test")
+    redis._redis = FakeRedis(decode_responses=True)  # noqa: SLF001
+    return redis
+
+
+def message(number: int) -> str:
+    return json.dumps({"id": f"m{number}", "target_id": 1})
+
+
+def test_publish_failure_keeps_unpublished_messages(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(rps.settings, "rps_batch_size", 5)
+
+    async def scenario() -> tuple[list[str], list[str], list[str]]:
+        redis = make_redis()
+        redis_con = await redis.get_client()
+        await redis_con.rpush(KEY, *(message(i) for i in range(8)))
+
+        broker = FailingBroker(fail_on=2)
+        monkeypatch.setattr(rps, "broker", broker)
+        with pytest.raises(PublishError):
+            await rps.pump_queue(redis, KEY)
+        queued = await redis_con.lrange(KEY, 0, -1)
+
+        # Следующий тик публикует остаток пачки, ничего не теряя.
+        broker.fail_on = -1
+        await rps.pump_queue(redis, KEY)
+        await rps.pump_queue(redis, KEY)
+        processing = await redis_con.lrange(processing_key(KEY), 0, -1)
+        return broker.published, queued, processing
+
+    published, queued, processing = asyncio.run(scenario())
+
+    assert queued == [message(i) for i in range(2, 8)]
+    assert published == [message(i) for i in range(8)]
+    assert processing == []
+
+
+def test_leftovers_in_processing_are_published_first(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def scenario() -> tuple[list[str], list[str]]:
+        redis = make_redis()
+        redis_con = await redis.get_client()
+        # Остаток пачки, который не удалось вернуть в очередь.
+        await redis_con.rpush(processing_key(KEY), message(0), message(1))
+        await redis_con.rpush(KEY, message(2), message(3))
+
+        broker = FailingBroker(fail_on=-1)
+        monkeypatch.setattr(rps, "broker", broker)
+        await rps.pump_queue(redis, KEY)
+        return broker.published, await redis_con.keys("*")
+
+    published, keys = asyncio.run(scenario())
+
+    assert published == [message(i) for i in range(4)]
+    assert keys == []
@@ -0,0 +1,78 @@
+import asyncio
+
+from fakeredis.aioredis import FakeRedis
+
+from application.send_rate_limiter import (
+    AdaptiveRateLimiter,
+    pause_key,
+    rate_key,
+)
+from infra.redis_client import RedisClient
+
+BOT_ID = "bot"
+INITIAL_RATE = 10
+MIN_RATE = 1
+MAX_RATE = 12
+DECREASE = 0.5
+
+
+def make_limiter() -> tuple[AdaptiveRateLimiter, FakeRedis]:
+    redis = RedisClient("redis://test")
+    redis._redis = FakeRedis(decode_responses=True)  # noqa: SLF001
+    limiter = AdaptiveRateLimiter(
+        redis,
+        initial_rate=INITIAL_RATE,
+        min_rate=MIN_RATE,
+        max_rate=MAX_RATE,
+        increase=INITIAL_RATE,
+        decrease=DECREASE,
+        state_ttl=60,
+        flush_interval=60,
+    )
+    return limiter, redis._redis  # noqa: SLF001
+
+
+def test_pause_does_not_take_window_slots() -> None:
+    async def scenario() -> list[str]:
+        limiter, redis_con = make_limiter()
+        await redis_con.set(pause_key(BOT_ID), 1, px=50)
+        await limiter.acquire(BOT_ID)
+        windows = await redis_con.keys(f"{rate_key(BOT_ID)}:[0-9]*")
+        return await redis_con.mget(windows)
+
+    assert asyncio.run(scenario()) == ["1"]
+
+
+def test_throttling_burst_decreases_rate_once() -> None:
+    async def scenario() -> str | None:
+        limiter, redis_con = make_limiter()
+        await limiter.acquire(BOT_ID)
+        limiter.on_success(BOT_ID)
+        await asyncio.gather(
+            limiter.on_throttled(BOT_ID, 1),
+            limiter.on_throttled(BOT_ID, 1),
+        )
+        # Успех до 429 не прибавляется к уменьшенному темпу.
+        await limiter.flush()
+        return await redis_con.get(rate_key(BOT_ID))
+
+    assert float(asyncio.run(scenario())) == INITIAL_RATE * DECREASE
+
+
+def test_successes_increase_rate_up_to_max() -> None:
+    async def scenario() -> list[float]:
+        limiter, redis_con = make_limiter()
+        await limiter.acquire(BOT_ID)
+        rates = []
+        for _ in range(4):
+            limiter.on_success(BOT_ID)
+            await limiter.flush()
+            rates.append(float(await redis_con.get(rate_key(BOT_ID))))
+        return rates
+
+    rates = asyncio.run(scenario())
+
+    # Прирост за успех обратно пропорционален темпу.
+    assert rates[0] == INITIAL_RATE + 1
+    assert rates[1] < MAX_RATE
+    assert rates[2:] == [MAX_RATE, MAX_RATE]
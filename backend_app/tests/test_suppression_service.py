@@ -0,0 +1,26 @@
+import asyncio
+
+from fakeredis.aioredis import FakeRedis
+
+from application.suppression_service import SuppressionService, suppressed_key
+from infra.redis_client import RedisClient
+
+TTL = 600
+
+
+def test_suppressed_chats_expire_one_by_one() -> None:
+    async def scenario() -> tuple[set[int], list[int]]:
+        redis = RedisClient("redis://test")
+        redis._redis = FakeRedis(decode_responses=True)  # noqa: SLF001
+        service = SuppressionService(redis, TTL)
+        await service.suppress("bot", 1, "blocked")
+        await service.suppress("bot", 2, "deleted")
+
+        redis_con = await redis.get_client()
+        ttls = await redis_con.httl(suppressed_key("bot"), "1", "2")
+        return await service.find("bot", [1, 3, 1]), ttls
+
+    found, ttls = asyncio.run(scenario())
+
+    assert found == {1}
+    assert all(0 < ttl <= TTL for ttl in ttls)
@@ -0,0 +1,26 @@
+import pytest
+
+from application.template_renderer import CompiledTemplate
+from schemas.notify_schema import MessageParseMode
+
+VALUE = "a_b*c[d](e)<f>&g.h!"
+
+
+@pytest.mark.parametrize(
+    ("parse_mode", "expected"),
+    [
+        (None, VALUE),
+        (MessageParseMode.HTML, "a_b*c[d](e)&lt;f&gt;&amp;g.h!"),
+        (MessageParseMode.MARKDOWN, r"a\_b\*c\[d](e)<f>&g.h!"),
+        (MessageParseMode.MARKDOWN_V2, r"a\_b\*c\[d\]\(e\)<f\>&g\.h\!"),
+    ],
+)
+def test_variables_are_escaped_for_parse_mode(
+    parse_mode: MessageParseMode | None,
+    expected: str,
+) -> None:
+    template = CompiledTemplate("bot", "*$value* costs $$1", parse_mode)
+
+    text = template.render({"value": VALUE}, parse_mode)
+
+    assert text == f"*{expected}* costs $1"